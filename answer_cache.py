@@ -0,0 +1,114 @@
+"""
+Bounded LRU cache of question answers.
+
+Answers are keyed by (case id, case version, normalized question), so an
+edited case never serves answers computed from its old content. One cache is
+shared by every TextProcessor in the process, so players asking the same
+questions about the same case in different sessions share the work.
+
+invalidate_cases() drops the answers and every CaseVersionCache entry for the
+given cases; register it with CaseData.add_change_listener so edited cases
+release their old data as soon as they change.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+_MISSING = object()
+
+
+class AnswerCache:
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple, Optional[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, default: Any = _MISSING) -> Any:
+        """Look up an answer, marking it most recently used. Returns ``default`` on a miss."""
+        with self._lock:
+            answer = self._entries.get(key, _MISSING)
+            if answer is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, key: Tuple, answer: Optional[str]):
+        """Store an answer (None included), evicting the least recently used entries over maxsize"""
+        with self._lock:
+            self._entries[key] = answer
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, case_ids: Iterable[Hashable]):
+        """Drop every answer about the given cases"""
+        case_ids = set(case_ids)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in case_ids]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every answer and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CaseVersionCache:
+    """Data derived from a case (spelling vocabulary, passage index), built once per case version"""
+
+    def __init__(self, build: Callable[[Mapping], Any], maxsize: int = 256):
+        self._build = build
+        self._entries = AnswerCache(maxsize)
+        _case_version_caches.add(self)
+
+    def get(self, case: Mapping) -> Any:
+        version = getattr(case, 'version', None)
+        if case.get('id') is None or version is None:
+            # Plain dicts can change under us, so they are never cached
+            return self._build(case)
+
+        key = (case['id'], version)
+        value = self._entries.get(key, None)
+        if value is None:
+            value = self._build(case)
+            self._entries.put(key, value)
+        return value
+
+    def invalidate(self, case_ids: Iterable[Hashable]):
+        """Drop the data built for the given cases"""
+        self._entries.invalidate(case_ids)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Every live CaseVersionCache, for invalidate_cases()
+_case_version_caches: 'weakref.WeakSet[CaseVersionCache]' = weakref.WeakSet()
+
+
+# The cache TextProcessor instances use unless given their own
+shared_cache = AnswerCache()
+
+
+def invalidate_cases(case_ids: Iterable[Hashable]):
+    """Drop the shared answers and every per-case-version cache entry about the given cases"""
+    case_ids = list(case_ids)
+    shared_cache.invalidate(case_ids)
+    for cache in list(_case_version_caches):
+        cache.invalidate(case_ids)
@@ -0,0 +1,59 @@
+"""
+Precomputed answers for a case.
+
+Every answer a case can give is formatted once, when the case is loaded, into a
+table of intent -> answer plus per-suspect alibi, relationship and motive
+answers keyed by lowercased suspect name. Answering a question is then a dict
+lookup.
+"""
+
+from typing import Any, Dict, Mapping
+
+# Bumped whenever answer wording changes, so tables serialized by an older
+# version are rebuilt instead of served
+ANSWER_TABLE_FORMAT = 2
+
+# Intents answered per suspect rather than per case
+SUSPECT_INTENTS = ('alibi', 'relationship')
+
+# Intents answered per suspect when one is named and for the whole case
+# otherwise, with the table key of their per-suspect answers
+PER_SUSPECT_ANSWERS = {'motive': 'motives'}
+
+
+def build_answer_table(case: Mapping) -> Dict[str, Any]:
+    """Format every answer for a case (a Case record or the dict layout)"""
+    victim = case.get('victim', {})
+    weapon = case.get('weapon', {})
+    suspects = case.get('suspects', [])
+    evidence = case.get('evidence', [])
+
+    table: Dict[str, Any] = {
+        'format': ANSWER_TABLE_FORMAT,
+        'weapon': weapon.get('description', 'The murder weapon has not been determined.'),
+        'victim': f"The victim is {victim.get('name', 'unknown')}. {victim.get('description', '')}",
+        'suspects': (f"The suspects are: {', '.join(s['name'] for s in suspects)}" if suspects
+                     else "No suspects have been identified yet."),
+        'location': (f"The crime occurred at {case.get('location', 'Unknown location')}. "
+                     f"{case.get('scene_description', '')}"),
+        'time': f"Time of death: {case.get('time_of_death', 'Time of death is unknown')}",
+        'motive': case.get('motive_hint', 'The motive is still unclear.'),
+        'evidence': (f"Evidence found: {', '.join(evidence)}" if evidence
+                     else "No evidence has been found yet."),
+        'alibi': {},
+        'relationship': {},
+        'motives': {},
+    }
+    for suspect in suspects:
+        name = suspect['name']
+        table['alibi'][name.lower()] = suspect.get('alibi', f"{name}'s alibi is unknown.")
+        table['relationship'][name.lower()] = suspect.get(
+            'relationship', f"{name}'s relationship to the victim is unknown.")
+        if suspect.get('motive'):
+            table['motives'][name.lower()] = suspect['motive']
+    return table
+
+
+def is_current(table: Any) -> bool:
+    """Check whether a serialized table was built with the current answer wording"""
+    return isinstance(table, dict) and table.get('format') == ANSWER_TABLE_FORMAT
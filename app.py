@@ -1,6 +1,8 @@
 import streamlit as st
-import time
+from answer_cache import invalidate_cases
 from case_data import CaseData
+from clock import system_clock
+from game_session import ENDED, WON, GameSession, format_time
 from text_processor import TextProcessor
 
 # --- Streamlit App for Detective Game ---
@@ -26,17 +28,41 @@ def format_solution(solution):
 **Key Evidence:** {solution.get('key_evidence', 'Unknown')}
 """
 
+@st.cache_resource
+def load_case_data():
+    # Shared by every session and rerun; only the case index is read up front.
+    # Edited cases are picked up in the background; games in progress keep the
+    # case object they started with.
+    case_data = CaseData()
+    case_data.add_change_listener(invalidate_cases)
+    case_data.watch()
+    return case_data
+
+# Log prefix for each kind of game event
+EVENT_ICONS = {
+    'answer': '🕵️',
+    'no_answer': '❓',
+    'ambiguous': '❓',
+    'invalid': '❌',
+    'wrong': '❌',
+    'solved': '✅',
+    'time': '⏰',
+    'suspects': '👤',
+    'evidence': '🔍',
+    'ended': '🔍',
+}
+
+def format_event(event):
+    if event.kind == 'help':
+        return "ℹ️ Type questions about the case, or 'accuse [name]' to make an accusation."
+    if event.kind == 'solved':
+        return f"✅ {event.text} 🎉"
+    return f"{EVENT_ICONS.get(event.kind, '')} {event.text}".strip()
+
 def reset_game_state():
     st.session_state['game_active'] = False
-    st.session_state['current_case'] = None
-    st.session_state['questions_asked'] = 0
-    st.session_state['score'] = 0
-    st.session_state['start_time'] = None
+    st.session_state['session'] = None
     st.session_state['log'] = []
-    st.session_state['accused'] = None
-    st.session_state['game_result'] = None
-    st.session_state['time_limit'] = None
-    st.session_state['time_up'] = False
 
 # --- App Layout ---
 st.set_page_config(page_title="Detective Game", layout="wide", page_icon="🔎")
@@ -44,13 +70,18 @@ st.set_page_config(page_title="Detective Game", layout="wide", page_icon="🔎")
 # --- Sidebar Navigation ---
 st.sidebar.title("🔎 Detective Game")
 nav = st.sidebar.radio("Navigation", ["Select Case", "Instructions", "About"], key="nav")
+difficulty_filter = st.sidebar.selectbox("Difficulty", ["All", "Easy", "Medium", "Hard"],
+                                         key="difficulty_filter")
 
 # --- Initialize State ---
 if 'game_active' not in st.session_state:
     reset_game_state()
 
-case_data = CaseData()
-cases = case_data.cases
+case_data = load_case_data()
+if difficulty_filter == "All":
+    cases = case_data.get_all_cases()
+else:
+    cases = case_data.find_cases(difficulty=difficulty_filter)
 text_processor = TextProcessor()
 
 # --- Header ---
@@ -92,49 +123,37 @@ if not st.session_state['game_active']:
     for i, case in enumerate(cases):
         with st.expander(f"Case {case['id']}: {case['title']} ({case['difficulty']})"):
             st.write(f"**Description:** {case['description']}")
+            st.write(f"**Location:** {case['location']}")
             st.write(f"**Time Limit:** {case['time_limit']//60} minutes")
-            st.write(f"**Summary:** {case['summary']}")
             if st.button(f"Start Case {case['id']}", key=f"start_{i}"):
-                st.session_state['current_case'] = case
+                # A test harness can put a VirtualClock in session_state['clock'] to run
+                # games instantly
+                clock = st.session_state.get('clock', system_clock)
+                st.session_state['session'] = GameSession(case_data.get_case(case['id']),
+                                                          text_processor, clock=clock)
                 st.session_state['game_active'] = True
-                st.session_state['questions_asked'] = 0
-                st.session_state['score'] = 0
-                st.session_state['start_time'] = time.time()
                 st.session_state['log'] = []
-                st.session_state['accused'] = None
-                st.session_state['game_result'] = None
-                st.session_state['time_limit'] = case['time_limit']
-                st.session_state['time_up'] = False
                 st.rerun()
     st.stop()
 
 # --- Main Game Area ---
-case = st.session_state['current_case']
-time_limit = st.session_state['time_limit']
-start_time = st.session_state['start_time']
-questions_asked = st.session_state['questions_asked']
+session = st.session_state['session']
+case = session.case
 log = st.session_state['log']
-accused = st.session_state['accused']
-game_result = st.session_state['game_result']
-time_up = st.session_state['time_up']
 
 # --- Timer ---
 timer_placeholder = st.empty()
-if start_time and not game_result:
+if session.active:
     # Auto-refresh the app every second while the game is active
     st.experimental_rerun = getattr(st, 'experimental_rerun', None)  # Backward compatibility
     st_autorefresh = getattr(st, 'autorefresh', None)
     if st_autorefresh:
         st_autorefresh(interval=1000, key="timer_refresh")
-    elapsed = int(time.time() - start_time)
-    remaining = max(0, time_limit - elapsed)
-    mins, secs = divmod(remaining, 60)
-    timer_placeholder.progress(remaining / time_limit, text=f"Time Remaining: {mins:02d}:{secs:02d}")
-    if remaining == 0 and not time_up:
-        st.session_state['time_up'] = True
-        st.session_state['game_result'] = 'lose'
-        st.warning("⏰ Time's up! The killer got away.")
-        st.stop()
+    for event in session.check_time():
+        st.warning(f"⏰ {event.text}")
+    remaining = session.time_remaining()
+    timer_placeholder.progress(remaining / session.time_limit,
+                               text=f"Time Remaining: {format_time(remaining)}")
 
 # --- Case Info ---
 with st.expander("📝 Case Details", expanded=True):
@@ -162,58 +181,28 @@ for entry in log:
     st.markdown(entry)
 
 # --- Input Area ---
-if not game_result:
+if session.active:
     st.markdown("---")
     st.markdown("**Ask a question about the case or make an accusation.**")
     with st.form(key="input_form", clear_on_submit=True):
         user_input = st.text_input("Type your question or 'accuse [suspect name]':", key="user_input")
         submit = st.form_submit_button("Submit")
         if submit and user_input:
-            command = user_input.lower().strip()
-            st.session_state['questions_asked'] += 1
-            # Handle commands
-            if command == 'help':
-                st.info("Type questions about the case, or 'accuse [name]' to make an accusation.")
-            elif command == 'time':
-                elapsed = int(time.time() - st.session_state['start_time'])
-                remaining = max(0, time_limit - elapsed)
-                mins, secs = divmod(remaining, 60)
-                st.info(f"Time remaining: {mins:02d}:{secs:02d}")
-            elif command == 'suspects':
-                st.info(", ".join([s['name'] for s in case.get('suspects', [])]))
-            elif command == 'evidence':
-                st.info(", ".join(case.get('evidence', [])))
-            elif command.startswith('accuse '):
-                suspect_name = command[7:].strip()
-                suspects = case.get('suspects', [])
-                killer = case.get('killer', '').lower()
-                accused_suspect = None
-                for suspect in suspects:
-                    if suspect['name'].lower() == suspect_name.lower():
-                        accused_suspect = suspect
-                        break
-                if not accused_suspect:
-                    st.session_state['log'].append(f"❌ '{suspect_name}' is not a suspect in this case.")
-                elif accused_suspect['name'].lower() == killer:
-                    st.session_state['game_result'] = 'win'
-                    st.session_state['score'] = (max(0, 100 - (st.session_state['questions_asked'] * 5)) + int((time_limit - (time.time() - start_time)) * 10))
-                    st.session_state['log'].append(f"✅ You correctly accused {accused_suspect['name']}! 🎉")
-                else:
-                    st.session_state['log'].append(f"❌ That's incorrect. {accused_suspect['name']} is not the killer. Keep investigating.")
-            else:
-                response = text_processor.process_question(user_input, case)
-                if response:
-                    st.session_state['log'].append(f"🕵️ {response}")
-                else:
-                    st.session_state['log'].append("❓ I don't know. Try rephrasing your question.")
+            # Shown in the log: the page reruns straight away
+            for event in session.submit(user_input):
+                if event.kind != 'time_up':
+                    st.session_state['log'].append(format_event(event))
             st.rerun()
 
 # --- Game Result ---
-if game_result:
-    if game_result == 'win':
+if not session.active:
+    if session.state == WON:
         st.success("🎉 CASE SOLVED! You correctly identified the killer!")
         st.balloons()
-        st.markdown(f"**Final Score:** {st.session_state['score']} points")
+        st.markdown(f"**Final Score:** {session.score} points")
+        st.markdown(f"**Questions Asked:** {session.questions_asked}")
+    elif session.state == ENDED:
+        st.info("🔍 Investigation ended. The killer got away.")
     else:
         st.error("⏰ TIME'S UP! The killer got away.")
     st.markdown("---")
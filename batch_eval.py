@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Offline batch question answering.
+
+Replays a corpus of player questions against a set of cases on a process pool
+and streams one JSONL record per (case, question) pair. Work is split into
+units of (question chunk, case chunk), so a small corpus over many cases still
+spreads across every core. Each worker reads the corpus and opens the case
+source once, then loads only the cases of the units it is given; a unit's
+questions are classified in one vectorized pass and answered for each of its
+cases, so only chunk bounds and case ids go to the workers and only finished
+JSONL text comes back.
+
+The case source and every case id are checked before any worker starts.
+
+Usage: python batch_eval.py questions.txt [--cases 1,2,3] [-o results.jsonl] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from case_data import CaseData
+from text_processor import TextProcessor
+
+# Per-process state set up by _init_worker
+_worker: Dict = {}
+
+
+def read_questions(path: str) -> List[str]:
+    """
+    One question per line; for TSV files (like the intent corpus) the first column. '#' lines
+    are skipped.
+    """
+    questions = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            questions.append(line.rstrip('\n').split('\t')[0])
+    return questions
+
+
+def resolve_cases(source: Optional[str], case_ids: Optional[Sequence[int]] = None) -> List[int]:
+    """Open the case source and check the requested case ids (default: every case) exist"""
+    case_data = CaseData(source)
+    if case_ids is None:
+        return [header['id'] for header in case_data.get_all_cases()]
+    missing = [case_id for case_id in case_ids if not case_data.has_case(case_id)]
+    if missing:
+        raise ValueError(f"No such case: {', '.join(map(str, missing))}")
+    return list(case_ids)
+
+
+def _init_worker(corpus_path: str, source: Optional[str]):
+    try:
+        _worker['case_data'] = CaseData(source)
+        _worker['questions'] = read_questions(corpus_path)
+        _worker['processor'] = TextProcessor()
+    except Exception as e:
+        # Raised from the first unit instead: a failing initializer makes the pool respawn
+        # workers forever
+        _worker['error'] = e
+
+
+def _answer_unit(unit: Tuple[int, int, Tuple[int, ...]]) -> Tuple[str, Counter, Counter]:
+    """
+    Answer questions[start:end] for each of the unit's cases. Returns JSONL text plus asked /
+    answered counts per intent; replies asking which suspect was meant do not count as answered.
+    """
+    if 'error' in _worker:
+        raise _worker['error']
+    start, end, case_ids = unit
+    questions = _worker['questions'][start:end]
+    cases = [_worker['case_data'].get_case(case_id) for case_id in case_ids]
+    processor = _worker['processor']
+    results = processor.process_batch(questions, cases)
+
+    lines = []
+    asked, answered = Counter(), Counter()
+    for case, answers in zip(cases, results):
+        for line_number, question, (question_type, answer) in zip(range(start, end), questions,
+                                                                  answers):
+            intent = question_type or 'unknown'
+            asked[intent] += 1
+            hit = answer is not None and not processor.is_clarification(answer)
+            answered[intent] += hit
+            lines.append(json.dumps({'case': case['id'], 'line': line_number, 'question': question,
+                                     'intent': question_type, 'answer': answer, 'hit': hit}))
+    return ''.join(line + '\n' for line in lines), asked, answered
+
+
+def run(corpus_path: str, case_ids: Sequence[int], out, source: Optional[str] = None,
+        workers: Optional[int] = None, chunk_size: int = 512,
+        case_chunk_size: int = 64) -> Tuple[int, Counter, Counter]:
+    """
+    Stream answer records to ``out`` for ``case_ids`` as checked by resolve_cases. Returns
+    the record count and per-intent asked / answered counts.
+    """
+    count = len(read_questions(corpus_path))
+    case_chunks = [tuple(case_ids[start:start + case_chunk_size])
+                   for start in range(0, len(case_ids), case_chunk_size)]
+    units = [(start, min(start + chunk_size, count), cases)
+             for start in range(0, count, chunk_size) for cases in case_chunks]
+    asked, answered = Counter(), Counter()
+    records = 0
+
+    def collect(results):
+        nonlocal records
+        for text, chunk_asked, chunk_answered in results:
+            out.write(text)
+            asked.update(chunk_asked)
+            answered.update(chunk_answered)
+            records += sum(chunk_asked.values())
+
+    init_args = (corpus_path, source)
+    if workers == 1:
+        _init_worker(*init_args)
+        collect(map(_answer_unit, units))
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+            collect(pool.imap(_answer_unit, units))
+    return records, asked, answered
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Answer a question corpus against many cases in parallel')
+    parser.add_argument('corpus',
+                        help='Question file: one question per line, or TSV with the question first')
+    parser.add_argument('--cases', help='Comma-separated case ids (default: every case)')
+    parser.add_argument('--source',
+                        help='Case store directory or pack (default: the game\'s case source)')
+    parser.add_argument('-o', '--output', default='-', help='JSONL results file (default: stdout)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (1 runs inline)')
+    parser.add_argument('--chunk-size', type=int, default=512, help='Questions per work unit')
+    parser.add_argument('--case-chunk-size', type=int, default=64, help='Cases per work unit')
+    args = parser.parse_args()
+
+    try:
+        case_ids = [int(case_id) for case_id in args.cases.split(',')] if args.cases else None
+        case_ids = resolve_cases(args.source, case_ids)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        records, asked, answered = run(args.corpus, case_ids, out, args.source, args.workers,
+                                       args.chunk_size, args.case_chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    report = sys.stderr
+    print(f"{records} answers for {len(case_ids)} cases in {elapsed:.2f}s "
+          f"({records / elapsed:,.0f}/s, {args.workers} workers)", file=report)
+    print(f"{'intent':>14s} {'asked':>9s} {'answered':>9s} {'hit rate':>9s}", file=report)
+    for intent, total in sorted(asked.items(), key=lambda item: -item[1]):
+        print(f"{intent:>14s} {total:9d} {answered[intent]:9d} {answered[intent] / total:9.1%}",
+              file=report)
+    hits = sum(answered.values())
+    print(f"{'all':>14s} {records:9d} {hits:9d} {hits / max(records, 1):9.1%}", file=report)
+
+
+if __name__ == "__main__":
+    main()
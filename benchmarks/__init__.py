@@ -0,0 +1,4 @@
+"""
+Benchmarks for CLI Detective. Run from the repository root, e.g.
+``python -m benchmarks.bench_case_memory``.
+"""
@@ -0,0 +1,46 @@
+"""
+Bytes per case: plain dicts from JSON versus the slotted case model.
+
+Usage: python -m benchmarks.bench_case_memory [--count 100000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from case_model import Case
+from benchmarks.catalog import synthetic_json
+
+
+def measure(count: int, build) -> float:
+    """Average traced bytes per case kept alive by ``build``"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    cases = [build(document) for document in synthetic_json(count)]
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cases
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory per case')
+    parser.add_argument('--count', type=int, default=100_000, help='Number of synthetic cases')
+    args = parser.parse_args()
+
+    dict_bytes = measure(args.count, json.loads)
+    model_bytes = measure(args.count, lambda document: Case.from_dict(json.loads(document)))
+
+    print(f"Cases:        {args.count}")
+    print(f"dict:         {dict_bytes:8.0f} bytes/case")
+    print(f"Case model:   {model_bytes:8.0f} bytes/case")
+    print(f"Saved:        {1 - model_bytes / dict_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Intent classification throughput of TextProcessor.classify_batch.
+
+Usage: python -m benchmarks.bench_classify_batch [--questions 40000]
+"""
+
+import argparse
+import itertools
+import time
+
+from text_processor import TextProcessor
+from benchmarks.intent_differential import read_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure questions per second by batch size')
+    parser.add_argument('--questions', type=int, default=40_000,
+                        help='Questions classified per batch size')
+    parser.add_argument('--batch-sizes', default='1,64,4096', help='Comma-separated batch sizes')
+    args = parser.parse_args()
+
+    processor = TextProcessor()
+    corpus = [question.lower() for question, _ in read_corpus()]
+    questions = list(itertools.islice(itertools.cycle(corpus), args.questions))
+    processor.classify_batch(questions[:1])  # train the model outside the timings
+
+    print(f"{'batch size':>10s} {'questions/s':>14s}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(',')):
+        start = time.perf_counter()
+        for offset in range(0, len(questions), batch_size):
+            processor.classify_batch(questions[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:10d} {len(questions) / elapsed:14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Startup cost of the terminal game, as paid on every connection.
+
+Measures, in fresh interpreters: a bare interpreter for reference, the time
+to import main (with the slowest modules from -X importtime), and the time
+from launching `python main.py` until the case menu prompt has been written.
+
+Usage: python -m benchmarks.bench_cli_startup [--repeat 10] [--cases cases.pack]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b'Select a case number'
+
+
+def run_time(argv: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(argv, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def import_profile() -> Tuple[float, Dict[str, int]]:
+    """Cumulative import time of main and the self time of each module it imports, in µs"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=ROOT,
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True)
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+        if name.strip() == 'main':
+            total = int(cumulative_us)
+    return total / 1e6, modules
+
+
+def time_to_prompt(extra: List[str]) -> float:
+    """Seconds from launching the game until the menu prompt is written"""
+    start = time.perf_counter()
+    game = subprocess.Popen([sys.executable, 'main.py', *extra], cwd=ROOT, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = b''
+    while PROMPT not in output:
+        chunk = game.stdout.read1(65536)
+        if not chunk:
+            raise RuntimeError("The game exited before showing the menu:\n"
+                               + output.decode(errors='replace'))
+        output += chunk
+    elapsed = time.perf_counter() - start
+    game.communicate(b'quit\n', timeout=30)
+    return elapsed
+
+
+def summary(timings: List[float]) -> str:
+    return f"best {min(timings) * 1000:7.1f}ms   median {statistics.median(timings) * 1000:7.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure CLI import time and time to the first prompt')
+    parser.add_argument('--repeat', type=int, default=10, help='Launches per measurement')
+    parser.add_argument('--cases', help='Case store directory or pack to start the game with')
+    args = parser.parse_args()
+    extra = ['--cases', args.cases] if args.cases else []
+
+    interpreter = [run_time([sys.executable, '-c', 'pass']) for _ in range(args.repeat)]
+    profiles = [import_profile() for _ in range(args.repeat)]
+    prompt = [time_to_prompt(extra) for _ in range(args.repeat)]
+
+    print(f"{'python -c pass':>22s}  {summary(interpreter)}")
+    print(f"{'import main':>22s}  {summary([total for total, _ in profiles])}")
+    print(f"{'time to first prompt':>22s}  {summary(prompt)}")
+
+    _, modules = min(profiles, key=lambda profile: profile[0])
+    print(f"\n{len(modules)} modules imported; slowest (self time):")
+    for name, self_us in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {self_us / 1000:6.2f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+System calls, bytes and time per screen of the terminal game.
+
+Each screen is sent over a socket pair (as to a remote terminal) or a pipe
+in three ways: line by line with a flush after each line, as print() does
+on a terminal, which is how the screens used to be drawn; as one buffered
+frame from the Renderer; and as one frame with color off. A reader thread
+drains the other end.
+
+Usage: python -m benchmarks.bench_render [--repeat 2000] [--transport socket|pipe]
+"""
+
+import argparse
+import io
+import os
+import socket
+import threading
+import time
+
+from case_data import CaseData
+from renderer import Renderer
+
+
+class CountingWriter(io.RawIOBase):
+    """Raw stream over a file descriptor that counts write system calls"""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.calls = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.calls += 1
+        written = os.write(self.fd, data)
+        self.bytes += written
+        return written
+
+
+def transport(kind: str):
+    """(write fd, read fd, closers) for a socket pair or a pipe"""
+    if kind == 'socket':
+        left, right = socket.socketpair()
+        return left.fileno(), right.fileno(), (left, right)
+    read_fd, write_fd = os.pipe()
+    return write_fd, read_fd, ()
+
+
+def drain(fd: int):
+    while os.read(fd, 1 << 16):
+        pass
+
+
+def screens(renderer: Renderer, case, cases):
+    won = renderer.render('won', minutes=3, seconds=7, questions=4, score=4280)
+    return {
+        'case list': renderer.case_list(cases),
+        'briefing': (renderer.case_screen('case_info', case)
+                     + renderer.case_screen('instructions', case)),
+        'suspects': renderer.case_screen('suspects', case),
+        'case solved': won + renderer.case_screen('solution', case),
+    }
+
+
+def measure(kind: str, frame: str, repeat: int, per_line: bool):
+    write_fd, read_fd, sockets = transport(kind)
+    reader = threading.Thread(target=drain, args=(read_fd,), daemon=True)
+    reader.start()
+    raw = CountingWriter(write_fd)
+    stream = io.TextIOWrapper(io.BufferedWriter(raw, 1 << 16), encoding='utf-8',
+                              write_through=False)
+    lines = frame.splitlines(keepends=True)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if per_line:
+            for line in lines:
+                stream.write(line)
+                stream.flush()
+        else:
+            # What Renderer.write does: one write and one flush
+            stream.write(frame)
+            stream.flush()
+    elapsed = time.perf_counter() - start
+
+    if sockets:
+        sockets[0].shutdown(socket.SHUT_WR)
+    else:
+        os.close(write_fd)
+    reader.join()
+    for sock in sockets:
+        sock.close()
+    if not sockets:
+        os.close(read_fd)
+    return raw.calls / repeat, raw.bytes / repeat, elapsed / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure terminal output cost per screen')
+    parser.add_argument('--repeat', type=int, default=2000, help='Times each screen is written')
+    parser.add_argument('--transport', choices=('socket', 'pipe'), default='socket')
+    args = parser.parse_args()
+
+    case_data = CaseData()
+    case = case_data.get_case(1)
+    cases = case_data.get_all_cases()
+    color = screens(Renderer(io.StringIO(), color=True), case, cases)
+    plain = screens(Renderer(io.StringIO(), color=False), case, cases)
+
+    print(f"Each screen written {args.repeat:,} times over a {args.transport}")
+    print(f"{'screen':>12s} {'method':>18s} {'syscalls':>9s} {'bytes':>8s} {'µs/screen':>10s}")
+    for name in color:
+        for method, frame, per_line in (('print per line', color[name], True),
+                                        ('buffered frame', color[name], False),
+                                        ('buffered no-color', plain[name], False)):
+            calls, size, seconds = measure(args.transport, frame, args.repeat, per_line)
+            print(f"{name:>12s} {method:>18s} {calls:9.0f} {size:8,.0f} {seconds * 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start cost of each case source: the old Python-literal catalog, the JSON
+case store and a compiled binary pack. "first case" times opening the catalog
+and fetching one case; "menu" times opening it and listing every case header.
+
+Usage: python -m benchmarks.bench_startup_pack [--count 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from case_data import CaseData
+from case_generator import generate_cases
+from case_pack import compile_pack
+from case_store import write_case_store
+
+
+def best_time(repeat: int, func) -> float:
+    """Best wall time of ``repeat`` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare case catalog startup times')
+    parser.add_argument('--count', type=int, default=10_000, help='Number of generated cases')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    probe_id = args.count // 2
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = os.path.join(tmp, 'store')
+        pack_path = os.path.join(tmp, 'cases.pack')
+        write_case_store(generate_cases(args.count), store_dir)
+        compile_pack(generate_cases(args.count), pack_path)
+
+        # The original CaseData rebuilt a literal list of dicts on every construction
+        source = f"def load_cases():\n    return {list(generate_cases(args.count))!r}\n"
+        namespace = {}
+        compile_ms = best_time(1, lambda: exec(compile(source, 'literal_cases', 'exec'), namespace))
+        literal_ms = best_time(args.repeat, lambda: namespace['load_cases']()[probe_id - 1])
+
+        rows = [
+            ('Python literal (compile once)', compile_ms),
+            ('Python literal (construct)', literal_ms),
+        ]
+        for name, source in (('JSON case store', store_dir), ('Binary pack', pack_path)):
+            first_case = best_time(args.repeat, lambda: CaseData(source).get_case(probe_id))
+            menu = best_time(args.repeat, lambda: CaseData(source).get_all_cases())
+            rows.append((f"{name} (first case)", first_case))
+            rows.append((f"{name} (menu)", menu))
+
+        print(f"Cases: {args.count}  (pack {os.path.getsize(pack_path) / 1e6:.1f} MB)")
+        for name, ms in rows:
+            print(f"{name:34s} {ms:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Bytes sent to the terminal by the countdown status line.
+
+Replays a full countdown (one update per second, a question every 20s)
+through StatusLine into a buffer and compares it with reprinting the whole
+line on every tick.
+
+Usage: python -m benchmarks.bench_status_line [--seconds 600]
+"""
+
+import argparse
+import io
+import shutil
+import time
+
+from game_session import format_time
+from status_line import RESET, RESTORE_CURSOR, REVERSE, SAVE_CURSOR, StatusLine
+
+
+def status_text(remaining: int, questions: int) -> str:
+    return (f" CASE 1: The Locked Room Mystery  |  TIME LEFT {format_time(remaining)}  |  "
+            f"QUESTIONS {questions}  |  'help' for commands")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure status line redraw traffic')
+    parser.add_argument('--seconds', type=int, default=600, help='Length of the countdown')
+    args = parser.parse_args()
+
+    status = StatusLine(io.StringIO(), enabled=True)
+    status.show()
+    after_show = status.bytes_written
+    start = time.perf_counter()
+    for second in range(args.seconds, -1, -1):
+        status.update(status_text(second, (args.seconds - second) // 20))
+    elapsed = time.perf_counter() - start
+    diffed = status.bytes_written - after_show
+
+    width = shutil.get_terminal_size().columns
+    full = sum(len((SAVE_CURSOR + REVERSE + '\x1b[1;1H'
+                    + status_text(second, (args.seconds - second) // 20).ljust(width)[:width]
+                    + RESET + RESTORE_CURSOR).encode('utf-8'))
+               for second in range(args.seconds, -1, -1))
+
+    updates = args.seconds + 1
+    print(f"{updates:,} updates on a {width}-column terminal")
+    print(f"{'redraw':>14s} {'bytes':>10s} {'bytes/update':>13s}")
+    print(f"{'full line':>14s} {full:10,d} {full / updates:13.1f}")
+    print(f"{'changed only':>14s} {diffed:10,d} {diffed / updates:13.1f}")
+    print(f"\n{elapsed / updates * 1e6:.1f}µs per update")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+CPU cost and wake-ups of many armed game timers.
+
+Arms N timers that will not expire during the measurement and reports the
+process CPU time and thread wake-ups over a fixed window, for the shared
+TimerService and for the old design of one thread per timer polling every
+0.1s. Then arms N timers that all expire within a second and reports how
+late their callbacks ran.
+
+Usage: python -m benchmarks.bench_timers [--timers 10000] [--window 5] [--skip-polling]
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from timer import GameTimer, TimerService
+
+
+class PollingTimer:
+    """The previous GameTimer: a daemon thread per timer, waking every 0.1s"""
+
+    def __init__(self, duration: float, stop_event: threading.Event, counter: list):
+        self.deadline = time.time() + duration
+        self.stop_event = stop_event
+        self.counter = counter
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self._loop, daemon=True)
+        thread.start()
+        return thread
+
+    def _loop(self):
+        while not self.stop_event.is_set() and time.time() < self.deadline:
+            self.counter[0] += 1
+            time.sleep(0.1)
+
+
+def measure(window: float):
+    cpu, wall = time.process_time(), time.perf_counter()
+    time.sleep(window)
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+def idle_service(count: int, window: float):
+    service = TimerService()
+    timers = [GameTimer(random.uniform(600, 1200), service=service) for _ in range(count)]
+    for timer in timers:
+        timer.start()
+    before = service.wakeups
+    cpu, wall = measure(window)
+    wakeups = service.wakeups - before
+    for timer in timers:
+        timer.stop()
+    service.stop()
+    return cpu, wall, wakeups, 1
+
+
+def idle_polling(count: int, window: float):
+    stop_event = threading.Event()
+    counter = [0]
+    threads = [PollingTimer(1200, stop_event, counter).start() for _ in range(count)]
+    before = counter[0]
+    cpu, wall = measure(window)
+    wakeups = counter[0] - before
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    return cpu, wall, wakeups, len(threads)
+
+
+def lateness(count: int):
+    """Seconds between each deadline and its callback, for timers due within a second"""
+    service = TimerService()
+    late = []
+    done = threading.Event()
+
+    def expired(deadline):
+        late.append(service.clock() - deadline)
+        if len(late) == count:
+            done.set()
+
+    now = service.clock()
+    for _ in range(count):
+        deadline = now + 0.5 + random.random()
+        service.call_at(deadline, lambda deadline=deadline: expired(deadline))
+    done.wait(30)
+    service.stop()
+    late.sort()
+    return late[len(late) // 2], late[int(len(late) * 0.99)], late[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cost of armed game timers')
+    parser.add_argument('--timers', type=int, default=10_000, help='Timers armed at once')
+    parser.add_argument('--window', type=float, default=5.0,
+                        help='Seconds to measure the idle timers for')
+    parser.add_argument('--skip-polling', action='store_true',
+                        help='Only measure the shared timer service')
+    args = parser.parse_args()
+
+    print(f"{args.timers:,} armed timers over {args.window:.0f}s")
+    print(f"{'design':>18s} {'threads':>8s} {'CPU s':>8s} {'CPU %':>7s} {'wake-ups/s':>11s}")
+    designs = [('shared service', idle_service)]
+    if not args.skip_polling:
+        designs.append(('thread per timer', idle_polling))
+    for name, run in designs:
+        cpu, wall, wakeups, threads = run(args.timers, args.window)
+        print(f"{name:>18s} {threads:8,d} {cpu:8.2f} {cpu / wall:7.1%} {wakeups / wall:11,.0f}")
+
+    median, p99, worst = lateness(args.timers)
+    print(f"\n{args.timers:,} timers expiring within 1.5s, callback lateness: "
+          f"median {median * 1000:.2f}ms, p99 {p99 * 1000:.2f}ms, max {worst * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Synthetic case catalogs for benchmarks"""
+
+import json
+from typing import Iterator
+
+from case_generator import generate_cases
+
+
+def synthetic_json(count: int, seed: int = 0) -> Iterator[str]:
+    """Yield ``count`` generated case documents as JSON text"""
+    for case in generate_cases(count, seed):
+        yield json.dumps(case)
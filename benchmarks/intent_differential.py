@@ -0,0 +1,125 @@
+"""
+Differential check of intent decisions against the original implementation.
+
+benchmarks/data/intent_corpus.tsv holds one question per line with the intent
+the original TextProcessor._identify_question_type (a substring test plus a
+difflib ratio per pattern) picked for it. This script runs the classifier
+process_question currently uses (TextProcessor.classify_batch) over the corpus
+and reports which decisions stayed the same and which changed.
+
+The corpus is held out from the classifier's training set
+(data/intent_training.tsv); any question found in both is skipped and
+counted, so the comparison never scores questions the model was trained on.
+
+Usage:
+    python -m benchmarks.intent_differential              # report
+    python -m benchmarks.intent_differential --changed    # also list every changed question
+    python -m benchmarks.intent_differential --regenerate QUESTIONS.txt
+"""
+
+import argparse
+import os
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from intent_model import read_training_set
+from normalizer import normalize
+from text_processor import TextProcessor
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'intent_corpus.tsv')
+NO_INTENT = '-'
+
+
+def legacy_identify_question_type(patterns: Dict[str, List[str]], question: str) -> Optional[str]:
+    """The original implementation, kept verbatim for regenerating the corpus"""
+    best_match = None
+    best_score = 0
+
+    for q_type, q_patterns in patterns.items():
+        for pattern in q_patterns:
+            if pattern in question:
+                score = SequenceMatcher(None, pattern, question).ratio()
+                if score > best_score:
+                    best_score = score
+                    best_match = q_type
+
+    return best_match if best_score > 0.1 else None
+
+
+def read_corpus(path: str = CORPUS_PATH) -> List[Tuple[str, str]]:
+    """Read (question, original intent) pairs"""
+    corpus = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            question, intent = line.rstrip('\n').split('\t')
+            corpus.append((question, intent))
+    return corpus
+
+
+def regenerate(questions_path: str, path: str = CORPUS_PATH):
+    """Rebuild the corpus from a question list using the original implementation"""
+    patterns = TextProcessor().question_patterns
+    with open(questions_path, encoding='utf-8') as f:
+        questions = [line.rstrip('\n') for line in f if line.strip()]
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# question\tintent chosen by the original substring + SequenceMatcher "
+                "classifier\n")
+        for question in questions:
+            intent = legacy_identify_question_type(patterns, question.lower()) or NO_INTENT
+            f.write(f"{question}\t{intent}\n")
+    print(f"Wrote {len(questions)} questions to {path}")
+
+
+def compare(path: str = CORPUS_PATH) -> Tuple[List[Tuple[str, str]], List[str], int]:
+    """
+    Classify the held-out corpus: its (question, original intent) pairs, the
+    current intent of each (NO_INTENT for none) and how many corpus questions
+    were skipped for being in the training set
+    """
+    trained = {normalize(question).text for question in read_training_set()[0]}
+    full = read_corpus(path)
+    corpus = [(question, intent) for question, intent in full
+              if normalize(question).text not in trained]
+    decisions = TextProcessor().classify_batch([normalize(question) for question, _ in corpus])
+    return corpus, [decision or NO_INTENT for decision in decisions], len(full) - len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare intent decisions with the original classifier')
+    parser.add_argument('--changed', action='store_true',
+                        help='List every question whose intent changed')
+    parser.add_argument('--regenerate', metavar='QUESTIONS',
+                        help='Rebuild the corpus from a question list')
+    args = parser.parse_args()
+
+    if args.regenerate:
+        regenerate(args.regenerate)
+        return
+
+    corpus, decisions, skipped = compare()
+    if skipped:
+        print(f"Skipped {skipped} questions that are also in the training set")
+    transitions = Counter()
+    changed = []
+    for (question, original), current in zip(corpus, decisions):
+        transitions[(original, current)] += 1
+        if current != original:
+            changed.append((question, original, current))
+
+    print(f"Questions: {len(corpus)}  same: {len(corpus) - len(changed)}  changed: {len(changed)}")
+    for (original, current), count in sorted(transitions.items()):
+        marker = ' ' if original == current else '*'
+        print(f" {marker} {original:>12s} -> {current:<12s} {count:4d}")
+
+    if args.changed:
+        for question, original, current in changed:
+            print(f"{original:>12s} -> {current:<12s} {question}")
+
+
+if __name__ == "__main__":
+    main()
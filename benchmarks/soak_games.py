@@ -0,0 +1,139 @@
+"""
+Soak test for the terminal game: many back-to-back games in one session.
+
+Drives DetectiveGame.run with a scripted player on a virtual clock (so timed
+cases end instantly) and output discarded. Games cycle through the catalog
+and through four endings: solved, a wrong accusation then solved, no
+accusation before time runs out, and interrupted by the player with
+Ctrl-C. At checkpoints it reports games played, peak stack depth, live
+objects and resident memory, which should all stay flat. tests/test_soak.py
+runs a short soak and asserts that they do.
+
+Usage: python -m benchmarks.soak_games [--games 100000]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+from clock import VirtualClock
+from console import Console
+from detective_game import DetectiveGame
+from renderer import Renderer
+
+
+class NullOutput:
+    """A terminal that discards everything written to it"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def rss_mb() -> float:
+    """Current resident memory, or peak where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+class ScriptedPlayer:
+    """Input stream that plays games forever, tracking how deep the stack is when it is read"""
+
+    def __init__(self, game_count: int, clock: VirtualClock, game: DetectiveGame):
+        self.game_count = game_count
+        self.clock = clock
+        self.game = game
+        self.games_started = 0
+        self.max_depth = 0
+        self.checkpoint = None
+        self._lines = self._script()
+
+    def readline(self) -> str:
+        depth = 0
+        frame = sys._getframe()
+        while frame:
+            depth += 1
+            frame = frame.f_back
+        self.max_depth = max(self.max_depth, depth)
+        line = next(self._lines)
+        if isinstance(line, BaseException):
+            raise line
+        return line + '\n'
+
+    def _script(self) -> Iterator:
+        case_ids = [case['id'] for case in self.game.case_data.get_all_cases()]
+        for number in range(self.game_count):
+            case = self.game.case_data.get_case(case_ids[number % len(case_ids)])
+            self.games_started += 1
+            if self.checkpoint:
+                self.checkpoint(number)
+            yield str(case['id'])
+            yield ''  # past the instructions
+            yield 'where was everyone at the time of death?'
+            ending = number % 4
+            if ending == 1:
+                wrong = next(suspect['name'] for suspect in case['suspects']
+                             if suspect['name'].lower() != case['killer'].lower())
+                yield f"accuse {wrong}"
+            if ending in (0, 1):
+                yield f"accuse {case['killer']}"
+            elif ending == 2:
+                # The timer fires while the player is typing
+                self.clock.advance(case['time_limit'] + 1)
+                yield 'what was the motive?'
+            else:
+                yield KeyboardInterrupt()
+            yield 'y' if number + 1 < self.game_count else 'n'
+
+
+def soak(game_count: int, checkpoint: Optional[Callable[[ScriptedPlayer, int], None]] = None
+         ) -> Tuple[DetectiveGame, ScriptedPlayer]:
+    """Play game_count scripted games in one DetectiveGame.run, checkpointing before each"""
+    clock = VirtualClock()
+    output = NullOutput()
+    game = DetectiveGame(clock=clock, renderer=Renderer(output, color=False))
+    player = ScriptedPlayer(game_count, clock, game)
+    game.console = Console(player, output=output)
+    if checkpoint:
+        player.checkpoint = lambda number: checkpoint(player, number)
+    game.run()
+    return game, player
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play many back-to-back games and watch memory and stack depth')
+    parser.add_argument('--games', type=int, default=100_000, help='Games to play')
+    parser.add_argument('--checkpoints', type=int, default=10, help='Progress lines to print')
+    args = parser.parse_args()
+
+    every = max(1, args.games // args.checkpoints)
+    start = time.perf_counter()
+    print(f"{'games':>9s} {'games/s':>9s} {'max stack':>10s} {'objects':>10s} {'RSS MB':>8s}")
+
+    def checkpoint(player: ScriptedPlayer, number: int):
+        if number % every == 0 or number == args.games - 1:
+            elapsed = time.perf_counter() - start
+            print(f"{number:9,d} {number / max(elapsed, 1e-9):9,.0f} {player.max_depth:10d} "
+                  f"{len(gc.get_objects()):10,d} {rss_mb():8.1f}", flush=True)
+
+    game, player = soak(args.games, checkpoint)
+    elapsed = time.perf_counter() - start
+    print(f"\n{player.games_started:,} games in {elapsed:.1f}s, "
+          f"max stack depth {player.max_depth}, {game.timers.pending()} timers left armed")
+
+
+if __name__ == "__main__":
+    main()
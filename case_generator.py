@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Procedural case generator.
+
+Cases are assembled from seeded templates one at a time, so any number of them
+can be streamed to a file (or played endlessly) without being held in memory.
+The same (seed, case id) pair always produces the same case.
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Dict, Iterator, Optional
+
+from case_model import validate_case
+
+FIRST_NAMES = [
+    'Alice', 'Arthur', 'Beatrice', 'Benjamin', 'Clara', 'Daniel', 'Diana', 'Edward', 'Eleanor',
+    'Felix', 'Fiona', 'George', 'Grace', 'Harold', 'Helen', 'Isaac', 'Iris', 'Jack', 'Julia',
+    'Kevin', 'Laura', 'Leonard', 'Lucy', 'Marcus', 'Martha', 'Nathan', 'Nora', 'Oliver', 'Olivia',
+    'Patrick', 'Priya', 'Quentin', 'Rosa', 'Samuel', 'Sofia', 'Thomas', 'Ursula', 'Victor',
+    'Wendy', 'Yusuf',
+]
+
+SURNAMES = [
+    'Ashford', 'Barnes', 'Castellano', 'Delgado', 'Ellison', 'Fairbanks', 'Garrison', 'Hale',
+    'Ingram', 'Jameson', 'Kowalski', 'Lindqvist', 'Mercer', 'Nakamura', 'Okafor', 'Pemberton',
+    'Quinn', 'Ramsey', 'Sinclair', 'Thornton', 'Underwood', 'Vance', 'Whitmore', 'Xu', 'Yardley',
+    'Zimmerman',
+]
+
+OCCUPATIONS = [
+    'Accountant', 'Architect', 'Bartender', 'Chef', 'Curator', 'Dentist', 'Engineer', 'Florist',
+    'Gardener', 'Journalist', 'Lawyer', 'Librarian', 'Mechanic', 'Musician', 'Nurse', 'Pharmacist',
+    'Photographer', 'Pilot', 'Professor', 'Real Estate Agent', 'Research Scientist', 'Surgeon',
+    'Tailor', 'Veterinarian',
+]
+
+# (location, scene description, where the killer could hide their tracks)
+LOCATIONS = [
+    ('Lakeside Cabin', 'A cramped cabin with a cold fireplace and an overturned chair',
+     'the boathouse'),
+    ('City Penthouse', 'A spotless penthouse with a shattered glass table in the living room',
+     'the service elevator'),
+    ('Country Vineyard', 'Rows of vines surround the cellar where the body was found',
+     'the wine cellar'),
+    ('Harbor Warehouse', 'Stacked crates and a flickering light over a pool of oil',
+     'the loading dock'),
+    ('University Laboratory', 'Benches covered in glassware, one experiment left running',
+     'the fume cupboard'),
+    ('Seaside Hotel', 'A suite with an untouched room service tray and an open balcony door',
+     'the staff stairwell'),
+    ('Mountain Lodge', 'A trophy room with snow melting on the floor near the door',
+     'the ski shed'),
+    ('Downtown Theater', 'The stage is dark except for a single spotlight on the body',
+     'the prop room'),
+    ('Private Library', 'Shelves of rare books, with one ladder pulled out of place',
+     'the reading room'),
+    ('Botanical Greenhouse', 'Humid air, broken pots and muddy tracks between the orchids',
+     'the potting shed'),
+]
+
+# (weapon type, description, cause of death, evidence item, how it was used)
+WEAPONS = [
+    ('Knife', 'A kitchen knife was found wiped clean near the body.', 'a stab wound',
+     'Kitchen knife wiped clean of prints', 'stabbed {victim} and wiped the knife'),
+    ('Poison', 'Traces of arsenic were found in the victim\'s teacup.', 'arsenic poisoning',
+     'Teacup with arsenic residue', 'slipped arsenic into {victim}\'s tea'),
+    ('Revolver', 'An antique revolver was recovered from a nearby drawer, one round fired.',
+     'a gunshot wound', 'Antique revolver with one spent round',
+     'shot {victim} with the antique revolver'),
+    ('Candlestick', 'A heavy brass candlestick lay beside the body, dented at the base.',
+     'blunt force trauma', 'Dented brass candlestick',
+     'struck {victim} with the brass candlestick'),
+    ('Rope', 'A length of climbing rope was found coiled under a chair.', 'strangulation',
+     'Climbing rope with torn fibres', 'strangled {victim} with climbing rope'),
+    ('Insulin', 'An insulin syringe was found in the waste bin, nearly empty.',
+     'an insulin overdose', 'Nearly empty insulin syringe',
+     'injected {victim} with a massive dose of insulin'),
+]
+
+# (relationship, motive) pairs; {victim} is the victim's first name
+RELATIONSHIPS = [
+    ('Business partner', '{victim} was about to dissolve their partnership and take the clients'),
+    ('Estranged sibling', '{victim} inherited the family estate and left them nothing'),
+    ('Former spouse', 'Bitter divorce, and {victim}\'s life insurance still named them'),
+    ('Employee', '{victim} caught them embezzling and threatened to call the police'),
+    ('Neighbor', 'A long boundary dispute with {victim} had just gone to court'),
+    ('Rival', '{victim} was about to expose their plagiarised work'),
+    ('Old friend', '{victim} refused to repay a large loan'),
+    ('Lover', '{victim} ended the affair and threatened to tell their family'),
+    ('Tenant', '{victim} was evicting them at the end of the month'),
+    ('Personal assistant', '{victim} discovered they had been forging signatures'),
+]
+
+ALIBIS = [
+    'Claims to have been asleep in another room',
+    'Says they were on a phone call with a friend',
+    'Claims to have been walking the dog outside',
+    'Says they were cooking dinner in the kitchen',
+    'Claims to have been reading in the study',
+    'Says they had gone out to buy cigarettes',
+    'Claims to have been taking a bath upstairs',
+    'Says they were fixing the car in the garage',
+]
+
+# Evidence that exposes the killer; {killer} is the killer's full name, {place} the hiding place
+KEY_EVIDENCE = [
+    'Security footage showed {killer} entering {place} minutes before the murder',
+    'A receipt in {killer}\'s coat placed them at the scene',
+    '{killer}\'s fingerprints were found on the weapon under the wiped surface',
+    'Phone records contradicted {killer}\'s alibi',
+    'Mud matching {place} was found on {killer}\'s shoes',
+]
+
+RED_HERRINGS = [
+    'An unsigned threatening letter',
+    'A torn photograph in the fireplace',
+    'A missing page from the victim\'s diary',
+    'An unlocked back window',
+    'A half-finished glass of whiskey',
+    'Cigarette ash on the carpet',
+]
+
+TITLE_ADJECTIVES = ['Silent', 'Crimson', 'Final', 'Hidden', 'Broken', 'Midnight', 'Forgotten',
+                    'Last']
+TITLE_NOUNS = ['Witness', 'Toast', 'Curtain', 'Signature', 'Key', 'Portrait', 'Alibi', 'Letter']
+
+DIFFICULTIES = {'Easy': (3, 300), 'Medium': (4, 480), 'Hard': (5, 600)}
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+          'September', 'October', 'November', 'December']
+
+
+def generate_case(case_id: int, seed: int = 0) -> Dict:
+    """Generate one case; the same (case_id, seed) always gives the same case"""
+    rng = random.Random(f"{seed}:{case_id}")
+
+    difficulty = rng.choice(list(DIFFICULTIES))
+    suspect_count, time_limit = DIFFICULTIES[difficulty]
+    location, scene_description, hiding_place = rng.choice(LOCATIONS)
+    weapon_type, weapon_description, cause, weapon_evidence, method = rng.choice(WEAPONS)
+
+    first_names = rng.sample(FIRST_NAMES, suspect_count + 1)
+    victim_surname = rng.choice(SURNAMES)
+    victim_name = f"{first_names[0]} {victim_surname}"
+    victim_occupation = rng.choice(OCCUPATIONS)
+
+    suspects = []
+    relationships = rng.sample(RELATIONSHIPS, suspect_count)
+    for first_name, (relationship, motive) in zip(first_names[1:], relationships):
+        # Relatives sometimes share the victim's surname
+        if relationship in ('Estranged sibling', 'Former spouse') or rng.random() < 0.15:
+            surname = victim_surname
+        else:
+            surname = rng.choice(SURNAMES)
+        suspects.append({
+            "name": f"{first_name} {surname}",
+            "age": rng.randint(22, 75),
+            "occupation": rng.choice(OCCUPATIONS),
+            "relationship": relationship,
+            "alibi": rng.choice(ALIBIS),
+            "motive": motive.format(victim=first_names[0]),
+        })
+
+    killer = rng.choice(suspects)
+    key_evidence = rng.choice(KEY_EVIDENCE).format(killer=killer['name'], place=hiding_place)
+    hour = rng.randint(1, 12)
+    time_of_death = f"{hour}:{rng.choice(['00', '15', '30', '45'])} {rng.choice(['AM', 'PM'])}"
+
+    return {
+        "id": case_id,
+        "title": f"The {rng.choice(TITLE_ADJECTIVES)} {rng.choice(TITLE_NOUNS)}",
+        "description": f"A {victim_occupation.lower()} is found dead at the {location.lower()}",
+        "difficulty": difficulty,
+        "time_limit": time_limit,
+        "location": location,
+        "date": f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2023",
+        "summary": (f"{victim_name} was found dead at the {location}, killed by {cause}. "
+                    f"{suspect_count} people had reason to be there that day."),
+        "victim": {
+            "name": victim_name,
+            "age": rng.randint(25, 80),
+            "occupation": victim_occupation,
+            "description": f"Died from {cause}",
+        },
+        "weapon": {
+            "type": weapon_type,
+            "description": weapon_description,
+        },
+        "suspects": suspects,
+        "evidence": ([weapon_evidence] + rng.sample(RED_HERRINGS, 2)
+                     + [f"Disturbed dust in {hiding_place}"]),
+        "killer": killer['name'].lower(),
+        "solution": {
+            "killer": killer['name'],
+            "motive": killer['motive'],
+            "method": (f"{_sentence_case(method.format(victim=first_names[0]))}, "
+                       f"then slipped out through {hiding_place}"),
+            "key_evidence": key_evidence,
+        },
+        "time_of_death": time_of_death,
+        "scene_description": scene_description,
+        "motive_hint": f"Someone close to {first_names[0]} knew the way through {hiding_place}",
+    }
+
+
+def _sentence_case(text: str) -> str:
+    """Capitalize the first letter only (str.capitalize would lowercase names)"""
+    return text[:1].upper() + text[1:]
+
+
+def generate_cases(count: Optional[int] = None, seed: int = 0, start_id: int = 1) -> Iterator[Dict]:
+    """Yield generated cases one at a time; endless when count is None"""
+    case_id = start_id
+    while count is None or case_id < start_id + count:
+        yield generate_case(case_id, seed)
+        case_id += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate procedural cases as JSON lines')
+    parser.add_argument('--count', type=int, default=100, help='Number of cases to generate')
+    parser.add_argument('--seed', type=int, default=0, help='Template seed')
+    parser.add_argument('--start-id', type=int, default=1, help='ID of the first generated case')
+    parser.add_argument('--out', default='-', help="Output JSONL file ('-' for stdout)")
+    parser.add_argument('--store', help='Write a case store directory instead of JSONL')
+    parser.add_argument('--check', action='store_true',
+                        help='Validate every case before writing it')
+
+    args = parser.parse_args()
+
+    cases = generate_cases(args.count, args.seed, args.start_id)
+    if args.check:
+        cases = _checked(cases)
+
+    if args.store:
+        from case_store import write_case_store
+        count = write_case_store(cases, args.store)
+        print(f"Wrote {count} cases to {args.store}", file=sys.stderr)
+        return
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8')
+    try:
+        for case in cases:
+            out.write(json.dumps(case, ensure_ascii=False))
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _checked(cases: Iterator[Dict]) -> Iterator[Dict]:
+    """Pass cases through, failing on the first one that breaks the schema"""
+    for case in cases:
+        errors = validate_case(case)
+        if errors:
+            raise ValueError(f"Case {case.get('id')} is invalid: {'; '.join(errors)}")
+        yield case
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Immutable case records.
+
+Cases, victims, weapons, suspects and solutions are stored in slotted records
+with interned strings instead of nested dicts. Every record is also a read-only
+Mapping, so code written against the dict layout (``case['title']``,
+``case.get('suspects', [])``) keeps working unchanged.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+from answer_table import build_answer_table, is_current
+
+if TYPE_CHECKING:
+    from name_index import NameIndex
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so repeated values share one object across cases"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def validate_case(case: Dict) -> List[str]:
+    """Check a case against the schema the game relies on. Returns a list of problems."""
+    errors = []
+    for field in ('id', 'title', 'description', 'difficulty', 'time_limit', 'location', 'date',
+                  'summary', 'killer', 'time_of_death', 'scene_description', 'motive_hint'):
+        if not case.get(field):
+            errors.append(f"missing {field}")
+
+    for field, record in (('victim', Victim), ('weapon', Weapon), ('solution', Solution)):
+        value = case.get(field) or {}
+        errors.extend(f"missing {field}.{key}" for key in record._fields if key not in value)
+
+    suspects = case.get('suspects') or []
+    if not suspects:
+        errors.append("no suspects")
+    for suspect in suspects:
+        errors.extend(f"suspect missing {key}" for key in Suspect._fields if key not in suspect)
+    if not case.get('evidence'):
+        errors.append("no evidence")
+
+    names = [suspect.get('name', '').lower() for suspect in suspects]
+    if len(set(names)) != len(names):
+        errors.append("duplicate suspect names")
+    killer = case.get('killer', '').lower()
+    if killer and killer not in names:
+        errors.append(f"killer '{killer}' is not a suspect")
+    if killer and (case.get('solution') or {}).get('killer', '').lower() != killer:
+        errors.append("solution names a different killer")
+    return errors
+
+
+def _rebuild(cls, values: Tuple) -> 'Record':
+    """Pickle support: recreate a record from its slot values"""
+    record = cls.__new__(cls)
+    for slot, value in zip(cls.__slots__, values):
+        object.__setattr__(record, slot, value)
+    return record
+
+
+class Record(Mapping):
+    """Base class for immutable records readable as attributes or as dict keys"""
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    # Fields holding a nested record, or a tuple of records / plain values
+    _nested: Dict[str, type] = {}
+    _sequences: Dict[str, Any] = {}
+
+    def __init__(self, **values):
+        # Every slot is set; slots outside _fields hold metadata such as Case.version
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, values.get(slot))
+
+    @classmethod
+    def from_dict(cls, data: Dict, **metadata) -> 'Record':
+        """Build a record from the dict layout used by the case files"""
+        if isinstance(data, cls) and not metadata:
+            return data
+
+        values = {}
+        for field in cls._fields:
+            value = data.get(field)
+            if value is None:
+                continue
+            if field in cls._nested:
+                value = cls._nested[field].from_dict(value)
+            elif field in cls._sequences:
+                item_type = cls._sequences[field]
+                if item_type is None:
+                    value = tuple(_intern(item) for item in value)
+                else:
+                    value = tuple(item_type.from_dict(item) for item in value)
+            else:
+                value = _intern(value)
+            values[field] = value
+        return cls(**values, **metadata)
+
+    def to_dict(self) -> Dict:
+        """Convert back to plain dicts and lists, e.g. for JSON serialization"""
+        data = {}
+        for field, value in self.items():
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = [item.to_dict() if isinstance(item, Record) else item for item in value]
+            data[field] = value
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self._fields if getattr(self, field) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return _rebuild, (type(self), tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{field}={value!r}" for field, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+
+class Victim(Record):
+    __slots__ = _fields = ('name', 'age', 'occupation', 'description')
+
+
+class Weapon(Record):
+    __slots__ = _fields = ('type', 'description')
+
+
+class Suspect(Record):
+    __slots__ = _fields = ('name', 'age', 'occupation', 'relationship', 'alibi', 'motive')
+
+
+class Solution(Record):
+    __slots__ = _fields = ('killer', 'motive', 'method', 'key_evidence')
+
+
+class Case(Record):
+    _fields = (
+        'id', 'title', 'description', 'difficulty', 'time_limit', 'location', 'date', 'summary',
+        'victim', 'weapon', 'suspects', 'evidence', 'killer', 'solution',
+        'time_of_death', 'scene_description', 'motive_hint',
+    )
+    # Metadata outside the dict view: version identifies the CaseData and the
+    # catalog version in which this case's content last changed, and is unique
+    # in the process; answers is its precomputed answer table;
+    # _names caches the suspect name index, built on first use
+    __slots__ = _fields + ('version', 'answers', '_names')
+    _nested = {'victim': Victim, 'weapon': Weapon, 'solution': Solution}
+    _sequences = {'suspects': Suspect, 'evidence': None}
+
+    @classmethod
+    def from_dict(cls, data: Dict, **metadata) -> 'Case':
+        """Build a case, reusing a serialized answer table if it is current or building a new one"""
+        if isinstance(data, cls) and not metadata:
+            return data
+
+        answers = metadata.pop('answers', None)
+        if answers is None:
+            answers = data.answers if isinstance(data, cls) else data.get('answers')
+        case = super().from_dict(data, **metadata)
+        if not is_current(answers):
+            answers = build_answer_table(case)
+        object.__setattr__(case, 'answers', answers)
+        return case
+
+    @property
+    def names(self) -> 'NameIndex':
+        """Index resolving (possibly misspelled) references to this case's suspects"""
+        if self._names is None:
+            # Imported here so loading cases (e.g. for the menu) does not load name matching
+            from name_index import NameIndex
+            names = NameIndex(suspect['name'] for suspect in self.suspects or ())
+            object.__setattr__(self, '_names', names)
+        return self._names
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Precompiled binary case packs.
+
+A pack is a single versioned file that CaseData memory-maps. Opening one only
+reads the fixed-size header; case headers and bodies are decoded on demand.
+
+Layout (little-endian, all offsets absolute):
+
+    header        magic, version, flags, case / string / suspect name counts,
+                  section offsets, CRC-32 of everything after the header
+    case table    one fixed-width row per case, sorted by id: id, body offset,
+                  body length, content CRC-32, then the menu header columns (title,
+                  description, difficulty, location and victim occupation as
+                  string indexes, time limit, and a slice of the name table)
+    name table    u32 string indexes of every case's suspect names
+    string table  (string count + 1) u32 offsets into the UTF-8 blob that follows
+    records       case bodies as tagged values; strings are string table indexes.
+                  Each body carries its precomputed answer table under 'answers'.
+
+Replace a pack by writing a new file and renaming it over the old one, as
+write_pack does. A pack overwritten in place (e.g. with cp) is picked up by
+refresh(), but the old mapping is unusable from the moment the file is
+truncated, so cases not yet loaded cannot be read until the new pack is.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from answer_table import build_answer_table, is_current
+from case_store import CaseStore, case_header
+
+MAGIC = b'CPAK'
+PACK_VERSION = 1
+
+HEADER = struct.Struct('<4sHHIIIIIIII')
+CASE_ROW = struct.Struct('<IIIIIIIIIIII')
+U32 = struct.Struct('<I')
+I64 = struct.Struct('<q')
+F64 = struct.Struct('<d')
+
+# Value tags
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_LIST, TAG_DICT = range(8)
+
+
+class PackError(ValueError):
+    """Raised when a pack is malformed, from another version or fails its checksum"""
+
+
+class _StringTable:
+    """Assigns each distinct string an index while a pack is being compiled"""
+
+    def __init__(self):
+        self.indexes: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def index(self, value: str) -> int:
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _encode(value: Any, strings: _StringTable, out: bytearray):
+    """Append the tagged encoding of a JSON-like value"""
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        out += I64.pack(value)
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out += F64.pack(value)
+    elif isinstance(value, str):
+        out.append(TAG_STR)
+        out += U32.pack(strings.index(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(TAG_LIST)
+        out += U32.pack(len(value))
+        for item in value:
+            _encode(item, strings, out)
+    elif isinstance(value, dict):
+        out.append(TAG_DICT)
+        out += U32.pack(len(value))
+        for key, item in value.items():
+            out += U32.pack(strings.index(key))
+            _encode(item, strings, out)
+    else:
+        raise TypeError(f"Cannot pack value of type {type(value).__name__}")
+
+
+def compile_pack(cases: Iterable[Dict], path: str) -> int:
+    """Compile cases into a pack file, replacing it atomically. Returns the case count."""
+    strings = _StringTable()
+    records = bytearray()
+    names: List[int] = []
+    rows = []
+
+    for case in cases:
+        if hasattr(case, 'to_dict'):
+            case = case.to_dict()
+        elif 'answers' in case:
+            case = {field: value for field, value in case.items() if field != 'answers'}
+        header = case_header(case)
+        body_offset = len(records)
+        _encode(dict(case, answers=build_answer_table(case)), strings, records)
+        # Bodies refer to strings by index, so checksum the content itself (answers are
+        # derived from it)
+        content_crc = zlib.crc32(json.dumps(case, sort_keys=True).encode('utf-8'))
+        rows.append((
+            case['id'], body_offset, len(records) - body_offset, content_crc,
+            strings.index(header['title']), strings.index(header['description']),
+            strings.index(header['difficulty']), strings.index(header['location']),
+            strings.index(header['victim_occupation']), header['time_limit'],
+            len(names), len(header['suspects']),
+        ))
+        names.extend(strings.index(name) for name in header['suspects'])
+
+    rows.sort()
+    encoded = [value.encode('utf-8') for value in strings.strings]
+
+    case_table_offset = HEADER.size
+    name_table_offset = case_table_offset + CASE_ROW.size * len(rows)
+    string_table_offset = name_table_offset + U32.size * len(names)
+    blob_offset = string_table_offset + U32.size * (len(encoded) + 1)
+    record_offset = blob_offset + sum(len(value) for value in encoded)
+
+    body = bytearray()
+    for row in rows:
+        body += CASE_ROW.pack(row[0], record_offset + row[1], *row[2:])
+    body += struct.pack(f'<{len(names)}I', *names)
+    position = 0
+    for value in encoded:
+        body += U32.pack(position)
+        position += len(value)
+    body += U32.pack(position)
+    for value in encoded:
+        body += value
+    body += records
+
+    header = HEADER.pack(MAGIC, PACK_VERSION, 0, len(rows), len(encoded), len(names),
+                         case_table_offset, name_table_offset, string_table_offset, record_offset,
+                         zlib.crc32(body))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+class CasePack:
+    def __init__(self, path: str, verify: bool = False):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._file_stat = self._stat_of(os.fstat(f.fileno()))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            raise PackError(f"{path} is too short to be a case pack")
+        (magic, version, _flags, self.case_count, self.string_count, self._name_count,
+         self._case_table, self._name_table, self._string_table, self._records,
+         self.checksum) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise PackError(f"{path} is not a case pack")
+        if version != PACK_VERSION:
+            raise PackError(f"{path} is pack version {version}, expected {PACK_VERSION}")
+        if verify and not self.checksum_ok():
+            raise PackError(f"{path} failed its checksum")
+
+        self._blob = self._string_table + U32.size * (self.string_count + 1)
+        self._strings: Dict[int, str] = {}
+        self._headers: Optional[List[Dict]] = None
+        # Content CRCs, recorded by the first refresh() to diff the next file against
+        self._known_crcs: Optional[Dict[int, int]] = None
+        # Set when the file was overwritten in place, after which the mapping must not be read
+        self.stale = False
+
+    def checksum_ok(self) -> bool:
+        """Recompute the CRC-32 over everything after the header"""
+        return zlib.crc32(memoryview(self._map)[HEADER.size:]) == self.checksum
+
+    @property
+    def headers(self) -> List[Dict]:
+        """Case headers in id order, decoded the first time they are needed"""
+        if self._headers is None:
+            string = self._string
+            names = struct.unpack_from(f'<{self._name_count}I', self._map, self._name_table)
+            table = self._map[self._case_table:self._name_table]
+            self._headers = [{
+                'id': row[0],
+                'title': string(row[4]),
+                'description': string(row[5]),
+                'difficulty': string(row[6]),
+                'time_limit': row[9],
+                'location': string(row[7]),
+                'victim_occupation': string(row[8]),
+                'suspects': [string(name) for name in names[row[10]:row[10] + row[11]]],
+            } for row in CASE_ROW.iter_unpack(table)]
+        return self._headers
+
+    def __contains__(self, case_id: int) -> bool:
+        return self._find(case_id) is not None
+
+    def load(self, case_id: int) -> Optional[Dict]:
+        """Decode the full body of a case"""
+        row = self._find(case_id)
+        if row is None:
+            return None
+        return self._decode_at(self._row(row)[1])[0]
+
+    def refresh(self) -> Tuple['CasePack', List[Dict], List[int]]:
+        """
+        If the pack file was replaced, open the new one and diff the per-case
+        content checksums. Returns the pack to read from afterwards, the changed or new
+        case bodies and the removed case ids. This pack stays readable unless
+        the file was overwritten in place, which sets ``stale``.
+        """
+        if self._known_crcs is None:
+            self._known_crcs = self._crcs()
+        try:
+            stat = self._stat_of(os.stat(self.path))
+            if stat == self._file_stat:
+                return self, [], []
+            pack = CasePack(self.path, verify=True)
+        except (OSError, ValueError):
+            # Missing, empty (mmap raises ValueError) or half-written: keep serving this
+            # version and retry later
+            return self, [], []
+
+        self.stale = stat[2] == self._file_stat[2]
+        old_crcs, new_crcs = self._known_crcs, pack._crcs()
+        pack._known_crcs = new_crcs
+        bodies = [pack.load(case_id) for case_id, crc in new_crcs.items()
+                  if old_crcs.get(case_id) != crc]
+        removed = [case_id for case_id in old_crcs if case_id not in new_crcs]
+        return pack, bodies, removed
+
+    def close(self):
+        self._map.close()
+
+    @staticmethod
+    def _stat_of(stat: os.stat_result) -> Tuple[int, int, int]:
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _crcs(self) -> Dict[int, int]:
+        """Content CRC-32 of every case, keyed by id"""
+        table = self._map[self._case_table:self._name_table]
+        return {row[0]: row[3] for row in CASE_ROW.iter_unpack(table)}
+
+    def _row(self, row: int):
+        return CASE_ROW.unpack_from(self._map, self._case_table + CASE_ROW.size * row)
+
+    def _find(self, case_id: int) -> Optional[int]:
+        """Binary search the id-sorted case table"""
+        low, high = 0, self.case_count
+        while low < high:
+            middle = (low + high) // 2
+            found = U32.unpack_from(self._map, self._case_table + CASE_ROW.size * middle)[0]
+            if found == case_id:
+                return middle
+            if found < case_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _string(self, index: int) -> str:
+        value = self._strings.get(index)
+        if value is None:
+            start, end = struct.unpack_from('<II', self._map, self._string_table + U32.size * index)
+            data = self._map[self._blob + start:self._blob + end]
+            value = self._strings[index] = data.decode('utf-8')
+        return value
+
+    def _decode_at(self, offset: int):
+        """Decode one tagged value, returning it with the offset just past it"""
+        data = self._map
+        tag = data[offset]
+        offset += 1
+        if tag == TAG_STR:
+            return self._string(U32.unpack_from(data, offset)[0]), offset + 4
+        if tag == TAG_INT:
+            return I64.unpack_from(data, offset)[0], offset + 8
+        if tag == TAG_DICT:
+            count = U32.unpack_from(data, offset)[0]
+            offset += 4
+            value = {}
+            for _ in range(count):
+                key = self._string(U32.unpack_from(data, offset)[0])
+                value[key], offset = self._decode_at(offset + 4)
+            return value, offset
+        if tag == TAG_LIST:
+            count = U32.unpack_from(data, offset)[0]
+            offset += 4
+            items = []
+            for _ in range(count):
+                item, offset = self._decode_at(offset)
+                items.append(item)
+            return items, offset
+        if tag == TAG_FLOAT:
+            return F64.unpack_from(data, offset)[0], offset + 8
+        if tag in (TAG_NONE, TAG_FALSE, TAG_TRUE):
+            return (None, False, True)[tag], offset
+        raise PackError(f"Unknown value tag {tag} at offset {offset - 1}")
+
+
+def is_pack(path: str) -> bool:
+    """Check whether a path is a case pack file (rather than a store directory)"""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_source(path: str) -> Iterator[Dict]:
+    """Yield cases from a case store directory or a JSONL file"""
+    if os.path.isdir(path):
+        store = CaseStore(path)
+        for header in store.headers:
+            yield store.load(header['id'])
+        return
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def verify_pack(path: str) -> List[str]:
+    """Check the checksum and decode every case. Returns a list of problems."""
+    from case_model import validate_case
+
+    try:
+        pack = CasePack(path)
+    except PackError as e:
+        return [str(e)]
+
+    errors = []
+    try:
+        if not pack.checksum_ok():
+            return ["checksum mismatch"]
+        for header in pack.headers:
+            case = pack.load(header['id'])
+            answers = case.pop('answers', None)
+            if case_header(case) != header:
+                errors.append(f"case {header['id']}: header does not match body")
+            if is_current(answers) and answers != build_answer_table(case):
+                errors.append(f"case {header['id']}: answer table does not match body")
+            errors.extend(f"case {header['id']}: {error}" for error in validate_case(case))
+    except (PackError, UnicodeDecodeError, struct.error, IndexError) as e:
+        errors.append(f"undecodable record: {e}")
+    finally:
+        pack.close()
+    return errors
+
+
+def main():
+    from case_store import DEFAULT_STORE_DIR
+
+    parser = argparse.ArgumentParser(description='Compile and verify binary case packs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = subparsers.add_parser(
+        'compile', help='Compile a case store or JSONL file into a pack')
+    compile_parser.add_argument('source', nargs='?', default=DEFAULT_STORE_DIR,
+                                help='Case store directory or JSONL file')
+    compile_parser.add_argument('-o', '--output', default='cases.pack', help='Pack file to write')
+
+    verify_parser = subparsers.add_parser('verify',
+                                          help='Check a pack checksum and decode every case')
+    verify_parser.add_argument('pack', help='Pack file to verify')
+
+    args = parser.parse_args()
+
+    if args.command == 'compile':
+        count = compile_pack(read_source(args.source), args.output)
+        print(f"Compiled {count} cases into {args.output} ({os.path.getsize(args.output)} bytes)")
+        return
+
+    errors = verify_pack(args.pack)
+    if errors:
+        for error in errors:
+            print(f"❌ {error}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {args.pack} is valid")
+
+
+if __name__ == "__main__":
+    main()
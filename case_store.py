@@ -0,0 +1,195 @@
+"""
+On-disk case store: a small header index plus one JSON file per case.
+
+Only the index is read when the store is opened; case bodies are parsed the
+first time they are requested.
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_FILE = 'index.json'
+STORE_FORMAT = 1
+HEADER_FIELDS = ('id', 'title', 'description', 'difficulty', 'time_limit', 'location')
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cases')
+
+
+def case_filename(case_id: int) -> str:
+    """File name used for a case body inside the store"""
+    return f"case_{case_id:04d}.json"
+
+
+def case_header(case: Dict) -> Dict:
+    """Extract the index header (the fields menus and lookups need) from a full case"""
+    header = {field: case[field] for field in HEADER_FIELDS if field in case}
+    header['victim_occupation'] = case.get('victim', {}).get('occupation', '')
+    header['suspects'] = [suspect['name'] for suspect in case.get('suspects', [])]
+    return header
+
+
+class CaseStore:
+    def __init__(self, directory: str = DEFAULT_STORE_DIR):
+        self.directory = directory
+        self._files: Dict[int, str] = {}
+        # The reverse of _files: the case id each file held when last read
+        self._ids: Dict[str, int] = {}
+        # (mtime, size) of every case file, recorded by the first refresh()
+        self._stats: Optional[Dict[str, Tuple[int, int]]] = None
+        self.headers = self._read_index()
+
+    def _read_index(self) -> List[Dict]:
+        """Read the header index, remembering which file holds each case"""
+        with open(os.path.join(self.directory, INDEX_FILE), encoding='utf-8') as f:
+            index = json.load(f)
+
+        if index.get('format') != STORE_FORMAT:
+            raise ValueError(f"Unsupported case store format: {index.get('format')}")
+
+        headers = []
+        for header in index['cases']:
+            self._files[header['id']] = header.pop('file')
+            self._ids[self._files[header['id']]] = header['id']
+            headers.append(header)
+        return headers
+
+    def __contains__(self, case_id: int) -> bool:
+        return case_id in self._files
+
+    def load(self, case_id: int) -> Optional[Dict]:
+        """Parse and return the full body of a case"""
+        filename = self._files.get(case_id)
+        if filename is None:
+            return None
+
+        with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+            return json.load(f)
+
+    def refresh(self) -> Tuple['CaseStore', List[Dict], List[int]]:
+        """
+        Re-parse the case files that changed since the previous call; the first
+        call only records file stats. Returns the store to read from afterwards
+        (always this one), the changed or new case bodies and the removed case ids.
+        A file whose id changed removes the case under its old id. A file that
+        cannot be read or has no integer id is skipped and retried on the next
+        call.
+        """
+        stats = self._scan()
+        if self._stats is None:
+            self._stats = stats
+            return self, [], []
+
+        previous = self._stats
+        bodies = []
+        removed = []
+        for filename, stat in list(stats.items()):
+            if previous.get(filename) == stat:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+                    body = json.load(f)
+            except (OSError, ValueError):
+                body = None
+            if not isinstance(body, dict) or not isinstance(body.get('id'), int):
+                # Caught mid-write or missing its id: keep the old stat so the next call retries
+                if filename in previous:
+                    stats[filename] = previous[filename]
+                else:
+                    del stats[filename]
+                continue
+            old_id = self._ids.get(filename)
+            if old_id is not None and old_id != body['id'] and self._files.get(old_id) == filename:
+                # Renumbered: the old id no longer names any case
+                del self._files[old_id]
+                removed.append(old_id)
+            self._files[body['id']] = filename
+            self._ids[filename] = body['id']
+            bodies.append(body)
+        # Recorded only now, so nothing changed in this scan is missed if parsing fails
+        self._stats = stats
+
+        for filename in previous.keys() - stats.keys():
+            if os.path.exists(os.path.join(self.directory, filename)):
+                continue
+            case_id = self._ids.pop(filename, None)
+            if case_id is not None and self._files.get(case_id) == filename:
+                del self._files[case_id]
+                removed.append(case_id)
+        # An id another file took over in this scan was renumbered, not removed
+        removed = [case_id for case_id in removed if case_id not in self._files]
+        return self, bodies, removed
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every case file in the store directory"""
+        known = set(self._files.values())
+        stats = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                is_case = entry.name.startswith('case_') and entry.name.endswith('.json')
+                if is_case or entry.name in known:
+                    stat = entry.stat()
+                    stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+
+def write_case_store(cases: Iterable[Dict], directory: str) -> int:
+    """Write cases one file at a time, then the header index. Returns the case count."""
+    os.makedirs(directory, exist_ok=True)
+
+    headers = []
+    for case in cases:
+        filename = case_filename(case['id'])
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            json.dump(case, f, indent=4, ensure_ascii=False)
+            f.write('\n')
+
+        header = case_header(case)
+        header['file'] = filename
+        headers.append(header)
+
+    _write_index(headers, directory)
+    return len(headers)
+
+
+def rebuild_index(directory: str) -> int:
+    """Regenerate the header index from the case files in a store directory"""
+    headers = []
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith('case_') and filename.endswith('.json')):
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            header = case_header(json.load(f))
+        header['file'] = filename
+        headers.append(header)
+
+    headers.sort(key=lambda header: header['id'])
+    _write_index(headers, directory)
+    return len(headers)
+
+
+def _write_index(headers: List[Dict], directory: str):
+    """Atomically replace the header index of a store"""
+    path = os.path.join(directory, INDEX_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'format': STORE_FORMAT, 'cases': headers}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the on-disk case store')
+    parser.add_argument('command', choices=['index'],
+                        help="'index' rebuilds index.json from the case files")
+    parser.add_argument('directory', nargs='?', default=DEFAULT_STORE_DIR,
+                        help='Case store directory')
+
+    args = parser.parse_args()
+
+    count = rebuild_index(args.directory)
+    print(f"Indexed {count} cases in {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
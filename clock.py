@@ -0,0 +1,45 @@
+"""
+Game clocks.
+
+Everything that measures game time (GameSession, GameTimer and the timer
+service, both front ends) reads it from a clock: a zero-argument callable
+returning seconds. SystemClock is real monotonic time. VirtualClock only
+moves when advance() is called, so simulations and tests can play a whole
+timed case in milliseconds and get the same time bonus every run.
+"""
+
+import time
+from typing import Callable, List
+
+
+class SystemClock:
+    """Real time, on the monotonic clock so wall-clock adjustments cannot stretch a game"""
+
+    def __call__(self) -> float:
+        return time.monotonic()
+
+
+class VirtualClock:
+    """Time that stands still until advance() moves it"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._listeners: List[Callable[[], None]] = []
+
+    def __call__(self) -> float:
+        return self._now
+
+    def on_advance(self, listener: Callable[[], None]):
+        """Call listener after every advance (timer services use this to run what became due)"""
+        self._listeners.append(listener)
+
+    def advance(self, seconds: float):
+        """Move time forward and run the listeners on this thread"""
+        if seconds < 0:
+            raise ValueError("A clock cannot go backwards")
+        self._now += seconds
+        for listener in list(self._listeners):
+            listener()
+
+
+system_clock = SystemClock()
@@ -0,0 +1,122 @@
+"""
+Terminal line input that can be interrupted.
+
+Console.read_line waits on stdin and on a wake-up pipe at the same time, so
+another thread (the game timer) can end a prompt immediately by calling
+wake() instead of the game noticing only after the player presses Enter.
+The waiting thread owns all game state; wake() only writes a byte.
+
+Where stdin cannot be waited on (Windows consoles, regular files, streams
+without a file descriptor) it falls back to input(), and a wake-up is reported once the
+current line has been entered.
+"""
+
+import codecs
+import os
+import selectors
+import sys
+import threading
+from typing import Callable, Optional, TextIO
+
+
+class Console:
+    def __init__(self, stream: Optional[TextIO] = None, output: Optional[TextIO] = None):
+        self.stream = stream or sys.stdin
+        # Where prompts go; sys.stdout when not given
+        self._output = output
+        self._buffer = b''
+        self._woken = threading.Event()
+        self._selector: Optional[selectors.BaseSelector] = None
+        try:
+            fd = self.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            fd = None
+        if fd is not None and sys.platform != 'win32':
+            selector = selectors.DefaultSelector()
+            try:
+                selector.register(fd, selectors.EVENT_READ)
+            except (OSError, ValueError):
+                # e.g. stdin redirected from a regular file, which epoll refuses
+                selector.close()
+            else:
+                self._fd = fd
+                self._wake_r, self._wake_w = os.pipe()
+                os.set_blocking(self._wake_r, False)
+                os.set_blocking(self._wake_w, False)
+                selector.register(self._wake_r, selectors.EVENT_READ)
+                self._selector = selector
+                encoding = getattr(self.stream, 'encoding', None) or 'utf-8'
+                self._decode = codecs.getincrementaldecoder(encoding)(errors='replace').decode
+
+    def wake(self):
+        """Interrupt a read_line(wakeable=True) in progress; safe to call from any thread"""
+        self._woken.set()
+        if self._selector is not None:
+            try:
+                os.write(self._wake_w, b'!')
+            except BlockingIOError:
+                pass  # the pipe is full, so a wake-up is already pending
+
+    def clear(self):
+        """Forget wake-ups that arrived before a new round starts"""
+        self._woken.clear()
+        if self._selector is not None:
+            self._drain()
+
+    def read_line(self, prompt: str = '', wakeable: bool = False,
+                  tick: Optional[Callable[[], float]] = None) -> Optional[str]:
+        """
+        Show prompt and return the next line without its newline, or None if
+        wakeable and wake() was called. Raises EOFError at end of input.
+
+        While waiting, tick is called on this thread and returns the seconds
+        until it wants to be called again (used to redraw the status line).
+        """
+        if self._selector is None:
+            line = self._read_blocking(prompt)
+            if wakeable and self._woken.is_set():
+                return None
+            return line
+
+        self._prompt(prompt)
+        while True:
+            if wakeable and self._woken.is_set():
+                self.clear()
+                return None
+            newline = self._buffer.find(b'\n')
+            if newline >= 0:
+                line, self._buffer = self._buffer[:newline], self._buffer[newline + 1:]
+                return self._decode(line).rstrip('\r')
+
+            for key, _ in self._selector.select(tick() if tick else None):
+                if key.fd == self._wake_r:
+                    self._drain()
+                    continue
+                data = os.read(self._fd, 4096)
+                if not data:
+                    if self._buffer:
+                        line, self._buffer = self._buffer, b''
+                        return self._decode(line, True)
+                    raise EOFError
+                self._buffer += data
+
+    def _prompt(self, prompt: str):
+        output = self._output or sys.stdout
+        output.write(prompt)
+        output.flush()
+
+    def _read_blocking(self, prompt: str) -> str:
+        if self.stream is sys.stdin and self._output is None:
+            return input(prompt)
+        self._prompt(prompt)
+        line = self.stream.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip('\r\n')
+
+    def _drain(self):
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
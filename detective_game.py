@@ -1,334 +1,302 @@
-import json
-import time
-import random
-from difflib import SequenceMatcher
-from colorama import Fore, Back, Style, init
-from text_processor import TextProcessor
-from timer import GameTimer
+import sys
+from answer_cache import invalidate_cases
+from clock import system_clock
+from console import Console
+from renderer import Renderer
+from status_line import StatusLine
+from timer import GameTimer, TimerService, timer_service
 from case_data import CaseData
 
-# Initialize colorama for cross-platform colored output
-init()
+# The question pipeline (game_session, text_processor) and the case generator
+# are imported when first needed, so the menu comes up without loading them
+
+# Generated cases get IDs well clear of the authored catalog
+ENDLESS_FIRST_ID = 1_000_001
+
+# Steps of DetectiveGame.run
+MENU, PLAYING, PLAY_AGAIN, QUIT = 'menu', 'playing', 'play_again', 'quit'
+
+# Windows consoles need colorama to translate ANSI escapes; other terminals understand them
+if sys.platform == 'win32':
+    from colorama import init
+    init()
 
 class DetectiveGame:
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, case_source=None, clock=system_clock, color=None,
+                 console=None, renderer=None):
         self.debug = debug
+        # Game time; a VirtualClock plays timed cases without waiting for them
+        self.clock = clock
+        self.timers = timer_service if clock is system_clock else TimerService(clock)
         self.current_case = None
-        self.case_data = CaseData()
-        self.text_processor = TextProcessor()
+        self.case_data = CaseData(case_source)
+        # Created by the first game
+        self.text_processor = None
+        self.case_data.add_change_listener(invalidate_cases)
         self.timer = None
-        self.questions_asked = 0
-        self.score = 0
-        self.game_active = False
+        self.session = None
+        self.endless_cases = None
+        self.console = console or Console()
+        self.status = StatusLine()
+        self.renderer = renderer or Renderer(color=color)
+        
+    def run(self, case_num=None):
+        """
+        Play cases until the player quits. Each step returns instead of
+        calling the next one, so the stack stays flat and nothing from a
+        finished game stays reachable however many games are played.
+        """
+        state, case = MENU, None
+        if case_num is not None:
+            case = self.start_case(case_num)
+            state = PLAYING if case else QUIT
         
+        while state != QUIT:
+            try:
+                if state == MENU:
+                    case = self.main_menu()
+                    state = PLAYING if case else QUIT
+                elif state == PLAYING:
+                    state = PLAY_AGAIN if self.play_case(case) else QUIT
+                    case = None
+                elif state == PLAY_AGAIN:
+                    state = MENU if self.ask_play_again() else QUIT
+            except EOFError:
+                state = QUIT
+    
     def main_menu(self):
-        """Display main menu and handle case selection"""
+        """Display main menu and return the chosen case, or None to quit"""
         self.display_header()
         self.display_cases()
         
         while True:
             try:
-                choice = input(f"\n{Fore.YELLOW}🔍 Select a case (1-10) or 'quit' to exit: {Style.RESET_ALL}")
+                choice = self.console.read_line(self.renderer.render('menu_prompt'))
                 
                 if choice.lower() in ['quit', 'exit', 'q']:
-                    print(f"{Fore.GREEN}👋 Thanks for playing CLI Detective!{Style.RESET_ALL}")
-                    break
+                    self.renderer.show('goodbye', text="Thanks for playing CLI Detective!")
+                    return None
+                
+                if choice.lower() == 'endless':
+                    return self.start_endless_case()
+                
+                if choice.lower() == 'all':
+                    self.display_cases()
+                    continue
+                
+                if choice.lower() in ['easy', 'medium', 'hard']:
+                    self.display_cases(self.case_data.find_cases(difficulty=choice))
+                    continue
                 
                 case_num = int(choice)
-                if 1 <= case_num <= 10:
-                    self.start_case(case_num)
-                    break
+                if self.case_data.has_case(case_num):
+                    return self.start_case(case_num)
                 else:
-                    print(f"{Fore.RED}❌ Please enter a number between 1 and 10{Style.RESET_ALL}")
+                    self.renderer.show('error', text=f"There is no case {case_num}")
                     
             except ValueError:
-                print(f"{Fore.RED}❌ Please enter a valid number or 'quit'{Style.RESET_ALL}")
+                self.renderer.show('error', text="Please enter a valid number or 'quit'")
             except KeyboardInterrupt:
-                print(f"\n{Fore.GREEN}👋 Thanks for playing!{Style.RESET_ALL}")
-                break
+                self.renderer.write('\n')
+                self.renderer.show('goodbye', text="Thanks for playing!")
+                return None
     
     def display_header(self):
         """Display game header with ASCII art"""
-        header = f"""
-{Fore.CYAN}╔════════════════════════════════════════════════════════════════╗
-║                        🔍 CLI DETECTIVE 🔍                      ║
-║                   Terminal Crime Investigation                  ║
-╚════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}
-
-{Fore.YELLOW}Welcome, Detective! Choose a case to investigate:{Style.RESET_ALL}
-"""
-        print(header)
+        self.renderer.show('header')
     
-    def display_cases(self):
-        """Display available cases"""
-        cases = self.case_data.get_all_cases()
-        
-        print(f"\n{Fore.CYAN}Available Cases:{Style.RESET_ALL}")
-        print("=" * 60)
+    def display_cases(self, cases=None):
+        """Display available cases, or only the given case headers"""
+        if cases is None:
+            cases = self.case_data.get_all_cases()
         
-        for i, case in enumerate(cases, 1):
-            difficulty = case.get('difficulty', 'Medium')
-            time_limit = case.get('time_limit', 300)
-            
-            difficulty_color = {
-                'Easy': Fore.GREEN,
-                'Medium': Fore.YELLOW,
-                'Hard': Fore.RED
-            }.get(difficulty, Fore.YELLOW)
-            
-            print(f"{Fore.WHITE}Case {i:2d}:{Style.RESET_ALL} {case['title']}")
-            print(f"         {difficulty_color}Difficulty: {difficulty} | Time Limit: {time_limit//60}min{Style.RESET_ALL}")
-            print(f"         {Fore.LIGHTBLACK_EX}{case['description'][:60]}...{Style.RESET_ALL}")
-            print()
+        self.renderer.write(self.renderer.case_list(cases))
     
     def start_case(self, case_num):
-        """Initialize and start a specific case"""
-        self.current_case = self.case_data.get_case(case_num)
-        if not self.current_case:
-            print(f"{Fore.RED}❌ Case {case_num} not found!{Style.RESET_ALL}")
-            return
+        """Load a specific case, or None if it does not exist"""
+        case = self.case_data.get_case(case_num)
+        if not case:
+            self.renderer.show('error', text=f"Case {case_num} not found!")
+            return None
         
-        self.questions_asked = 0
-        self.score = 0
-        self.game_active = True
+        return case
+    
+    def start_endless_case(self):
+        """The next procedurally generated case"""
+        import random
+        from case_generator import generate_cases
+        from case_model import Case
+        
+        if self.endless_cases is None:
+            self.endless_cases = generate_cases(seed=random.randrange(2**32),
+                                                start_id=ENDLESS_FIRST_ID)
+        
+        return Case.from_dict(next(self.endless_cases))
+    
+    def play_case(self, case):
+        """Run the investigation for a loaded case; returns False if the player quit"""
+        from game_session import GameSession
+        
+        if self.text_processor is None:
+            from text_processor import TextProcessor
+            self.text_processor = TextProcessor()
+        self.current_case = case
+        self.session = GameSession(case, self.text_processor, clock=self.clock)
         
         # Setup timer
-        time_limit = self.current_case.get('time_limit', 600)  # Default 10 minutes
-        self.timer = GameTimer(time_limit, self.time_up_callback)
+        self.timer = GameTimer(self.session.time_limit, self.time_up_callback, service=self.timers)
         
         # Display case information
         self.display_case_info()
         self.display_instructions()
         
-        # Start investigation loop
+        # Start investigation loop; the clock starts once the player has read the briefing
+        self.session.started_at = self.session.clock()
         self.timer.start()
-        self.investigation_loop()
+        try:
+            return self.investigation_loop()
+        finally:
+            # Nothing from this game outlives it
+            self.current_case = self.session = self.timer = None
     
     def display_case_info(self):
         """Display current case information"""
-        case = self.current_case
-        
-        print(f"\n{Fore.RED}🚨 CRIME SCENE REPORT 🚨{Style.RESET_ALL}")
-        print("=" * 60)
-        print(f"{Fore.CYAN}Case:{Style.RESET_ALL} {case['title']}")
-        print(f"{Fore.CYAN}Location:{Style.RESET_ALL} {case['location']}")
-        print(f"{Fore.CYAN}Date:{Style.RESET_ALL} {case['date']}")
-        print(f"{Fore.CYAN}Difficulty:{Style.RESET_ALL} {case['difficulty']}")
-        print(f"{Fore.CYAN}Time Limit:{Style.RESET_ALL} {case['time_limit']//60} minutes")
-        print("\n" + "=" * 60)
-        print(f"{Fore.YELLOW}SUMMARY:{Style.RESET_ALL}")
-        print(case['summary'])
-        print("=" * 60)
+        self.renderer.write(self.renderer.case_screen('case_info', self.current_case))
     
     def display_instructions(self):
         """Display game instructions"""
-        instructions = f"""
-{Fore.GREEN}🎮 HOW TO PLAY:{Style.RESET_ALL}
-
-{Fore.YELLOW}📝 Ask Questions:{Style.RESET_ALL}
-   • Type natural language questions like:
-     - "What's the murder weapon?"
-     - "Who are the suspects?"
-     - "Does the knife have fingerprints?"
-     - "Where was Anna at the time of death?"
-
-{Fore.YELLOW}🔍 Make Accusation:{Style.RESET_ALL}
-   • Type: accuse [suspect_name]
-   • Example: "accuse John Smith"
-
-{Fore.YELLOW}💡 Other Commands:{Style.RESET_ALL}
-   • 'help' - Show this help
-   • 'time' - Check remaining time
-   • 'suspects' - List all suspects
-   • 'quit' - Exit game
-
-{Fore.RED}⏰ Time Limit:{Style.RESET_ALL} {self.current_case['time_limit']//60} minutes
-{Fore.CYAN}🎯 Goal:{Style.RESET_ALL} Find the killer before time runs out!
-
-Press ENTER to start investigating...
-"""
-        print(instructions)
-        input()
+        self.renderer.write(self.renderer.case_screen('instructions', self.current_case))
+        self.console.read_line()
     
     def investigation_loop(self):
-        """Main investigation loop"""
-        while self.game_active and self.timer.is_running():
-            try:
-                # Display prompt with timer
-                time_remaining = self.timer.get_time_remaining()
-                mins = int(time_remaining // 60)
-                secs = int(time_remaining % 60)
-                
-                prompt = f"\n{Fore.YELLOW}🔍 [{mins:02d}:{secs:02d}] Detective: {Style.RESET_ALL}"
-                user_input = input(prompt).strip()
-                
-                if not user_input:
-                    continue
-                
-                # Process user input
-                self.process_input(user_input)
-                
-            except KeyboardInterrupt:
-                print(f"\n{Fore.RED}Investigation interrupted!{Style.RESET_ALL}")
-                break
-            except EOFError:
-                break
+        """Main investigation loop over player input and the timer; False if the player quit"""
+        from game_session import ENDED, format_time
         
-        # Game ended
-        self.timer.stop()
-        if self.game_active:
+        self.console.clear()
+        self.status.show()
+        try:
+            tick = self.update_status if self.status.shown else None
+            while self.session.active:
+                try:
+                    # Display prompt with timer
+                    remaining = format_time(self.session.time_remaining())
+                    prompt = self.renderer.render('game_prompt', time=remaining)
+                    user_input = self.console.read_line(prompt, wakeable=True, tick=tick)
+                    
+                    if user_input is None:
+                        # Woken by the timer: time is up, whatever the player was typing
+                        self.renderer.write('\n')
+                        for event in self.session.expire():
+                            self.show_event(event)
+                        break
+                    
+                    user_input = user_input.strip()
+                    if not user_input:
+                        continue
+                    
+                    # Process user input
+                    self.process_input(user_input)
+                    
+                except KeyboardInterrupt:
+                    self.renderer.show('warning', text="\nInvestigation interrupted!")
+                    break
+                except EOFError:
+                    break
+        finally:
+            # However the game ends, give the terminal back its full scroll region
+            self.timer.stop()
+            self.status.hide()
+        
+        player_quit = self.session.state == ENDED
+        if self.session.active:
             self.game_over(False)
+        return not player_quit
+    
+    def update_status(self):
+        """Redraw the countdown status line; returns the seconds until the shown time changes"""
+        from game_session import format_time
+        
+        case = self.current_case
+        remaining = self.session.time_remaining()
+        self.status.update(f" CASE {case['id']}: {case['title']}  |  "
+                           f"TIME LEFT {format_time(remaining)}  |  "
+                           f"QUESTIONS {self.session.questions_asked}  |  'help' for commands")
+        return remaining % 1 + 0.01
     
     def process_input(self, user_input):
         """Process user input and respond accordingly"""
-        command = user_input.lower().strip()
-        
-        # Handle special commands
-        if command == 'help':
+        for event in self.session.submit(user_input):
+            self.show_event(event)
+    
+    def show_event(self, event):
+        """Display one game event"""
+        if event.kind == 'help':
             self.display_instructions()
-            return
-        elif command == 'time':
-            time_left = self.timer.get_time_remaining()
-            mins = int(time_left // 60)
-            secs = int(time_left % 60)
-            print(f"{Fore.CYAN}⏰ Time remaining: {mins:02d}:{secs:02d}{Style.RESET_ALL}")
-            return
-        elif command == 'suspects':
+        elif event.kind == 'suspects':
             self.list_suspects()
-            return
-        elif command in ['quit', 'exit']:
-            self.game_active = False
-            return
-        elif command.startswith('accuse '):
-            suspect_name = command[7:].strip()
-            self.make_accusation(suspect_name)
-            return
-        
-        # Process as question
-        self.questions_asked += 1
-        response = self.text_processor.process_question(user_input, self.current_case)
-        
-        if response:
-            print(f"{Fore.GREEN}🕵️  {response}{Style.RESET_ALL}")
-        else:
-            fallback_responses = [
-                "I don't know. Try rephrasing your question.",
-                "That information isn't available in the case file.",
-                "I'm not sure about that. Try asking something else.",
-                "The evidence doesn't show anything about that.",
-                "That's not in my notes. Can you be more specific?"
-            ]
-            print(f"{Fore.RED}❓ {random.choice(fallback_responses)}{Style.RESET_ALL}")
+        elif event.kind == 'evidence':
+            self.renderer.write(self.renderer.case_screen('evidence', self.current_case))
+        elif event.kind == 'solved':
+            self.game_won(event)
+        elif event.kind == 'time_up':
+            self.game_over(True)
+        elif event.kind in ('time', 'answer', 'no_answer', 'ambiguous', 'invalid', 'wrong'):
+            self.renderer.show(event.kind, text=event.text)
     
     def list_suspects(self):
         """Display all suspects"""
-        suspects = self.current_case.get('suspects', [])
-        
-        print(f"\n{Fore.CYAN}🔍 SUSPECTS:{Style.RESET_ALL}")
-        print("=" * 40)
-        
-        for i, suspect in enumerate(suspects, 1):
-            print(f"{i}. {suspect['name']}")
-            print(f"   Age: {suspect.get('age', 'Unknown')}")
-            print(f"   Occupation: {suspect.get('occupation', 'Unknown')}")
-            print(f"   Relationship: {suspect.get('relationship', 'Unknown')}")
-            print()
+        self.renderer.write(self.renderer.case_screen('suspects', self.current_case))
     
     def make_accusation(self, suspect_name):
         """Handle player accusation"""
-        if not suspect_name:
-            print(f"{Fore.RED}❌ Please specify a suspect name{Style.RESET_ALL}")
-            return
-        
-        # Find suspect in case data
-        suspects = self.current_case.get('suspects', [])
-        killer = self.current_case.get('killer', '').lower()
-        
-        # Check if accused suspect exists
-        accused_suspect = None
-        for suspect in suspects:
-            if suspect['name'].lower() == suspect_name.lower():
-                accused_suspect = suspect
-                break
-        
-        if not accused_suspect:
-            print(f"{Fore.RED}❌ '{suspect_name}' is not a suspect in this case{Style.RESET_ALL}")
-            return
-        
-        # Check if accusation is correct
-        if accused_suspect['name'].lower() == killer:
-            self.game_won()
-        else:
-            print(f"{Fore.RED}❌ That's incorrect. {accused_suspect['name']} is not the killer. Keep investigating.{Style.RESET_ALL}")
+        for event in self.session.accuse(suspect_name):
+            self.show_event(event)
     
-    def game_won(self):
+    def game_won(self, event):
         """Handle game won state"""
-        self.game_active = False
         self.timer.stop()
+        self.status.hide()
+        time_used = event.data['time_used']
         
-        time_remaining = self.timer.get_time_remaining()
-        time_used = self.current_case['time_limit'] - time_remaining
-        
-        # Calculate score
-        time_bonus = int(time_remaining * 10)
-        efficiency_bonus = max(0, 100 - (self.questions_asked * 5))
-        self.score = time_bonus + efficiency_bonus
-        
-        print(f"\n{Fore.GREEN}🎉 CASE SOLVED! 🎉{Style.RESET_ALL}")
-        print("=" * 50)
-        print(f"{Fore.GREEN}✅ You correctly identified the killer!{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}⏰ Time used: {int(time_used//60)}:{int(time_used%60):02d}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}❓ Questions asked: {self.questions_asked}{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}🏆 Final Score: {self.score} points{Style.RESET_ALL}")
-        
-        # Show case solution
-        self.show_solution()
-        
-        # Ask if player wants to play again
-        self.ask_play_again()
+        self.renderer.write(
+            self.renderer.render('won', minutes=int(time_used // 60),
+                                 seconds=int(time_used % 60),
+                                 questions=event.data['questions_asked'],
+                                 score=event.data['score']),
+            self.renderer.case_screen('solution', self.current_case),
+        )
     
     def game_over(self, time_up=True):
         """Handle game over state"""
-        self.game_active = False
-        
-        if time_up:
-            print(f"\n{Fore.RED}⏰ TIME'S UP! ⏰{Style.RESET_ALL}")
-        else:
-            print(f"\n{Fore.RED}🔍 Investigation ended{Style.RESET_ALL}")
+        self.status.hide()
+        if self.session.active:
+            self.session.submit('quit')
         
-        print("=" * 50)
-        print(f"{Fore.RED}❌ Case unsolved. The killer got away!{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}❓ Questions asked: {self.questions_asked}{Style.RESET_ALL}")
-        
-        self.show_solution()
-        self.ask_play_again()
+        self.renderer.write(
+            self.renderer.render('time_up' if time_up else 'ended'),
+            self.renderer.render('lost', questions=self.session.questions_asked),
+            self.renderer.case_screen('solution', self.current_case),
+        )
     
     def show_solution(self):
         """Display case solution"""
-        solution = self.current_case.get('solution', {})
-        
-        print(f"\n{Fore.MAGENTA}🔍 CASE SOLUTION:{Style.RESET_ALL}")
-        print("=" * 50)
-        print(f"{Fore.YELLOW}Killer:{Style.RESET_ALL} {solution.get('killer', 'Unknown')}")
-        print(f"{Fore.YELLOW}Motive:{Style.RESET_ALL} {solution.get('motive', 'Unknown')}")
-        print(f"{Fore.YELLOW}Method:{Style.RESET_ALL} {solution.get('method', 'Unknown')}")
-        print(f"{Fore.YELLOW}Key Evidence:{Style.RESET_ALL} {solution.get('key_evidence', 'Unknown')}")
-        print("=" * 50)
+        self.renderer.write(self.renderer.case_screen('solution', self.current_case))
     
     def ask_play_again(self):
         """Ask if player wants to play again"""
         while True:
-            choice = input(f"\n{Fore.YELLOW}🔄 Play another case? (y/n): {Style.RESET_ALL}").lower()
+            choice = self.console.read_line(self.renderer.render('again_prompt')).lower()
             if choice in ['y', 'yes']:
-                self.main_menu()
-                break
+                return True
             elif choice in ['n', 'no']:
-                print(f"{Fore.GREEN}👋 Thanks for playing CLI Detective!{Style.RESET_ALL}")
-                break
+                self.renderer.show('goodbye', text="Thanks for playing CLI Detective!")
+                return False
             else:
-                print(f"{Fore.RED}Please enter 'y' or 'n'{Style.RESET_ALL}")
+                self.renderer.show('warning', text="Please enter 'y' or 'n'")
     
     def time_up_callback(self):
-        """Callback when timer expires"""
-        self.game_active = False
-        print(f"\n{Fore.RED}⏰ TIME'S UP!{Style.RESET_ALL}")
+        """
+        Callback when timer expires; runs on the timer thread, so it only wakes
+        the investigation loop
+        """
+        self.console.wake()
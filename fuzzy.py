@@ -0,0 +1,101 @@
+"""
+Bounded edit-distance lookup.
+
+DeletesIndex is a precomputed deletes table (the SymSpell approach): every
+term is stored under each string obtainable by deleting up to N of its
+characters. A query generates its own deletes, and any term sharing one is a
+candidate within N edits, so lookups never scan the whole vocabulary.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def allowed_edits(term: str) -> int:
+    """Typos tolerated for a term of this length: none for short words, where a typo is a word"""
+    if len(term) < 5:
+        return 0
+    return 1 if len(term) < 9 else 2
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (adjacent transpositions count as one
+    edit), capped at max_distance + 1
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def deletes(term: str, max_distance: int) -> Iterator[str]:
+    """Yield the term and every distinct string made by deleting up to max_distance characters"""
+    seen = {term}
+    frontier = [term]
+    yield term
+    for _ in range(max_distance):
+        next_frontier = []
+        for word in frontier:
+            for i in range(len(word)):
+                variant = word[:i] + word[i + 1:]
+                if variant not in seen:
+                    seen.add(variant)
+                    next_frontier.append(variant)
+                    yield variant
+        frontier = next_frontier
+
+
+@lru_cache(maxsize=2 ** 16)
+def _query_deletes(query: str, max_distance: int) -> Tuple[str, ...]:
+    """Deletes of a lookup query, cached: the same words are looked up in many indexes"""
+    return tuple(deletes(query, max_distance))
+
+
+class DeletesIndex:
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self.terms: Set[str] = set()
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def add(self, term: str, max_distance: Optional[int] = None):
+        """Index a term, optionally allowing it fewer edits than the index maximum"""
+        self.terms.add(term)
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        for variant in deletes(term, limit):
+            self._deletes.setdefault(variant, set()).add(term)
+
+    def update(self, terms: Iterable[str]):
+        for term in terms:
+            self.add(term)
+
+    def lookup(self, query: str, max_distance: Optional[int] = None) -> List[Tuple[int, str]]:
+        """Return (distance, term) for every term within max_distance edits, closest first"""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        if max_distance == 0:
+            return [(0, query)] if query in self.terms else []
+
+        candidates: Set[str] = set()
+        for variant in _query_deletes(query, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        matches = []
+        for term in candidates:
+            distance = edit_distance(query, term, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, term))
+        matches.sort()
+        return matches
@@ -0,0 +1,150 @@
+"""
+Headless game rules.
+
+A GameSession holds the state of one investigation and turns each player
+input into a list of events. It does no I/O: the terminal game and the
+Streamlit app both drive it and only decide how to show the events, so the
+rules (commands, accusations, scoring, the time limit) live in one place and
+can be run and benchmarked without either front end.
+"""
+
+import random
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+from clock import system_clock
+from name_index import suspect_index
+from normalizer import normalize
+from text_processor import TextProcessor
+
+# Session states
+ACTIVE, WON, LOST, ENDED = 'active', 'won', 'lost', 'ended'
+
+FALLBACK_RESPONSES = [
+    "I don't know. Try rephrasing your question.",
+    "That information isn't available in the case file.",
+    "I'm not sure about that. Try asking something else.",
+    "The evidence doesn't show anything about that.",
+    "That's not in my notes. Can you be more specific?",
+]
+
+
+class Event(NamedTuple):
+    """
+    Something the front end should show: what happened (kind), its wording and
+    any structured details
+    """
+    kind: str
+    text: str = ''
+    data: Optional[Dict[str, Any]] = None
+
+
+class GameSession:
+    def __init__(self, case: Mapping, text_processor: Optional[TextProcessor] = None,
+                 clock: Callable[[], float] = system_clock, rng: Optional[random.Random] = None):
+        self.case = case
+        self.text_processor = text_processor or TextProcessor()
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.time_limit = case.get('time_limit', 600)
+        self.started_at = clock()
+        self.state = ACTIVE
+        # Only questions count; commands and accusations are free
+        self.questions_asked = 0
+        self.score = 0
+        self._remaining_at_end = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.state == ACTIVE
+
+    def time_remaining(self) -> float:
+        """Seconds left, frozen once the game is over"""
+        if self.state != ACTIVE:
+            return self._remaining_at_end
+        return max(0.0, self.time_limit - (self.clock() - self.started_at))
+
+    def check_time(self) -> List[Event]:
+        """End the game if the time limit has passed"""
+        if self.state == ACTIVE and self.time_remaining() <= 0:
+            return self.expire()
+        return []
+
+    def expire(self) -> List[Event]:
+        """End the game as out of time, e.g. when a front end's own timer fires"""
+        if self.state != ACTIVE:
+            return []
+        self._finish(LOST)
+        return [Event('time_up', "TIME'S UP! The killer got away.")]
+
+    def submit(self, user_input: str) -> List[Event]:
+        """Apply one line of player input and return what happened"""
+        events = self.check_time()
+        if self.state != ACTIVE:
+            return events
+        command = normalize(user_input).text
+        if not command:
+            return []
+
+        if command == 'help':
+            return [Event('help')]
+        if command == 'time':
+            remaining = self.time_remaining()
+            return [Event('time', f"Time remaining: {format_time(remaining)}",
+                          {'remaining': remaining})]
+        if command == 'suspects':
+            suspects = list(self.case.get('suspects', []))
+            return [Event('suspects', ', '.join(suspect['name'] for suspect in suspects),
+                          {'suspects': suspects})]
+        if command == 'evidence':
+            evidence = list(self.case.get('evidence', []))
+            return [Event('evidence', ', '.join(evidence), {'evidence': evidence})]
+        if command in ('quit', 'exit'):
+            self._finish(ENDED)
+            return [Event('ended', "Investigation ended")]
+        if command == 'accuse' or command.startswith('accuse '):
+            return self.accuse(command[7:].strip())
+
+        self.questions_asked += 1
+        response = self.text_processor.process_question(user_input, self.case)
+        if response:
+            return [Event('answer', response)]
+        return [Event('no_answer', self.rng.choice(FALLBACK_RESPONSES))]
+
+    def accuse(self, suspect_name: str) -> List[Event]:
+        """Accuse a suspect by (possibly partial or misspelled) name"""
+        if not suspect_name:
+            return [Event('invalid', "Please specify a suspect name")]
+
+        matches = suspect_index(self.case).find(suspect_name)
+        if not matches:
+            return [Event('invalid', f"'{suspect_name}' is not a suspect in this case")]
+        if len(matches) > 1:
+            return [Event('ambiguous',
+                          f"'{suspect_name}' could be {' or '.join(matches)}. Who do you mean?",
+                          {'matches': matches})]
+
+        accused = matches[0]
+        if accused.lower() != self.case.get('killer', '').lower():
+            return [Event('wrong',
+                          f"That's incorrect. {accused} is not the killer. Keep investigating.",
+                          {'accused': accused})]
+
+        remaining = self.time_remaining()
+        self.score = int(remaining * 10) + max(0, 100 - self.questions_asked * 5)
+        self._finish(WON)
+        return [Event('solved', f"You correctly accused {accused}!", {
+            'accused': accused,
+            'score': self.score,
+            'time_used': self.time_limit - remaining,
+            'questions_asked': self.questions_asked,
+        })]
+
+    def _finish(self, state: str):
+        self._remaining_at_end = max(0.0, self.time_limit - (self.clock() - self.started_at))
+        self.state = state
+
+
+def format_time(seconds: float) -> str:
+    """mm:ss"""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
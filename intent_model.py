@@ -0,0 +1,155 @@
+"""
+Vectorized intent classifier.
+
+Questions are turned into hashed features (words, word bigrams, character
+trigrams and the intents of any question keywords they contain) weighted by
+TF-IDF, then scored against one centroid per intent with a single matrix
+product for the whole batch.
+"""
+
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from normalizer import NormalizedQuestion, analyze
+
+TRAINING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                             'intent_training.tsv')
+NO_INTENT = 'none'
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def read_training_set(path: str = TRAINING_PATH) -> Tuple[List[str], List[str]]:
+    """Read (questions, labels) from the labeled question set"""
+    questions, labels = [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            question, label = line.rstrip('\n').split('\t')
+            questions.append(question)
+            labels.append(label)
+    return questions, labels
+
+
+class IntentModel:
+    def __init__(self, keywords: Iterable[Tuple[str, str]] = (), n_features: int = 2 ** 12,
+                 min_score: float = 0.25, keyword_weight: int = 6):
+        self.n_features = n_features
+        self.min_score = min_score
+        # A (keyword, intent) hit adds keyword_weight counts of an intent feature
+        self.keyword_weight = keyword_weight
+        self._matcher = KeywordMatcher(keywords)
+        self.labels: List[str] = []
+        self.idf: Optional[np.ndarray] = None
+        # (n_features, n_labels) matrix of L2-normalized class centroids
+        self.centroids: Optional[np.ndarray] = None
+        self._token_features: Dict[str, List[int]] = {}
+
+    def _hash(self, feature: str) -> int:
+        # crc32 rather than hash(): str hashes change between processes
+        return zlib.crc32(feature.encode('utf-8')) & (self.n_features - 1)
+
+    def _word_features(self, word: str) -> List[int]:
+        """Feature ids of a word and its character trigrams, cached per word"""
+        features = self._token_features.get(word)
+        if features is None:
+            padded = f"<{word}>"
+            features = [self._hash('w:' + word)]
+            features.extend(self._hash('c:' + padded[i:i + 3]) for i in range(len(padded) - 2))
+            if len(self._token_features) < 100_000:
+                self._token_features[word] = features
+        return features
+
+    def _features(self, questions: Sequence[Union[str, NormalizedQuestion]]
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column coordinates of every feature occurrence in the batch"""
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, question in enumerate(questions):
+            if isinstance(question, str):
+                question = question.lower()
+                words = _WORD.findall(question)
+            else:
+                # A NormalizedQuestion: reuse its tokens
+                question, words = question.text, question.words
+            features = []
+            for word in words:
+                features.extend(self._word_features(word))
+            features.extend(self._hash(f"b:{a} {b}") for a, b in zip(words, words[1:]))
+            for _start, _end, keyword in self._matcher.find_all(question):
+                label = self._matcher.keywords[keyword][1]
+                features.extend([self._hash('k:' + label)] * self.keyword_weight)
+            rows.extend([row] * len(features))
+            cols.extend(features)
+        return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+
+    def _vectorize(self, questions: Sequence[Union[str, NormalizedQuestion]]) -> np.ndarray:
+        """Dense (batch, n_features) matrix of raw term counts"""
+        matrix = np.zeros((len(questions), self.n_features), dtype=np.float32)
+        rows, cols = self._features(questions)
+        np.add.at(matrix, (rows, cols), 1.0)
+        return matrix
+
+    def _weigh(self, counts: np.ndarray) -> np.ndarray:
+        """Sublinear TF-IDF, L2-normalized per row"""
+        weights = np.log1p(counts) * self.idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        return weights / np.maximum(norms, 1e-9)
+
+    def fit(self, questions: Sequence[Union[str, NormalizedQuestion]],
+            labels: Sequence[str]) -> 'IntentModel':
+        """Learn IDF weights and one centroid per label"""
+        counts = self._vectorize(questions)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(questions)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        weights = self._weigh(counts)
+        self.labels = sorted(set(labels))
+        label_ids = np.array([self.labels.index(label) for label in labels])
+        centroids = np.zeros((len(self.labels), self.n_features), dtype=np.float32)
+        np.add.at(centroids, label_ids, weights)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-9)
+        self.centroids = centroids.T.copy()
+        return self
+
+    def predict(self, questions: Sequence[Union[str, NormalizedQuestion]]) -> List[Optional[str]]:
+        """Classify a batch of questions (raw or normalized); None where no intent scores enough"""
+        if not questions:
+            return []
+
+        # Score sparse feature counts directly rather than materializing a
+        # dense (batch, n_features) matrix, which dominates at large batches
+        rows, cols = self._features(questions)
+        keys, counts = np.unique(rows * self.n_features + cols, return_counts=True)
+        rows, cols = np.divmod(keys, self.n_features)
+        weights = np.log1p(counts.astype(np.float32)) * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(questions)))
+        weights /= np.maximum(norms[rows], 1e-9)
+
+        scores = np.zeros((len(questions), len(self.labels)), dtype=np.float32)
+        np.add.at(scores, rows, weights[:, None] * self.centroids[cols])
+        best = scores.argmax(axis=1)
+        confident = scores[np.arange(len(questions)), best] >= self.min_score
+        return [self.labels[label] if ok and self.labels[label] != NO_INTENT else None
+                for label, ok in zip(best.tolist(), confident.tolist())]
+
+
+_default_models: Dict[Tuple[Tuple[str, str], ...], IntentModel] = {}
+
+
+def default_model(keywords: Iterable[Tuple[str, str]] = ()) -> IntentModel:
+    """The model trained on the bundled question set, built once per process for each keyword set"""
+    keywords = tuple(keywords)
+    model = _default_models.get(keywords)
+    if model is None:
+        questions, labels = read_training_set()
+        # Trained on the same normalized form process_question classifies
+        model = IntentModel(keywords).fit([analyze(question) for question in questions], labels)
+        _default_models[keywords] = model
+    return model
@@ -0,0 +1,68 @@
+"""
+Aho-Corasick multi-keyword matcher.
+
+All keywords are compiled into one automaton, so every occurrence of every
+keyword in a text is found in a single left-to-right pass, however many
+keywords there are.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[Tuple[str, str]]):
+        """Compile (keyword, label) pairs; keyword order is kept for tie-breaking"""
+        self.keywords: List[Tuple[str, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Keyword indexes ending at each state, including those inherited via fail links
+        self._output: List[List[int]] = [[]]
+
+        for keyword, label in keywords:
+            self._insert(keyword, len(self.keywords))
+            self.keywords.append((keyword, label))
+        self._link()
+
+    def _insert(self, keyword: str, index: int):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _link(self):
+        """Compute fail links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                inherited = self._output[self._fail[next_state]]
+                self._output[next_state] = self._output[next_state] + inherited
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return (start, end, keyword index) for every keyword occurrence, ordered by end"""
+        goto, fail, output = self._goto, self._fail, self._output
+        keywords = self.keywords
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                end = position + 1
+                matches.append((end - len(keywords[index][0]), end, index))
+        return matches
@@ -5,27 +5,43 @@ A command-line murder mystery game where players solve crimes by asking investig
 """
 
 import argparse
-import json
 import sys
-import os
-from detective_game import DetectiveGame
+import time
+
+# Home the cursor, clear the screen and its scrollback
+CLEAR_SCREEN = '\x1b[H\x1b[2J\x1b[3J'
 
 def main():
     parser = argparse.ArgumentParser(description='CLI Detective - Solve Murder Mysteries')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
     parser.add_argument('--case', type=int, help='Start with specific case number (1-10)')
+    parser.add_argument('--cases', help='Case store directory or compiled .pack file to play from')
+    parser.add_argument('--no-color', action='store_true',
+                        help='Plain text output (the default when not on a terminal)')
+    parser.add_argument('--replay', action='append', metavar='TRANSCRIPTS',
+                        help='Replay a transcript file, directory or glob headlessly '
+                             'and print JSONL results')
+    parser.add_argument('-o', '--output', default='-',
+                        help='With --replay: JSONL results file (default: stdout)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='With --replay: play every transcript this many times')
     
     args = parser.parse_args()
     
-    # Clear screen and start game
-    os.system('clear' if os.name == 'posix' else 'cls')
+    if args.replay:
+        replay_transcripts(args)
+        return
+    
+    # Clear screen in-process (no 'clear' subprocess), and only on a terminal
+    if sys.stdout.isatty():
+        sys.stdout.write(CLEAR_SCREEN)
     
     try:
-        game = DetectiveGame(debug=args.debug)
-        if args.case:
-            game.start_case(args.case)
-        else:
-            game.main_menu()
+        # Imported after the arguments are parsed so --help and --replay skip it
+        from detective_game import DetectiveGame
+        game = DetectiveGame(debug=args.debug, case_source=args.cases,
+                             color=False if args.no_color else None)
+        game.run(case_num=args.case)
     except KeyboardInterrupt:
         print("\n\n🔍 Thanks for playing CLI Detective!")
         sys.exit(0)
@@ -35,5 +51,22 @@ def main():
         print(f"💥 Game Error: {e}")
         sys.exit(1)
 
+def replay_transcripts(args):
+    """Headless --replay mode: no terminal, no screen clearing, a virtual clock"""
+    import replay
+    
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        games, outcomes, latencies = replay.run(args.replay, args.case, out, args.cases,
+                                                args.repeat)
+    except (OSError, ValueError) as e:
+        print(f"💥 Replay Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    replay.report(games, outcomes, latencies, time.perf_counter() - start, sys.stderr)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+"""
+Per-case suspect name index.
+
+Each suspect is filed under every way a player might refer to them: full name,
+name without title, first name, surname, title plus surname and the title on
+its own ("Dr. Michael Foster" -> "dr michael foster", "michael foster",
+"michael", "foster", "dr foster", "dr", "doctor"). Aliases go into a deletes
+table, so misspellings such as "rodrigez" resolve in bounded time. An alias
+shared by several suspects resolves to all of them, and callers report the
+ambiguity instead of picking one.
+
+A surname on its own is not taken for a suspect when a given name or a
+professional title in front of it belongs to no suspect: in a case whose only
+Chen is Sarah, "Dr. Lisa Chen" and "Dr. Chen" name nobody.
+"""
+
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Sequence, Set, Tuple, Union
+
+from fuzzy import DeletesIndex, allowed_edits
+from normalizer import NormalizedQuestion, analyze
+
+# Titles recognized in front of a name, with the words players use for them
+TITLES: Dict[str, Tuple[str, ...]] = {
+    'dr': ('dr', 'doctor'),
+    'prof': ('prof', 'professor'),
+    'mr': ('mr',),
+    'mrs': ('mrs',),
+    'ms': ('ms',),
+    'miss': ('miss',),
+    'chef': ('chef',),
+    'detective': ('detective',),
+    'officer': ('officer',),
+}
+# Titles that name a particular person rather than being a courtesy anyone could get
+# ("ms chen" can still be Sarah Chen, "dr chen" cannot)
+PROFESSIONAL_TITLES = frozenset(word for title, words in TITLES.items()
+                                if title not in ('mr', 'mrs', 'ms', 'miss') for word in words)
+
+# Given names that, in front of a suspect's surname, mean someone else with that
+# surname ("Lisa Chen" is not Sarah Chen): the generator's first names and the
+# authored cases' people
+GIVEN_NAMES = frozenset("""
+alice amanda anna antonio arthur beatrice benjamin beth carol catherine clara danny daniel david
+diana edward eleanor elena emily felix fiona frank george grace harold helen henry iris isaac
+jack jake james jennifer john jonathan julia kevin laura leonard lisa lucy marcus margaret maria
+martha martin mary michael nathan nora oliver olivia patricia patrick priya quentin rachel
+rebecca richard robert rosa samuel sandra sarah sofia sophia theodore thomas tommy ursula victor
+vivian wendy william yusuf
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words, possessives and punctuation dropped ("Dr. Foster's" -> ['dr', 'foster'])"""
+    return list(analyze(text).words)
+
+
+class NameIndex:
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        # alias -> indexes into self.names
+        self._aliases: Dict[str, Set[int]] = {}
+        self._fuzzy = DeletesIndex(max_distance=2)
+        self._longest = 1
+        # First letters and lengths of aliases that tolerate typos, to skip hopeless spans cheaply
+        self._fuzzy_initials: Set[str] = set()
+        self._fuzzy_lengths: Set[int] = set()
+
+        for position, name in enumerate(self.names):
+            for alias in self._aliases_of(name):
+                self._aliases.setdefault(alias, set()).add(position)
+        for alias in self._aliases:
+            edits = allowed_edits(alias)
+            self._fuzzy.add(alias, edits)
+            self._longest = max(self._longest, alias.count(' ') + 1)
+            if edits:
+                self._fuzzy_initials.add(alias[0])
+                self._fuzzy_lengths.update(range(len(alias) - edits, len(alias) + edits + 1))
+
+    @staticmethod
+    def _aliases_of(name: str) -> Set[str]:
+        tokens = tokenize(name)
+        if not tokens:
+            return set()
+        aliases = {' '.join(tokens)}
+        if tokens[0] in TITLES and len(tokens) > 1:
+            titles, tokens = TITLES[tokens[0]], tokens[1:]
+            aliases.update(titles)
+            aliases.update(f"{title} {tokens[-1]}" for title in titles)
+        aliases.add(' '.join(tokens))
+        aliases.add(tokens[0])
+        aliases.add(tokens[-1])
+        return aliases
+
+    def lookup(self, alias: str) -> List[str]:
+        """
+        Suspects an alias refers to: an exact alias, else the closest misspelling
+        within its edit allowance
+        """
+        suspects = self._aliases.get(alias)
+        if suspects is None:
+            if alias[:1] not in self._fuzzy_initials or len(alias) not in self._fuzzy_lengths:
+                return []
+            # Typos are assumed to spare the first letter, so "across" never finds "Cross"
+            candidates = self._fuzzy.lookup(alias, allowed_edits(alias))
+            matches = [(distance, term) for distance, term in candidates
+                       if term[0] == alias[0] and distance <= allowed_edits(term)]
+            if not matches:
+                return []
+            best = matches[0][0]
+            suspects = set().union(*(self._aliases[term]
+                                     for distance, term in matches if distance == best))
+        return [self.names[position] for position in sorted(suspects)]
+
+    def find(self, text: Union[str, NormalizedQuestion]) -> List[str]:
+        """
+        The suspects named in free text (or an already normalized question). The
+        longest, leftmost mention wins; more than one name comes back when that
+        mention is ambiguous.
+        """
+        tokens = tokenize(text) if isinstance(text, str) else text.words
+        for length in range(min(self._longest, len(tokens)), 0, -1):
+            spans = [(start, ' '.join(tokens[start:start + length]))
+                     for start in range(len(tokens) - length + 1)]
+            if length == 1:
+                spans = [(start, span) for start, span in spans
+                         if not self._names_someone_else(tokens, start)]
+            for _start, span in spans:
+                if span in self._aliases:
+                    return self.lookup(span)
+            for _start, span in spans:
+                suspects = self.lookup(span)
+                if suspects:
+                    return suspects
+        return []
+
+    def _names_someone_else(self, tokens: Sequence[str], start: int) -> bool:
+        """
+        Check whether a one-word mention is part of another person's name: a
+        professional title or given name in front of it that belongs to none of
+        the suspects the word could mean ("dr chen" or "lisa chen" when the only
+        Chen is Sarah), or, for a title on its own, a given name or another
+        suspect's name after it ("dr lisa" or "dr rodriguez" when the only doctor
+        is Michael Foster). Longer spans were tried first, so an alias covering
+        both words would already have matched.
+        """
+        word = tokens[start]
+        if word in PROFESSIONAL_TITLES:
+            after = tokens[start + 1] if start + 1 < len(tokens) else ''
+            return self._foreign(after, word, GIVEN_NAMES | self._aliases.keys())
+        if start == 0:
+            return False
+        if self._foreign(tokens[start - 1], word, PROFESSIONAL_TITLES | GIVEN_NAMES):
+            return True
+        return start > 1 and self._foreign(tokens[start - 2], word, PROFESSIONAL_TITLES)
+
+    def _foreign(self, neighbour: str, word: str, names: AbstractSet[str]) -> bool:
+        """A neighbour among ``names`` that is no alias of any suspect ``word`` is an alias of"""
+        if neighbour not in names:
+            return False
+        return not self._aliases.get(neighbour, set()) & self._aliases.get(word, set())
+
+def suspect_index(case: Mapping) -> NameIndex:
+    """The name index of a case: cached on Case records, built on the spot for plain dicts"""
+    names = getattr(case, 'names', None)
+    if names is None:
+        names = NameIndex(suspect['name'] for suspect in case.get('suspects', []))
+    return names
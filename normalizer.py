@@ -0,0 +1,127 @@
+"""
+Shared question normalization.
+
+A question is analyzed once into a NormalizedQuestion: case-folded words with
+contractions expanded ("what's" -> "what is", "didn't" -> "did not"),
+possessives dropped ("Anna's" -> "anna"), punctuation reduced to the clause
+breaks that matter (',', ';', '?'), a light stem per word and the span of the
+original text each token came from. Intent detection, spelling correction,
+name extraction and passage retrieval all read this one structure, and
+normalize() memoizes it for repeated inputs.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+# Words and the punctuation that separates clauses; other punctuation is dropped
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)*|[,;?]")
+
+# "'s" after these words is "is" ("what's", "it's"); after anything else it is a possessive
+_IS_CONTRACTED = frozenset(('what', 'where', 'when', 'who', 'why', 'how', 'that', 'there', 'here',
+                            'it', 'he', 'she'))
+
+_SUFFIXES = {"'re": 'are', "'ve": 'have', "'ll": 'will', "'d": 'would', "'m": 'am'}
+_NEGATED = {'ca': 'can', 'wo': 'will', 'sha': 'shall'}
+
+# Separate clauses of one question: "where was james and what was his motive"
+CLAUSE_BREAKS = frozenset((',', ';', '?', 'and', 'also'))
+
+QUESTION_WORDS = frozenset(('what', 'where', 'when', 'who', 'whom', 'whose', 'why', 'how', 'which'))
+OPENING_VERBS = frozenset(('was', 'were', 'is', 'are', 'did', 'does', 'do', 'had', 'has', 'have',
+                           'can', 'could', 'would', 'will'))
+
+
+class Token(NamedTuple):
+    word: str
+    stem: str
+    # Span of the original question this token came from
+    start: int
+    end: int
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping: plurals, -ing and -ed ("prints" -> "print", "poured" -> "pour")"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 5 and word.endswith('ing'):
+        return word[:-3]
+    if len(word) > 4 and word.endswith('ed') and not word.endswith('eed'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def _expand(word: str) -> List[str]:
+    """Split a word carrying apostrophes into the words it stands for"""
+    if "'" not in word:
+        return [word]
+    if word.endswith("n't"):
+        base = word[:-3]
+        return [_NEGATED.get(base, base), 'not']
+    base, _, suffix = word.partition("'")
+    suffix = "'" + suffix
+    if suffix == "'s":
+        return [base, 'is'] if base in _IS_CONTRACTED else [base]
+    if suffix in _SUFFIXES:
+        return [base, _SUFFIXES[suffix]]
+    # Apostrophes inside names ("o'brien") are dropped
+    return [word.replace("'", '')]
+
+
+class NormalizedQuestion:
+    """
+    The tokens of one question, with its normalized text (words and clause
+    breaks separated by spaces)
+    """
+    __slots__ = ('text', 'tokens', 'words', 'stems')
+
+    def __init__(self, tokens: Tuple[Token, ...]):
+        # Trailing punctuation carries no meaning
+        end = len(tokens)
+        while end and not tokens[end - 1].word[0].isalnum():
+            end -= 1
+        self.tokens = tokens[:end]
+        word_tokens = [token for token in self.tokens if token.word[0].isalnum()]
+        self.words: Tuple[str, ...] = tuple(token.word for token in word_tokens)
+        self.stems: Tuple[str, ...] = tuple(token.stem for token in word_tokens)
+        text = ' '.join(token.word for token in self.tokens)
+        self.text = text.replace(' ,', ',').replace(' ;', ';').replace(' ?', '?')
+
+    def clauses(self) -> List['NormalizedQuestion']:
+        """
+        Split at clause breaks. A clause after the first only starts a new
+        question if it has a question word or opens with a verb ("and where"),
+        not when it continues a list ("between catherine and the victim").
+        """
+        clauses: List[List[Token]] = [[]]
+        for token in self.tokens:
+            if token.word in CLAUSE_BREAKS:
+                clauses.append([])
+            else:
+                clauses[-1].append(token)
+        parts = [NormalizedQuestion(tuple(clause)) for clause in clauses if clause]
+        return parts[:1] + [part for part in parts[1:] if part.words[0] in OPENING_VERBS
+                            or QUESTION_WORDS.intersection(part.words)]
+
+    def __repr__(self) -> str:
+        return f"NormalizedQuestion({self.text!r})"
+
+
+def analyze(text: str) -> NormalizedQuestion:
+    """Normalize any text (questions, case facts, names) without memoizing it"""
+    text = text.casefold().replace('’', "'").replace('‘', "'")
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        for word in _expand(match.group()):
+            if word:
+                token_stem = stem(word) if word[0].isalnum() else word
+                tokens.append(Token(word, token_stem, match.start(), match.end()))
+    return NormalizedQuestion(tuple(tokens))
+
+
+@lru_cache(maxsize=8192)
+def normalize(question: str) -> NormalizedQuestion:
+    """Analyze a player's input, memoized: players repeat the same questions and commands"""
+    return analyze(question)
@@ -0,0 +1,128 @@
+"""
+BM25 passage retrieval over case facts.
+
+Each case's evidence items, suspect alibis and motives, scene description and
+weapon description become passages in a small inverted index. Postings are
+packed into flat arrays (document ids and term frequencies, sliced per term),
+so an index costs a few bytes per posting and a query only touches the
+postings of its own terms.
+"""
+
+import math
+from array import array
+from typing import AbstractSet, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from answer_cache import CaseVersionCache
+from normalizer import NormalizedQuestion, analyze
+
+# Words too common in questions and case text to say anything about a passage
+STOPWORDS = frozenset("""
+a about after all an and any anybody anyone anything are as at be been before but by can could
+describe did do does during everything explain for from get got had happen happened has have he her
+him his how i if in into is it its know me my no not of on or please said say saw see she so some
+something tell that the their them then there they thing this to was we were what when where which
+while who whom why with would you
+""".split())
+
+
+def terms(text: Union[str, NormalizedQuestion]) -> List[str]:
+    """Stems of the content words ("does the knife have prints" -> ['knife', 'print'])"""
+    if isinstance(text, str):
+        text = analyze(text)
+    return [stem for word, stem in zip(text.words, text.stems) if word not in STOPWORDS]
+
+
+class PassageIndex:
+    def __init__(self, passages: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.passages = list(passages)
+        self.k1 = k1
+        self.b = b
+
+        postings: Dict[str, Dict[int, int]] = {}
+        self._lengths = array('H')
+        for doc, passage in enumerate(self.passages):
+            words = terms(passage)
+            self._lengths.append(min(len(words), 0xFFFF))
+            for word in words:
+                counts = postings.setdefault(word, {})
+                counts[doc] = counts.get(doc, 0) + 1
+        self._average_length = sum(self._lengths) / max(len(self.passages), 1)
+
+        # term -> (start, end) slice of the flat posting arrays
+        self._slices: Dict[str, Tuple[int, int]] = {}
+        self._docs = array('H')
+        self._frequencies = array('H')
+        for word, counts in postings.items():
+            start = len(self._docs)
+            self._docs.extend(counts)
+            self._frequencies.extend(min(count, 0xFFFF) for count in counts.values())
+            self._slices[word] = (start, len(self._docs))
+
+    def search(self, query: Union[str, NormalizedQuestion], limit: int = 1,
+               ignore: AbstractSet[str] = frozenset(),
+               match_all: bool = False) -> List[Tuple[float, str]]:
+        """
+        Return up to ``limit`` (score, passage) pairs, best first, leaving the
+        stems in ``ignore`` out of the query; with ``match_all``, only passages
+        containing every remaining query term count
+        """
+        count = len(self.passages)
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        words = set(terms(query)) - ignore
+        for word in words:
+            bounds = self._slices.get(word)
+            if bounds is None:
+                if match_all:
+                    return []
+                continue
+            start, end = bounds
+            idf = math.log(1 + (count - (end - start) + 0.5) / (end - start + 0.5))
+            for position in range(start, end):
+                doc = self._docs[position]
+                frequency = self._frequencies[position]
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / self._average_length)
+                weight = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores[doc] = scores.get(doc, 0.0) + weight
+                matched[doc] = matched.get(doc, 0) + 1
+        if match_all:
+            scores = {doc: score for doc, score in scores.items() if matched[doc] == len(words)}
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(score, self.passages[doc]) for doc, score in best]
+
+    def best(self, query: Union[str, NormalizedQuestion], min_score: float = 1.0,
+             ignore: AbstractSet[str] = frozenset()) -> Optional[str]:
+        """
+        The best supporting passage, or None unless one contains every query
+        term outside ``ignore`` and scores at least ``min_score``: a passage
+        sharing one word with the question ("kitchen" in "was the chef in the
+        kitchen") is a guess, not an answer
+        """
+        results = self.search(query, ignore=ignore, match_all=True)
+        if results and results[0][0] >= min_score:
+            return results[0][1]
+        return None
+
+
+def case_passages(case: Mapping) -> List[str]:
+    """The facts of a case as self-contained passages"""
+    passages = [f"Evidence: {item}" for item in case.get('evidence', [])]
+    for suspect in case.get('suspects', []):
+        if suspect.get('alibi'):
+            passages.append(f"{suspect['name']}'s alibi: {suspect['alibi']}")
+        if suspect.get('motive'):
+            passages.append(f"{suspect['name']}'s motive: {suspect['motive']}")
+    if case.get('scene_description'):
+        passages.append(case['scene_description'])
+    weapon = case.get('weapon', {})
+    if weapon.get('description'):
+        passages.append(weapon['description'])
+    return passages
+
+
+_case_indexes = CaseVersionCache(lambda case: PassageIndex(case_passages(case)))
+
+
+def passage_index(case: Mapping) -> PassageIndex:
+    """The passage index of a case, built once per case version"""
+    return _case_indexes.get(case)
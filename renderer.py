@@ -0,0 +1,247 @@
+"""
+Buffered terminal rendering.
+
+Every screen of the terminal game is a template. Color names in a template
+({cyan}, {reset}, ...) are resolved once per Renderer, leaving a plain
+format string, and screens that depend only on the case (briefing, suspects,
+evidence, solution) are rendered once per case version. Showing a screen is
+then a single write and flush of the whole frame, instead of one print (and
+one system call on a terminal) per line.
+
+With color off, for piped output or NO_COLOR, templates compile without any
+escape codes.
+"""
+
+import os
+import sys
+from string import Formatter
+from typing import Dict, Iterable, Mapping, Optional, TextIO
+
+from answer_cache import CaseVersionCache
+
+# ANSI codes (the same ones colorama's Fore and Style name), written out so
+# drawing a screen does not need colorama outside Windows
+PALETTE = {
+    'red': '\x1b[31m',
+    'green': '\x1b[32m',
+    'yellow': '\x1b[33m',
+    'cyan': '\x1b[36m',
+    'magenta': '\x1b[35m',
+    'white': '\x1b[37m',
+    'dim': '\x1b[90m',
+    'reset': '\x1b[0m',
+}
+
+DIFFICULTY_COLORS = {'Easy': 'green', 'Medium': 'yellow', 'Hard': 'red'}
+
+RULE_60, RULE_50, RULE_40 = '=' * 60, '=' * 50, '=' * 40
+
+TEMPLATES = {
+    'header': """
+{cyan}╔════════════════════════════════════════════════════════════════╗
+║                        🔍 CLI DETECTIVE 🔍                      ║
+║                   Terminal Crime Investigation                  ║
+╚════════════════════════════════════════════════════════════════╝{reset}
+
+{yellow}Welcome, Detective! Choose a case to investigate:{reset}
+
+""",
+    'case_list': "\n{cyan}Available Cases:{reset}\n" + RULE_60 + "\n",
+    'case_entry': """{white}Case {id:2d}:{reset} {title}
+         {difficulty_color}Difficulty: {difficulty} | Time Limit: {minutes}min{reset}
+         {dim}{description}...{reset}
+
+""",
+    'case_info': """
+{red}🚨 CRIME SCENE REPORT 🚨{reset}
+""" + RULE_60 + """
+{cyan}Case:{reset} {title}
+{cyan}Location:{reset} {location}
+{cyan}Date:{reset} {date}
+{cyan}Difficulty:{reset} {difficulty}
+{cyan}Time Limit:{reset} {minutes} minutes
+
+""" + RULE_60 + """
+{yellow}SUMMARY:{reset}
+{summary}
+""" + RULE_60 + "\n",
+    'instructions': """
+{green}🎮 HOW TO PLAY:{reset}
+
+{yellow}📝 Ask Questions:{reset}
+   • Type natural language questions like:
+     - "What's the murder weapon?"
+     - "Who are the suspects?"
+     - "Does the knife have fingerprints?"
+     - "Where was Anna at the time of death?"
+
+{yellow}🔍 Make Accusation:{reset}
+   • Type: accuse [suspect_name]
+   • Example: "accuse John Smith"
+
+{yellow}💡 Other Commands:{reset}
+   • 'help' - Show this help
+   • 'time' - Check remaining time
+   • 'suspects' - List all suspects
+   • 'evidence' - List the evidence
+   • 'quit' - Exit game
+
+{red}⏰ Time Limit:{reset} {minutes} minutes
+{cyan}🎯 Goal:{reset} Find the killer before time runs out!
+
+Press ENTER to start investigating...
+
+""",
+    'suspects': "\n{cyan}🔍 SUSPECTS:{reset}\n" + RULE_40 + "\n",
+    'suspect': """{number}. {name}
+   Age: {age}
+   Occupation: {occupation}
+   Relationship: {relationship}
+
+""",
+    'evidence': "\n{cyan}🔍 EVIDENCE:{reset}\n",
+    'evidence_item': "   • {item}\n",
+    'solution': """
+{magenta}🔍 CASE SOLUTION:{reset}
+""" + RULE_50 + """
+{yellow}Killer:{reset} {killer}
+{yellow}Motive:{reset} {motive}
+{yellow}Method:{reset} {method}
+{yellow}Key Evidence:{reset} {key_evidence}
+""" + RULE_50 + "\n",
+    'won': """
+{green}🎉 CASE SOLVED! 🎉{reset}
+""" + RULE_50 + """
+{green}✅ You correctly identified the killer!{reset}
+{cyan}⏰ Time used: {minutes}:{seconds:02d}{reset}
+{cyan}❓ Questions asked: {questions}{reset}
+{yellow}🏆 Final Score: {score} points{reset}
+""",
+    'time_up': "\n{red}⏰ TIME'S UP! ⏰{reset}\n",
+    'ended': "\n{red}🔍 Investigation ended{reset}\n",
+    'lost': RULE_50 + """
+{red}❌ Case unsolved. The killer got away!{reset}
+{cyan}❓ Questions asked: {questions}{reset}
+""",
+    # One line per game event
+    'time': "{cyan}⏰ {text}{reset}\n",
+    'answer': "{green}🕵️  {text}{reset}\n",
+    'no_answer': "{red}❓ {text}{reset}\n",
+    'ambiguous': "{yellow}❓ {text}{reset}\n",
+    'invalid': "{red}❌ {text}{reset}\n",
+    'wrong': "{red}❌ {text}{reset}\n",
+    'error': "{red}❌ {text}{reset}\n",
+    'warning': "{red}{text}{reset}\n",
+    'goodbye': "{green}👋 {text}{reset}\n",
+    # Prompts, written by Console.read_line
+    'menu_prompt': "\n{yellow}🔍 Select a case number, filter by difficulty (easy/medium/hard), "
+                   "'all' to list every case, 'endless' for a generated case "
+                   "or 'quit' to exit: {reset}",
+    'game_prompt': "\n{yellow}🔍 [{time}] Detective: {reset}",
+    'again_prompt': "\n{yellow}🔄 Play another case? (y/n): {reset}",
+}
+
+
+def color_enabled(stream: TextIO) -> bool:
+    """Color for terminals, none for pipes, files or when NO_COLOR is set"""
+    if 'NO_COLOR' in os.environ:
+        return False
+    return hasattr(stream, 'isatty') and stream.isatty()
+
+
+def compile_template(source: str, palette: Mapping[str, str]) -> str:
+    """Resolve the color fields of a template, leaving a format string of its data fields"""
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(source):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if field in palette:
+            parts.append(palette[field])
+        else:
+            conversion = '!' + conversion if conversion else ''
+            spec = ':' + spec if spec else ''
+            parts.append('{' + field + conversion + spec + '}')
+    return ''.join(parts)
+
+
+class Renderer:
+    def __init__(self, stream: Optional[TextIO] = None, color: Optional[bool] = None):
+        # Looked up on each write when not given: colorama may replace sys.stdout
+        self._stream = stream
+        if color is None:
+            color = color_enabled(self.stream)
+        self.color = color
+        self.palette = dict(PALETTE) if color else {name: '' for name in PALETTE}
+        self.templates = {name: compile_template(source, self.palette)
+                          for name, source in TEMPLATES.items()}
+        self._case_screens: Dict[str, CaseVersionCache] = {
+            name: CaseVersionCache(build) for name, build in (
+                ('case_info', self._case_info),
+                ('instructions', self._instructions),
+                ('suspects', self._suspects),
+                ('evidence', self._evidence),
+                ('solution', self._solution),
+            )
+        }
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream or sys.stdout
+
+    def render(self, name: str, **fields) -> str:
+        return self.templates[name].format_map(fields)
+
+    def write(self, *frames: str):
+        """Write frames with one write and one flush"""
+        stream = self.stream
+        stream.write(''.join(frames))
+        stream.flush()
+
+    def show(self, name: str, **fields):
+        self.write(self.render(name, **fields))
+
+    def case_screen(self, name: str, case: Mapping) -> str:
+        """A case's briefing, instructions, suspects, evidence or solution, once per case version"""
+        return self._case_screens[name].get(case)
+
+    def case_list(self, cases: Iterable[Mapping]) -> str:
+        entry = self.templates['case_entry']
+        return self.templates['case_list'] + ''.join(entry.format(
+            id=case['id'],
+            title=case['title'],
+            difficulty=case.get('difficulty', 'Medium'),
+            difficulty_color=self.palette[
+                DIFFICULTY_COLORS.get(case.get('difficulty', 'Medium'), 'yellow')],
+            minutes=case.get('time_limit', 300) // 60,
+            description=case['description'][:60],
+        ) for case in cases)
+
+    def _case_info(self, case: Mapping) -> str:
+        return self.render('case_info', title=case['title'], location=case['location'],
+                           date=case['date'], difficulty=case['difficulty'],
+                           minutes=case['time_limit'] // 60, summary=case['summary'])
+
+    def _instructions(self, case: Mapping) -> str:
+        return self.render('instructions', minutes=case['time_limit'] // 60)
+
+    def _suspects(self, case: Mapping) -> str:
+        suspect = self.templates['suspect']
+        return self.templates['suspects'] + ''.join(suspect.format(
+            number=number,
+            name=entry['name'],
+            age=entry.get('age', 'Unknown'),
+            occupation=entry.get('occupation', 'Unknown'),
+            relationship=entry.get('relationship', 'Unknown'),
+        ) for number, entry in enumerate(case.get('suspects', []), 1))
+
+    def _evidence(self, case: Mapping) -> str:
+        item = self.templates['evidence_item']
+        return self.templates['evidence'] + ''.join(
+            item.format(item=evidence) for evidence in case.get('evidence', []))
+
+    def _solution(self, case: Mapping) -> str:
+        solution = case.get('solution', {})
+        fields = ('killer', 'motive', 'method', 'key_evidence')
+        return self.render('solution', **{field: solution.get(field, 'Unknown')
+                                          for field in fields})
@@ -0,0 +1,164 @@
+"""
+Headless transcript replay.
+
+A transcript is a text file of player input, one command per line exactly as
+typed at the Detective prompt. Blank lines and lines starting with '#' are
+skipped, and two directives are understood:
+
+    @case 3     play case 3 (otherwise the --case given on the command line)
+    @wait 45    45 seconds pass before the next command
+
+Each transcript is played through a GameSession on a VirtualClock, with no
+terminal and no waiting, and produces one JSONL record: the outcome,
+questions asked, score, what the game said each turn and how long each turn
+took to compute. Fallback replies use a seeded random generator, so
+everything but the latencies is the same on every run and records can be
+diffed to check answer changes.
+
+Usage: python main.py --replay transcript.txt --case 1 [-o results.jsonl] [--repeat 100]
+       python main.py --replay 'transcripts/*.txt' --case 1
+"""
+
+import glob
+import json
+import os
+import random
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from case_data import CaseData
+from clock import VirtualClock
+from game_session import ACTIVE, GameSession
+from normalizer import normalize
+from text_processor import TextProcessor
+
+
+class Transcript(NamedTuple):
+    path: str
+    case_id: Optional[int]
+    # ('say', command) or ('wait', seconds)
+    steps: List[Tuple[str, object]]
+
+
+def find_transcripts(pattern: str) -> List[str]:
+    """A transcript file, every .txt file in a directory, or the files matching a glob"""
+    if os.path.isdir(pattern):
+        paths = sorted(glob.glob(os.path.join(pattern, '*.txt')))
+    elif os.path.isfile(pattern):
+        paths = [pattern]
+    else:
+        paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"No transcripts found at {pattern}")
+    return paths
+
+
+def read_transcript(path: str) -> Transcript:
+    case_id = None
+    steps: List[Tuple[str, object]] = []
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('@'):
+                directive, _, value = line[1:].partition(' ')
+                try:
+                    if directive == 'case':
+                        case_id = int(value)
+                    elif directive == 'wait':
+                        steps.append(('wait', float(value)))
+                    else:
+                        raise ValueError(f"unknown directive @{directive}")
+                except ValueError as e:
+                    raise ValueError(f"{path}:{number}: {e}") from None
+                continue
+            steps.append(('say', line))
+    return Transcript(path, case_id, steps)
+
+
+def replay(transcript: Transcript, case, text_processor: TextProcessor, seed: int = 0) -> Dict:
+    """Play one transcript to the end (or until the game ends) and return its record"""
+    clock = VirtualClock()
+    session = GameSession(case, text_processor, clock=clock, rng=random.Random(seed))
+    turns, latencies = [], []
+    for kind, value in transcript.steps:
+        if not session.active:
+            break
+        if kind == 'wait':
+            clock.advance(value)
+            events = session.check_time()
+            if events:
+                turns.append({'input': f"@wait {value:g}",
+                              'events': [event.kind for event in events]})
+            continue
+
+        start = time.perf_counter()
+        events = session.submit(value)
+        latencies.append(time.perf_counter() - start)
+        turns.append({
+            'input': value,
+            'events': [event.kind for event in events],
+            'text': '\n'.join(event.text for event in events if event.text),
+        })
+
+    return {
+        'transcript': transcript.path,
+        'case': case['id'],
+        'outcome': 'unfinished' if session.state == ACTIVE else session.state,
+        'questions_asked': session.questions_asked,
+        'score': session.score,
+        'time_used': round(session.time_limit - session.time_remaining(), 3),
+        'turns': turns,
+        'latency_us': [round(seconds * 1e6, 1) for seconds in latencies],
+    }
+
+
+def run(patterns: List[str], default_case: Optional[int], out, source: Optional[str] = None,
+        repeat: int = 1) -> Tuple[int, Counter, List[float]]:
+    """Replay every transcript repeat times into out; returns games, outcomes and latencies"""
+    transcripts = [read_transcript(path)
+                   for pattern in patterns for path in find_transcripts(pattern)]
+    case_data = CaseData(source)
+    text_processor = TextProcessor()
+    cases = {}
+    for transcript in transcripts:
+        case_id = transcript.case_id if transcript.case_id is not None else default_case
+        if case_id is None:
+            raise ValueError(f"{transcript.path}: no @case line and no --case given")
+        if case_id not in cases:
+            case = case_data.get_case(case_id)
+            if case is None:
+                raise ValueError(f"{transcript.path}: there is no case {case_id}")
+            cases[case_id] = case
+
+    # Train the intent model now so the first turn's latency is not the training time
+    text_processor.classify_batch([normalize('warm up')])
+
+    games = 0
+    outcomes: Counter = Counter()
+    latencies: List[float] = []
+    for _ in range(repeat):
+        for transcript in transcripts:
+            case_id = transcript.case_id if transcript.case_id is not None else default_case
+            record = replay(transcript, cases[case_id], text_processor)
+            out.write(json.dumps(record) + '\n')
+            games += 1
+            outcomes[record['outcome']] += 1
+            latencies.extend(record['latency_us'])
+    return games, outcomes, latencies
+
+
+def report(games: int, outcomes: Counter, latencies: List[float], elapsed: float, file):
+    """Throughput, outcomes and turn latency percentiles"""
+    print(f"{games} games in {elapsed:.2f}s ({games / max(elapsed, 1e-9):,.0f} games/s, "
+          f"{len(latencies) / max(elapsed, 1e-9):,.0f} turns/s)", file=file)
+    print('outcomes: ' + ', '.join(f"{outcome} {count}"
+                                   for outcome, count in outcomes.most_common()), file=file)
+    if latencies:
+        latencies = sorted(latencies)
+        print(f"turn latency µs: mean {sum(latencies) / len(latencies):.1f}, "
+              f"p50 {latencies[len(latencies) // 2]:.1f}, "
+              f"p99 {latencies[int(len(latencies) * 0.99)]:.1f}, "
+              f"max {latencies[-1]:.1f}", file=file)
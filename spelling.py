@@ -0,0 +1,132 @@
+"""
+Typo correction for questions.
+
+Words are checked against two vocabularies: a shared one (question keywords
+plus every word of the intent training questions, built once per process) and
+one per case version (suspect and victim names, evidence, weapon and location
+words). Unknown words are replaced by the closest known word within a few
+edits, found through precomputed deletes tables, so a lookup costs a handful
+of hash probes however large the vocabularies grow.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from answer_cache import CaseVersionCache
+from fuzzy import DeletesIndex, allowed_edits
+from normalizer import NormalizedQuestion, analyze, normalize
+
+# Question keywords win ties against other words at the same distance
+KEYWORD_WEIGHT = 1000
+
+
+def correctable_edits(word: str) -> int:
+    """Edits tolerated when correcting a word; unlike names, four-letter words ("whre") get one"""
+    return 1 if len(word) == 4 else allowed_edits(word)
+
+
+class Vocabulary:
+    def __init__(self, counts: Mapping[str, int]):
+        self.counts: Dict[str, int] = dict(counts)
+        self._index = DeletesIndex(max_distance=2)
+        # Players misspell the same words over and over, so candidate lists are memoized
+        self._candidates: Dict[str, List[Tuple[int, int, str]]] = {}
+        for word in self.counts:
+            self._index.add(word, correctable_edits(word))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.counts
+
+    def knows_all(self, words: Iterable[str]) -> bool:
+        """
+        Check whether none of the words would be corrected, whatever other
+        vocabularies are consulted
+        """
+        return all(word in self.counts or correctable_edits(word) == 0 for word in words)
+
+    def candidates(self, word: str) -> List[Tuple[int, int, str]]:
+        """
+        (distance, -count, word) for known words within the edit allowance that
+        share the first letter
+        """
+        candidates = self._candidates.get(word)
+        if candidates is None:
+            edits = correctable_edits(word)
+            candidates = [(distance, -self.counts[term], term)
+                          for distance, term in self._index.lookup(word, edits)
+                          if term[0] == word[0] and distance <= correctable_edits(term)]
+            if len(self._candidates) < 50_000:
+                self._candidates[word] = candidates
+        return candidates
+
+
+class SpellingCorrector:
+    def __init__(self, *vocabularies: Vocabulary):
+        self.vocabularies = vocabularies
+
+    def correct_word(self, word: str) -> str:
+        """The closest known word, or the word itself if it is known or nothing is close enough"""
+        known = any(word in vocabulary for vocabulary in self.vocabularies)
+        if known or correctable_edits(word) == 0:
+            return word
+        candidates = [candidate for vocabulary in self.vocabularies
+                      for candidate in vocabulary.candidates(word)]
+        return min(candidates)[2] if candidates else word
+
+    def correct(self, question: NormalizedQuestion) -> NormalizedQuestion:
+        """Correct every word of a normalized question, keeping its clause breaks"""
+        words = [self.correct_word(token.word) if token.word[0].isalpha() else token.word
+                 for token in question.tokens]
+        if all(word == token.word for word, token in zip(words, question.tokens)):
+            return question
+        return normalize(' '.join(words))
+
+
+def _words(texts: Iterable[str]) -> Counter:
+    counts: Counter = Counter()
+    for text in texts:
+        counts.update(word for word in analyze(text).words if word.isalpha())
+    return counts
+
+
+_base_vocabularies: Dict[Tuple[Tuple[str, str], ...], Vocabulary] = {}
+
+
+def base_vocabulary(keywords: Iterable[Tuple[str, str]]) -> Vocabulary:
+    """
+    Question keywords plus the training question words, built once per process
+    for each keyword set
+    """
+    keywords = tuple(keywords)
+    vocabulary = _base_vocabularies.get(keywords)
+    if vocabulary is None:
+        from intent_model import read_training_set
+
+        counts = _words(read_training_set()[0])
+        for word in _words(keyword for keyword, _ in keywords):
+            counts[word] += KEYWORD_WEIGHT
+        vocabulary = _base_vocabularies[keywords] = Vocabulary(counts)
+    return vocabulary
+
+
+def build_case_vocabulary(case: Mapping) -> Vocabulary:
+    """Names, evidence, weapon and location words of one case"""
+    texts = [suspect['name'] for suspect in case.get('suspects', [])]
+    texts.extend(case.get('evidence', []))
+    texts.append(case.get('victim', {}).get('name', ''))
+    texts.append(case.get('weapon', {}).get('type', ''))
+    texts.append(case.get('location', ''))
+    return Vocabulary(_words(texts))
+
+
+_case_vocabularies = CaseVersionCache(build_case_vocabulary)
+
+
+def case_vocabulary(case: Mapping) -> Vocabulary:
+    """The vocabulary of a case, built once per case version"""
+    return _case_vocabularies.get(case)
+
+
+def corrector_for(case: Mapping, keywords: Iterable[Tuple[str, str]]) -> SpellingCorrector:
+    """A corrector over the shared vocabulary and this case's own words"""
+    return SpellingCorrector(base_vocabulary(keywords), case_vocabulary(case))
@@ -0,0 +1,101 @@
+"""
+A status line pinned to the top row of the terminal.
+
+show() reserves the first row by limiting the terminal's scroll region to
+the rows below it, so normal output scrolls underneath. update() compares
+the new text with what is already on screen and rewrites only the runs of
+characters that changed, each with one cursor-addressed write between a
+cursor save and restore. A countdown tick is usually a single character,
+and the line the player is typing on is left where it was.
+
+Only active on a terminal that understands ANSI scroll regions; elsewhere
+every call is a no-op.
+"""
+
+import os
+import sys
+from typing import List, Optional, TextIO, Tuple
+
+ESC = '\x1b'
+SAVE_CURSOR, RESTORE_CURSOR = ESC + '7', ESC + '8'
+REVERSE, RESET = ESC + '[7m', ESC + '[0m'
+
+
+def changed_runs(old: str, new: str, max_gap: int = 4) -> List[Tuple[int, str]]:
+    """
+    (column, text) runs where new differs from old, both the same length.
+    Runs separated by fewer than max_gap unchanged characters are merged:
+    rewriting a few characters is cheaper than another cursor move.
+    """
+    runs: List[List[int]] = []
+    for column, (before, after) in enumerate(zip(old, new)):
+        if before != after:
+            if runs and column - runs[-1][1] <= max_gap:
+                runs[-1][1] = column + 1
+            else:
+                runs.append([column, column + 1])
+    return [(start, new[start:end]) for start, end in runs]
+
+
+def _terminal_size() -> os.terminal_size:
+    # Imported on first use: shutil is slow to import and only needed once the line is shown
+    import shutil
+    return shutil.get_terminal_size()
+
+
+class StatusLine:
+    def __init__(self, stream: Optional[TextIO] = None, enabled: Optional[bool] = None):
+        self.stream = stream or sys.stdout
+        if enabled is None:
+            enabled = (sys.platform != 'win32' and hasattr(self.stream, 'isatty')
+                       and self.stream.isatty())
+        self.enabled = enabled
+        self.shown = False
+        self._size = (0, 0)
+        self._text = ''
+        # Characters sent to the terminal, for benchmarks
+        self.bytes_written = 0
+
+    def show(self):
+        """Reserve the top row and start drawing there"""
+        if not self.enabled:
+            return
+        self.shown = True
+        self._resize(_terminal_size())
+
+    def update(self, text: str):
+        """Redraw the line, sending only what changed since the last update"""
+        if not self.shown:
+            return
+        size = _terminal_size()
+        if size != self._size:
+            self._resize(size)
+        text = text[:self._size[0]].ljust(self._size[0])
+        runs = changed_runs(self._text, text)
+        self._text = text
+        if runs:
+            self._write(SAVE_CURSOR + REVERSE
+                        + ''.join(f"{ESC}[1;{column + 1}H{chunk}" for column, chunk in runs)
+                        + RESET + RESTORE_CURSOR)
+
+    def hide(self):
+        """Give the top row back to normal output"""
+        if not self.shown:
+            return
+        self.shown = False
+        # Resetting the scroll region homes the cursor, so put it back afterwards
+        self._write(SAVE_CURSOR + f"{ESC}[r{ESC}[1;1H{ESC}[2K" + RESTORE_CURSOR)
+        self._text = ''
+
+    def _resize(self, size: os.terminal_size):
+        """(Re)claim the top row for a terminal of this size and forget what was drawn"""
+        self._size = size
+        self._text = ' ' * size.columns
+        # Setting the scroll region moves the cursor home; park it on the last row
+        self._write(f"{ESC}[2;{size.lines}r{ESC}[1;1H{REVERSE}{self._text}{RESET}"
+                    f"{ESC}[{size.lines};1H")
+
+    def _write(self, data: str):
+        self.bytes_written += len(data.encode('utf-8'))
+        self.stream.write(data)
+        self.stream.flush()
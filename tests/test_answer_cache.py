@@ -0,0 +1,39 @@
+from answer_cache import AnswerCache
+from case_data import CaseData
+from text_processor import TextProcessor
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = AnswerCache(maxsize=3)
+    for key in 'abc':
+        cache.put((1, 1, key), key.upper())
+    assert cache.get((1, 1, 'a')) == 'A'
+
+    cache.put((1, 1, 'd'), 'D')
+    assert len(cache) == 3
+    assert cache.get((1, 1, 'b'), 'evicted') == 'evicted'
+    assert [cache.get((1, 1, key)) for key in 'acd'] == ['A', 'C', 'D']
+
+
+def test_none_answers_are_cached_and_counted():
+    cache = AnswerCache()
+    assert cache.get((1, 1, 'q'), 'miss') == 'miss'
+    cache.put((1, 1, 'q'), None)
+    assert cache.get((1, 1, 'q'), 'miss') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 4096}
+
+    cache.invalidate([1])
+    assert len(cache) == 0
+    cache.clear()
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+
+
+def test_processors_answer_repeat_questions_from_the_cache():
+    cache = AnswerCache()
+    case = CaseData().get_case(1)
+    processor = TextProcessor(cache)
+    first = processor.process_question("what was the weapon?", case)
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 0
+
+    assert TextProcessor(cache).process_question("What was the weapon", case) == first
+    assert cache.stats()['hits'] == 1 and len(cache) == 1
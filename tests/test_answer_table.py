@@ -0,0 +1,36 @@
+from answer_table import ANSWER_TABLE_FORMAT, build_answer_table, is_current
+from case_data import CaseData
+from case_model import Case
+from text_processor import TextProcessor
+
+
+def test_record_and_dict_cases_get_the_same_table():
+    case = CaseData().get_case(2)
+    assert case.answers == build_answer_table(case.to_dict())
+    assert case.answers['alibi']['lisa rodriguez'] == case.suspects[1].alibi
+    assert case.answers['motives']['james morrison'] == case.suspects[0].motive
+
+
+def test_missing_fields_get_placeholder_answers():
+    table = build_answer_table({'id': 1, 'suspects': [{'name': 'Ann Lee'}]})
+    assert table['weapon'] == 'The murder weapon has not been determined.'
+    assert table['evidence'] == 'No evidence has been found yet.'
+    assert table['alibi'] == {'ann lee': "Ann Lee's alibi is unknown."}
+    assert table['motives'] == {}
+
+
+def test_stale_tables_are_rebuilt():
+    body = CaseData().get_case(3).to_dict()
+    stale = dict(build_answer_table(body), format=ANSWER_TABLE_FORMAT - 1, weapon='Old wording')
+    assert not is_current(stale)
+    case = Case.from_dict(dict(body, answers=stale))
+    assert is_current(case.answers)
+    assert case.answers['weapon'] == body['weapon']['description']
+
+
+def test_processor_answers_come_from_the_table():
+    case = CaseData().get_case(1)
+    processor = TextProcessor()
+    assert processor.process_question("when did it happen?", case) == case.answers['time']
+    assert processor.process_question("where was sarah chen", case) == (
+        case.answers['alibi']['sarah chen'])
@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+import batch_eval
+
+QUESTIONS = ["what was the murder weapon?", "where was sarah?", "who are the suspects?",
+             "what was the motive?"]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / 'questions.txt'
+    path.write_text('\n'.join(QUESTIONS) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def records(corpus, **options):
+    out = io.StringIO()
+    count, asked, answered = batch_eval.run(corpus, [1, 2, 3], out, **options)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert count == len(lines) == len(QUESTIONS) * 3
+    return sorted(lines, key=lambda record: (record['case'], record['line']))
+
+
+def test_missing_cases_are_reported_before_any_work():
+    with pytest.raises(ValueError, match='No such case: 99'):
+        batch_eval.resolve_cases(None, [1, 99])
+
+
+def test_cases_are_resolved_once(corpus, monkeypatch):
+    calls = []
+    resolve = batch_eval.resolve_cases
+
+    def counting_resolve(*args):
+        calls.append(args)
+        return resolve(*args)
+
+    monkeypatch.setattr(batch_eval, 'resolve_cases', counting_resolve)
+    monkeypatch.setattr('sys.argv', ['batch_eval', corpus, '--cases', '1,2', '--workers', '1',
+                                     '-o', corpus + '.jsonl'])
+    batch_eval.main()
+    assert len(calls) == 1
+
+
+def test_missing_source_fails_instead_of_hanging(corpus, tmp_path):
+    with pytest.raises(OSError):
+        batch_eval.run(corpus, [1], io.StringIO(), source=str(tmp_path / 'missing'), workers=2)
+
+
+def test_units_split_by_questions_and_cases_give_the_same_answers(corpus):
+    whole = records(corpus, workers=1)
+    assert records(corpus, workers=1, chunk_size=3, case_chunk_size=2) == whole
+    assert records(corpus, workers=2, chunk_size=1, case_chunk_size=1) == whole
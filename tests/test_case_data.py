@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+from case_data import CaseData
+from case_pack import CasePack, compile_pack
+from case_store import DEFAULT_STORE_DIR, case_filename
+from text_processor import TextProcessor
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / 'cases')
+    shutil.copytree(DEFAULT_STORE_DIR, path)
+    return path
+
+
+def read_case(store: str, case_id: int) -> dict:
+    with open(os.path.join(store, case_filename(case_id)), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_case(store: str, filename: str, body):
+    with open(os.path.join(store, filename), 'w', encoding='utf-8') as f:
+        f.write(body if isinstance(body, str) else json.dumps(body))
+
+
+def test_case_versions_are_unique_across_sources(tmp_path):
+    authored = CaseData()
+    other = dict(authored.get_case(2).to_dict(), title='Another case 2')
+    other['suspects'] = [dict(suspect, name=f"{suspect['name']} Junior")
+                         for suspect in other['suspects']]
+    other['killer'] = other['suspects'][0]['name']
+    other['solution'] = dict(other['solution'], killer=other['killer'])
+    pack = str(tmp_path / 'other.pack')
+    compile_pack([other], pack)
+
+    first, second = authored.get_case(2), CaseData(pack).get_case(2)
+    assert first.version != second.version
+    processor = TextProcessor()
+    assert 'Junior' not in processor.process_question("who are the suspects", first)
+    assert 'Junior' in processor.process_question("who are the suspects", second)
+
+
+def test_add_and_remove_make_new_versions():
+    case_data = CaseData()
+    old = case_data.get_case(1)
+    case_data.add_case(dict(old.to_dict(), evidence=['A brand new clue']))
+    new = case_data.get_case(1)
+
+    assert new.version != old.version
+    answer = TextProcessor().process_question("what evidence is there", new)
+    assert answer == "Evidence found: A brand new clue"
+    version = case_data.version
+    assert case_data.remove_case(1)
+    assert case_data.version > version
+
+
+def scan(case_data, **filters):
+    """The ids find_cases should return, by checking every header"""
+    def matches(header, field, value):
+        if field == 'suspect':
+            return value.lower() in [name.lower() for name in header['suspects']]
+        return header[field].lower() == value.lower()
+
+    return sorted(header['id'] for header in case_data.get_all_cases()
+                  if all(matches(header, field, value) for field, value in filters.items()))
+
+
+def test_find_cases_matches_a_full_scan():
+    case_data = CaseData()
+    queries = [dict(difficulty='hard'), dict(difficulty='Medium', location='mansion study'),
+               dict(victim_occupation='ACCOUNTANT'), dict(suspect='sarah chen'),
+               dict(difficulty='easy', suspect='Sarah Chen'), dict(location='nowhere')]
+
+    def check():
+        for query in queries:
+            found = sorted(header['id'] for header in case_data.find_cases(**query))
+            assert found == scan(case_data, **query)
+
+    check()
+    case_data.add_case(dict(case_data.get_case(3).to_dict(), id=99, difficulty='Hard'))
+    found = case_data.find_cases(difficulty='hard', suspect='frank mason')
+    assert [header['id'] for header in found] == [99]
+    check()
+    case_data.add_case(dict(case_data.get_case(1).to_dict(), location='Boathouse'))
+    assert case_data.find_cases(location='mansion study') == []
+    check()
+    assert case_data.remove_case(99)
+    assert [header['id'] for header in case_data.find_cases(suspect='frank mason')] == [3]
+    check()
+
+
+def test_reload_skips_unreadable_files_and_retries_them(store):
+    case_data = CaseData(store)
+    case_data.reload()
+    write_case(store, 'case_0012.json', '{"title": "no id yet"}')
+    write_case(store, case_filename(3), dict(read_case(store, 3), title='Edited'))
+
+    assert case_data.reload() == [3]
+    assert case_data.get_case(3)['title'] == 'Edited'
+
+    write_case(store, 'case_0012.json', dict(read_case(store, 3), id=12, title='Case twelve'))
+    assert case_data.reload() == [12]
+    assert case_data.get_case(12)['title'] == 'Case twelve'
+
+
+def test_reload_renumbered_case_drops_its_old_id(store):
+    case_data = CaseData(store)
+    case_data.reload()
+    write_case(store, case_filename(2), dict(read_case(store, 2), id=55))
+
+    assert sorted(case_data.reload()) == [2, 55]
+    assert case_data.get_case(2) is None
+    assert case_data.get_case(55)['id'] == 55
+
+    os.remove(os.path.join(store, case_filename(2)))
+    assert case_data.reload() == [55]
+    assert case_data.get_case(55) is None
+
+
+def test_reload_rejects_invalid_cases(store, capsys):
+    case_data = CaseData(store)
+    case_data.reload()
+    loaded = case_data.get_case(1)
+    write_case(store, case_filename(1), dict(read_case(store, 1), evidence=[]))
+    write_case(store, case_filename(2), dict(read_case(store, 2), evidence=[]))
+
+    # The loaded case keeps its old content; the other is withdrawn until fixed
+    assert case_data.reload() == [2]
+    assert 'Ignoring invalid case 1: no evidence' in capsys.readouterr().err
+    assert case_data.get_case(1) is loaded
+    assert not case_data.has_case(2)
+
+    write_case(store, case_filename(2), dict(read_case(store, 2), evidence=['Fixed']))
+    assert case_data.reload() == [2]
+    assert case_data.get_case(2)['evidence'] == ('Fixed',)
+
+
+def test_pack_overwritten_in_place(tmp_path):
+    case_data = CaseData()
+    cases = [case_data.get_case(header['id']).to_dict() for header in case_data.get_all_cases()]
+    path, staged = str(tmp_path / 'cases.pack'), str(tmp_path / 'staged.pack')
+    compile_pack(cases, path)
+    compile_pack([dict(cases[0], title='Recompiled')] + cases[1:], staged)
+
+    served = CaseData(path)
+    served.reload()
+    old_pack = served.store
+    # What cp does: truncate, then write
+    open(path, 'wb').close()
+    assert served.reload() == []
+    shutil.copyfile(staged, path)
+
+    assert served.reload() == [cases[0]['id']]
+    assert old_pack.stale
+    assert isinstance(served.store, CasePack) and served.store is not old_pack
+    assert served.get_case(cases[0]['id'])['title'] == 'Recompiled'
+
+
+def test_watcher_survives_reload_errors(store, capsys):
+    case_data = CaseData(store)
+    calls = threading.Event()
+
+    def failing_reload():
+        calls.set()
+        raise KeyError('id')
+
+    case_data.watch(interval=0.01)
+    case_data.reload = failing_reload
+    try:
+        assert calls.wait(2)
+        calls.clear()
+        assert calls.wait(2)
+        assert case_data._watcher.is_alive()
+    finally:
+        case_data.stop_watching()
+    assert 'Case reload failed' in capsys.readouterr().err
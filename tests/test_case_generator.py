@@ -0,0 +1,21 @@
+import itertools
+
+from case_generator import generate_case, generate_cases
+from case_model import validate_case
+
+
+def test_cases_are_deterministic_per_seed():
+    first = list(generate_cases(20, seed=7))
+    assert list(generate_cases(20, seed=7)) == first
+    assert generate_case(13, seed=7) == first[12]
+    assert list(generate_cases(20, seed=8)) != first
+
+
+def test_generated_cases_are_valid():
+    for case in generate_cases(300, seed=3, start_id=1000):
+        assert validate_case(case) == [], case['id']
+
+
+def test_endless_stream_numbers_cases_in_order():
+    ids = [case['id'] for case in itertools.islice(generate_cases(seed=1, start_id=50), 5)]
+    assert ids == [50, 51, 52, 53, 54]
@@ -0,0 +1,51 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from case_model import Case, Record
+from case_store import DEFAULT_STORE_DIR, case_filename
+
+
+def case_body(case_id: int) -> dict:
+    with open(os.path.join(DEFAULT_STORE_DIR, case_filename(case_id)), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_case_reads_like_its_dict():
+    body = case_body(1)
+    case = Case.from_dict(body)
+
+    assert case.to_dict() == body
+    assert dict(case).keys() == body.keys()
+    assert case['title'] == case.title == body['title']
+    assert case['victim']['name'] == case.victim.name == body['victim']['name']
+    assert [suspect['alibi'] for suspect in case['suspects']] == (
+        [suspect['alibi'] for suspect in body['suspects']])
+    assert list(case['evidence']) == body['evidence']
+    assert case.get('missing', 'default') == 'default'
+    with pytest.raises(KeyError):
+        case['missing']
+
+
+def test_records_are_immutable():
+    case = Case.from_dict(case_body(2))
+    with pytest.raises(AttributeError):
+        case.title = 'Changed'
+    with pytest.raises(AttributeError):
+        case.suspects[0].alibi = 'Changed'
+    with pytest.raises(AttributeError):
+        del case.killer
+    with pytest.raises(TypeError):
+        case['title'] = 'Changed'
+    assert isinstance(case.suspects, tuple) and isinstance(case.suspects[0], Record)
+
+
+def test_cases_survive_pickling():
+    case = Case.from_dict(case_body(3), version=(1, 2))
+    copy = pickle.loads(pickle.dumps(case))
+
+    assert copy == case and copy.to_dict() == case.to_dict()
+    assert copy.version == (1, 2)
+    assert copy.answers == case.answers
@@ -0,0 +1,60 @@
+import pytest
+
+from case_data import CaseData
+from case_pack import HEADER, CasePack, PackError, compile_pack, verify_pack
+from case_store import case_header
+
+
+@pytest.fixture(scope='module')
+def cases():
+    case_data = CaseData()
+    return [case_data.get_case(header['id']).to_dict() for header in case_data.get_all_cases()]
+
+
+@pytest.fixture
+def pack_path(tmp_path, cases):
+    path = str(tmp_path / 'cases.pack')
+    assert compile_pack(cases, path) == len(cases)
+    return path
+
+
+def test_round_trip(pack_path, cases):
+    pack = CasePack(pack_path, verify=True)
+    try:
+        ordered = sorted(cases, key=lambda case: case['id'])
+        assert pack.headers == [case_header(case) for case in ordered]
+        for case in cases:
+            body = pack.load(case['id'])
+            answers = body.pop('answers')
+            assert body == case
+            assert answers['format']
+        assert pack.load(max(case['id'] for case in cases) + 1) is None
+    finally:
+        pack.close()
+    assert verify_pack(pack_path) == []
+
+
+def test_case_data_serves_a_pack(pack_path, cases):
+    case_data = CaseData(pack_path)
+    ids = [header['id'] for header in case_data.get_all_cases()]
+    assert ids == sorted(case['id'] for case in cases)
+    assert case_data.get_case(cases[0]['id']).to_dict() == cases[0]
+
+
+def test_corruption_fails_the_checksum(pack_path):
+    with open(pack_path, 'r+b') as f:
+        f.seek(HEADER.size + 100)
+        byte = f.read(1)
+        f.seek(HEADER.size + 100)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    with pytest.raises(PackError):
+        CasePack(pack_path, verify=True)
+    assert verify_pack(pack_path) == ["checksum mismatch"]
+
+
+def test_non_packs_are_rejected(tmp_path):
+    path = tmp_path / 'not.pack'
+    path.write_bytes(b'x' * (HEADER.size + 10))
+    with pytest.raises(PackError):
+        CasePack(str(path))
@@ -0,0 +1,73 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from console import Console
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(read_fd, encoding='utf-8')
+    yield stream, write_fd
+    stream.close()
+    try:
+        os.close(write_fd)
+    except OSError:
+        pass
+
+
+def test_wake_interrupts_a_waiting_read(pipe):
+    stream, _write_fd = pipe
+    console = Console(stream, io.StringIO())
+    timer = threading.Timer(0.05, console.wake)
+    timer.start()
+
+    started = time.monotonic()
+    assert console.read_line('> ', wakeable=True) is None
+    assert time.monotonic() - started < 2
+    timer.join()
+
+
+def test_lines_are_read_and_wakeups_cleared(pipe):
+    stream, write_fd = pipe
+    output = io.StringIO()
+    console = Console(stream, output)
+    os.write(write_fd, 'first\r\nsecond\nthird'.encode())
+
+    console.wake()
+    assert console.read_line('> ') == 'first'
+    console.clear()
+    assert console.read_line('> ', wakeable=True) == 'second'
+    os.close(write_fd)
+    assert console.read_line() == 'third'
+    with pytest.raises(EOFError):
+        console.read_line()
+    assert output.getvalue() == '> > '
+
+
+def test_tick_runs_while_waiting(pipe):
+    stream, _write_fd = pipe
+    console = Console(stream, io.StringIO())
+    ticks = []
+
+    def tick():
+        ticks.append(time.monotonic())
+        if len(ticks) == 3:
+            console.wake()
+        return 0.01
+
+    assert console.read_line(wakeable=True, tick=tick) is None
+    assert len(ticks) >= 3
+
+
+def test_streams_without_a_descriptor_report_wakeups_after_the_line():
+    console = Console(io.StringIO('answer\n'), io.StringIO())
+    console.wake()
+    assert console.read_line(wakeable=True) is None
+    console.clear()
+    with pytest.raises(EOFError):
+        console.read_line()
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from case_data import CaseData
+from clock import VirtualClock
+from game_session import ENDED, LOST, WON, GameSession
+
+
+@pytest.fixture(scope='module')
+def case():
+    return CaseData().get_case(1)
+
+
+def new_session(case):
+    clock = VirtualClock()
+    return clock, GameSession(case, clock=clock, rng=random.Random(0))
+
+
+def test_solving_scores_remaining_time_and_questions(case):
+    clock, session = new_session(case)
+    clock.advance(30)
+    session.submit("what was the murder weapon?")
+    session.submit("where was sarah?")
+    clock.advance(12.5)
+
+    events = session.submit(f"accuse {case['killer']}")
+    assert [event.kind for event in events] == ['solved']
+    remaining = case['time_limit'] - 42.5
+    assert session.score == int(remaining * 10) + 100 - 2 * 5
+    assert events[0].data['questions_asked'] == 2
+    assert events[0].data['time_used'] == 42.5
+    assert session.state == WON
+    # Time is frozen once the game is over
+    clock.advance(100)
+    assert session.time_remaining() == remaining
+
+
+def test_question_penalty_never_goes_negative(case):
+    clock, session = new_session(case)
+    for _ in range(30):
+        session.submit("who are the suspects?")
+
+    session.submit(f"accuse {case['killer']}")
+    assert session.score == int(case['time_limit'] * 10)
+
+
+def test_commands_and_wrong_accusations_are_free(case):
+    clock, session = new_session(case)
+    innocent = next(suspect['name'] for suspect in case['suspects']
+                    if suspect['name'] != case['killer'])
+    for command in ('help', 'time', 'suspects', 'evidence', f"accuse {innocent}"):
+        session.submit(command)
+
+    assert session.questions_asked == 0
+    assert session.active
+
+
+def test_time_runs_out(case):
+    clock, session = new_session(case)
+    clock.advance(case['time_limit'])
+
+    events = session.submit(f"accuse {case['killer']}")
+    assert [event.kind for event in events] == ['time_up']
+    assert session.state == LOST
+    assert session.score == 0
+
+
+def test_quitting_ends_the_game(case):
+    clock, session = new_session(case)
+    assert [event.kind for event in session.submit('quit')] == ['ended']
+    assert session.state == ENDED
+    assert session.submit('what was the motive?') == []
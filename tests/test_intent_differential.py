@@ -0,0 +1,38 @@
+from benchmarks.intent_differential import NO_INTENT, compare
+
+# Held-out questions the intent model deliberately answers differently from the
+# original substring classifier, with the intent it gives now. Anything else
+# that drifts from the original decision is a regression.
+ACCEPTED_CHANGES = {
+    # The original matched "where" (alibi/location) or "victim" before the real subject
+    "Where was the body found?": 'location',
+    "Which room was the victim in?": 'location',
+    "When did the victim die?": 'time',
+    "What time was the victim killed and where?": 'time',
+    "Why was he killed?": 'motive',
+    "Was there blood at the scene?": 'evidence',
+    "Who was at the lighthouse?": 'suspects',
+    "Where were you last night?": 'time',
+    "Any DNA on the knife?": 'evidence',
+    # Asking for two things; either one is right, and both are answered
+    "Where was James and what was his motive?": 'motive',
+    # Questions about clues the original matched to nothing
+    "Were there footprints under the window?": 'evidence',
+    "Were the muddy footprints Sarah's shoes?": 'evidence',
+    "Are there any witnesses?": 'evidence',
+    ("what is the motive of the wife and where was she when the gunshot was heard, and was there "
+     "any evidence that she was actually in the garden at the time, because the footprints under "
+     "the window suggest otherwise and the secretary claims to have been organizing files in the "
+     "office all afternoon"): 'evidence',
+    # "body" inside "somebody" made this a victim question
+    "Is somebody lying?": NO_INTENT,
+}
+
+
+def test_intents_match_the_original_classifier():
+    corpus, decisions, _skipped = compare()
+    regressions = []
+    for (question, original), current in zip(corpus, decisions):
+        if current != ACCEPTED_CHANGES.get(question, original) and current != original:
+            regressions.append(f"{question!r}: {original} -> {current}")
+    assert not regressions, '\n'.join(regressions)
@@ -0,0 +1,37 @@
+import random
+
+from keyword_matcher import KeywordMatcher
+from text_processor import TextProcessor
+
+
+def substring_scan(keywords, text):
+    """Every occurrence of every keyword, found one str.find at a time"""
+    matches = set()
+    for index, (keyword, _label) in enumerate(keywords):
+        start = text.find(keyword)
+        while start != -1:
+            matches.add((start, start + len(keyword), index))
+            start = text.find(keyword, start + 1)
+    return matches
+
+
+def test_matches_agree_with_a_substring_scan():
+    keywords = TextProcessor()._keywords
+    matcher = KeywordMatcher(keywords)
+    texts = ["where was the murder weapon found", "who had a motive and an alibi",
+             "the deceased's family and friends", "whereabouts of the suspects at the time",
+             "nothing relevant here", ""]
+    for text in texts:
+        assert set(matcher.find_all(text)) == substring_scan(keywords, text), text
+
+
+def test_overlapping_keywords_all_match():
+    keywords = [('he', 'a'), ('she', 'b'), ('his', 'c'), ('hers', 'd'), ('ushers', 'e')]
+    matcher = KeywordMatcher(keywords)
+    rng = random.Random(5)
+    for _ in range(200):
+        text = ''.join(rng.choice('hersu ') for _ in range(rng.randint(0, 30)))
+        matches = matcher.find_all(text)
+        assert set(matches) == substring_scan(keywords, text), text
+        ends = [end for _start, end, _index in matches]
+        assert ends == sorted(ends)
@@ -0,0 +1,62 @@
+from game_session import GameSession
+from name_index import NameIndex
+from text_processor import AMBIGUOUS_SUSPECT, TextProcessor
+
+NAMES = ['Margaret Blackwood', 'David Blackwood', 'Dr. Michael Foster', 'Sarah Chen']
+
+
+def test_full_first_and_last_names_resolve():
+    names = NameIndex(NAMES)
+    assert names.find('where was margaret blackwood') == ['Margaret Blackwood']
+    assert names.find('where was david') == ['David Blackwood']
+    assert names.find('what about chen') == ['Sarah Chen']
+    assert names.find('ask the doctor') == ['Dr. Michael Foster']
+
+
+def test_shared_surname_is_ambiguous():
+    names = NameIndex(NAMES)
+    assert names.find('where was blackwood') == ['Margaret Blackwood', 'David Blackwood']
+    # The longest mention wins over the ambiguous surname alone
+    assert names.find('where was david blackwood') == ['David Blackwood']
+
+
+def test_misspellings_resolve_within_the_edit_allowance():
+    names = NameIndex(NAMES)
+    assert names.find('where was margret') == ['Margaret Blackwood']
+    assert names.find('where was blackwod') == ['Margaret Blackwood', 'David Blackwood']
+    assert names.find('where was xyz') == []
+
+
+def case_with_suspects():
+    return {
+        'id': None,
+        'time_limit': 300,
+        'killer': 'David Blackwood',
+        'suspects': [{'name': name, 'alibi': f"{name} was at home"} for name in NAMES],
+    }
+
+
+def test_ambiguous_questions_ask_which_suspect():
+    question = "where was blackwood at the time?"
+    answer = TextProcessor().process_question(question, case_with_suspects())
+    assert answer == AMBIGUOUS_SUSPECT.format('Margaret Blackwood or David Blackwood')
+
+
+def test_ambiguous_accusations_do_not_end_the_game():
+    session = GameSession(case_with_suspects())
+    events = session.accuse('blackwood')
+    assert [event.kind for event in events] == ['ambiguous']
+    assert events[0].data['matches'] == ['Margaret Blackwood', 'David Blackwood']
+    assert session.active
+    assert [event.kind for event in session.accuse('david')] == ['solved']
+
+
+def test_another_persons_surname_is_not_a_suspect():
+    names = NameIndex(NAMES)
+    assert names.find("what is dr. lisa chen's alibi") == []
+    assert names.find("is dr. chen a suspect") == []
+    assert names.find("what about lisa chen") == []
+    # A courtesy title or a suspect's own given name still resolves
+    assert names.find("where was ms chen") == ['Sarah Chen']
+    assert names.find("where was sarah chen") == ['Sarah Chen']
+    assert names.find("where was dr. foster") == ['Dr. Michael Foster']
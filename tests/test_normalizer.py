@@ -0,0 +1,44 @@
+import pytest
+
+from normalizer import analyze, normalize, stem
+
+
+@pytest.mark.parametrize('question, text', [
+    ("What's the motive?", "what is the motive"),
+    ("Didn't he see it", "did not he see it"),
+    ("I can't, won't", "i can not, will not"),
+    ("They're sure they'd seen it", "they are sure they would seen it"),
+    ("Where’s the knife", "where is the knife"),
+])
+def test_contractions_are_expanded(question, text):
+    assert normalize(question).text == text
+
+
+def test_possessives_and_name_apostrophes_are_dropped():
+    assert normalize("Was Anna's brother there?").words == ('was', 'anna', 'brother', 'there')
+    assert normalize("Dr. Foster's alibi").words == ('dr', 'foster', 'alibi')
+    assert normalize("Where was O'Brien").words == ('where', 'was', 'obrien')
+
+
+def test_questions_split_into_clauses():
+    clauses = normalize("Where was James and what was his motive?").clauses()
+    assert [clause.text for clause in clauses] == ["where was james", "what was his motive"]
+    clauses = normalize("Who is here; where is the knife").clauses()
+    assert [clause.text for clause in clauses] == ["who is here", "where is the knife"]
+
+
+def test_list_continuations_do_not_start_a_question():
+    question = normalize("what is the relationship between Catherine and the victim")
+    assert len(question.clauses()) == 1
+
+
+def test_stems_and_token_spans():
+    assert [stem(word) for word in ('fingerprints', 'poured', 'bodies', 'glass', 'bleed')] == (
+        ['fingerprint', 'pour', 'body', 'glass', 'bleed'])
+    question = analyze("Sarah's alibi")
+    assert [(token.word, token.start, token.end) for token in question.tokens] == (
+        [('sarah', 0, 7), ('alibi', 8, 13)])
+
+
+def test_normalize_is_memoized():
+    assert normalize("who are the suspects") is normalize("who are the suspects")
@@ -0,0 +1,46 @@
+import io
+
+from case_data import CaseData
+from renderer import PALETTE, Renderer, color_enabled, compile_template
+
+
+def test_compiled_templates_keep_data_fields():
+    source = "{red}Case {id:2d}: {title!r} {{literal}}{reset}"
+    assert compile_template(source, PALETTE) == "\x1b[31mCase {id:2d}: {title!r} {{literal}}\x1b[0m"
+    assert compile_template(source, {name: '' for name in PALETTE}) == (
+        "Case {id:2d}: {title!r} {{literal}}")
+
+
+def test_no_color_output_has_no_escape_codes(monkeypatch):
+    stream = io.StringIO()
+    assert not color_enabled(stream)
+    monkeypatch.setenv('NO_COLOR', '1')
+    renderer = Renderer(stream)
+    assert not renderer.color
+
+    case = CaseData().get_case(1)
+    renderer.write(renderer.case_screen('case_info', case), renderer.case_list([case]))
+    renderer.show('answer', text='An answer')
+    output = stream.getvalue()
+    assert '\x1b' not in output
+    assert case['title'] in output and output.endswith("🕵️  An answer\n")
+
+
+def test_colored_output():
+    stream = io.StringIO()
+    Renderer(stream, color=True).show('answer', text='An answer')
+    assert stream.getvalue() == "\x1b[32m🕵️  An answer\x1b[0m\n"
+
+
+def test_case_screens_are_rendered_once_per_case_version():
+    case_data = CaseData()
+    renderer = Renderer(io.StringIO(), color=False)
+    case = case_data.get_case(1)
+    suspects = renderer.case_screen('suspects', case)
+    assert renderer.case_screen('suspects', case) is suspects
+    assert all(suspect['name'] in suspects for suspect in case['suspects'])
+
+    case_data.add_case(dict(case.to_dict(), evidence=['A brand new clue']))
+    edited = case_data.get_case(1)
+    assert 'A brand new clue' in renderer.case_screen('evidence', edited)
+    assert 'A brand new clue' not in renderer.case_screen('evidence', case)
@@ -0,0 +1,68 @@
+import io
+import json
+import os
+
+import pytest
+
+import replay
+
+TRANSCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'data', 'transcripts')
+
+
+def write(tmp_path, text, name='game.txt'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_transcripts_are_parsed(tmp_path):
+    path = write(tmp_path, "# a comment\n@case 3\n\nwho are the suspects\n"
+                           "@wait 1.5\n  accuse frank  \n")
+    transcript = replay.read_transcript(path)
+    assert transcript.case_id == 3
+    assert transcript.steps == [
+        ('say', 'who are the suspects'), ('wait', 1.5), ('say', 'accuse frank')]
+
+
+@pytest.mark.parametrize('line', ['@case three', '@wait', '@pause 5'])
+def test_bad_directives_name_their_line(tmp_path, line):
+    path = write(tmp_path, f"who are the suspects\n{line}\n")
+    with pytest.raises(ValueError, match="game.txt:2"):
+        replay.read_transcript(path)
+
+
+def test_records_are_reproducible():
+    out = io.StringIO()
+    games, outcomes, latencies = replay.run([TRANSCRIPTS], None, out, repeat=2)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert games == len(records) == 6
+    assert sum(outcomes.values()) == 6
+    assert len(latencies) == sum(len(record['latency_us']) for record in records)
+
+    for first, second in zip(records[:3], records[3:]):
+        first.pop('latency_us')
+        second.pop('latency_us')
+        assert first == second
+
+    solved = next(record for record in records
+                  if record['transcript'].endswith('case1_solved.txt'))
+    assert solved['case'] == 1 and solved['outcome'] == 'won'
+    assert solved['questions_asked'] == 4
+    assert solved['turns'][-1]['input'] == 'accuse sarah chen'
+
+
+def test_waits_run_the_clock_out(tmp_path):
+    path = write(tmp_path, "@wait 10000\nwho are the suspects\n")
+    out = io.StringIO()
+    replay.run([path], 1, out)
+    record = json.loads(out.getvalue())
+    assert record['outcome'] not in ('unfinished', 'won')
+    assert record['turns'] == [{'input': '@wait 10000', 'events': ['time_up']}]
+    assert record['questions_asked'] == 0
+
+
+def test_transcripts_need_a_case(tmp_path):
+    path = write(tmp_path, "who are the suspects\n")
+    with pytest.raises(ValueError, match='no @case line'):
+        replay.run([path], None, io.StringIO())
@@ -0,0 +1,25 @@
+import gc
+
+from benchmarks.soak_games import soak
+
+GAMES = 400
+# Every ending has been played twice by then, and every lazily loaded module and cache is warm
+WARM = 40
+
+
+def test_back_to_back_games_stay_flat():
+    samples = {}
+
+    def checkpoint(player, number):
+        if number in (WARM, GAMES - 1):
+            samples[number] = (player.max_depth, len(gc.get_objects()))
+
+    game, player = soak(GAMES, checkpoint)
+
+    assert player.games_started == GAMES
+    warm_depth, warm_objects = samples[WARM]
+    assert player.max_depth == warm_depth
+    _, final_objects = samples[GAMES - 1]
+    assert final_objects < warm_objects * 1.02
+    assert game.timers.pending() == 0
+    assert game.session is None and game.timer is None
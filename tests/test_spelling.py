@@ -0,0 +1,36 @@
+import pytest
+
+from case_data import CaseData
+from normalizer import normalize
+from spelling import corrector_for
+from text_processor import TextProcessor
+
+
+@pytest.fixture(scope='module')
+def corrector():
+    return corrector_for(CaseData().get_case(1), TextProcessor()._keywords)
+
+
+@pytest.mark.parametrize('typed, corrected', [
+    ("whre was sarha chen", "where was sarah chen"),
+    ("what was margret blackwood's alibi", "what was margaret blackwood alibi"),
+    ("what was the wepon", "what was the weapon"),
+    ("who are the suspcts", "who are the suspects"),
+    ("was the evidnce found", "was the evidence found"),
+    ("tell me about the pistl", "tell me about the pistol"),
+])
+def test_misspelled_names_and_keywords_are_corrected(corrector, typed, corrected):
+    assert corrector.correct(normalize(typed)).text == corrected
+
+
+def test_known_and_short_words_are_left_alone(corrector):
+    question = normalize("who was across the room at 9 pm")
+    assert corrector.correct(question) is question
+    assert corrector.correct_word("xq") == "xq"
+
+
+def test_misspelled_questions_get_the_right_answer():
+    case = CaseData().get_case(1)
+    processor = TextProcessor()
+    assert processor.process_question("whre was sarha chen?", case) == (
+        processor.process_question("where was sarah chen?", case))
@@ -0,0 +1,53 @@
+import io
+import os
+
+import pytest
+
+import status_line
+from status_line import ESC, StatusLine, changed_runs
+
+
+def test_changed_runs():
+    assert changed_runs('Time 1:00', 'Time 1:00') == []
+    assert changed_runs('Time 1:00', 'Time 0:59') == [(5, '0:59')]
+    assert changed_runs('Time 1:09', 'Time 1:08') == [(8, '8')]
+    # Far apart: two runs; within max_gap: one run covering the gap
+    assert changed_runs('a.........b', 'X.........Y') == [(0, 'X'), (10, 'Y')]
+    assert changed_runs('a...b', 'X...Y') == [(0, 'X...Y')]
+    assert changed_runs('a...b', 'X...Y', max_gap=2) == [(0, 'X'), (4, 'Y')]
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    monkeypatch.setattr(status_line, '_terminal_size', lambda: os.terminal_size((20, 10)))
+    stream = io.StringIO()
+    line = StatusLine(stream, enabled=True)
+    line.show()
+    stream.truncate(0)
+    stream.seek(0)
+    return line, stream
+
+
+def test_updates_send_only_what_changed(terminal):
+    line, stream = terminal
+    line.update('Time 1:00')
+    stream.truncate(0)
+    stream.seek(0)
+
+    line.update('Time 0:59')
+    assert f'{ESC}[1;6H0:59' in stream.getvalue()
+    assert 'Time' not in stream.getvalue()
+
+    stream.truncate(0)
+    stream.seek(0)
+    line.update('Time 0:59')
+    assert stream.getvalue() == ''
+
+
+def test_disabled_line_writes_nothing():
+    stream = io.StringIO()
+    line = StatusLine(stream, enabled=False)
+    line.show()
+    line.update('Time 1:00')
+    line.hide()
+    assert stream.getvalue() == '' and line.bytes_written == 0
@@ -0,0 +1,84 @@
+import pytest
+
+from answer_cache import invalidate_cases
+from case_data import CaseData
+from passage_index import _case_indexes, passage_index
+from text_processor import AMBIGUOUS_SUSPECT, TextProcessor
+
+
+@pytest.fixture(scope='module')
+def case_data():
+    return CaseData()
+
+
+@pytest.fixture(scope='module')
+def processor():
+    return TextProcessor()
+
+
+def suspect(case, name):
+    return next(entry for entry in case['suspects'] if entry['name'] == name)
+
+
+def test_motive_of_a_named_suspect(case_data, processor):
+    case = case_data.get_case(2)
+    james = suspect(case, 'James Morrison')
+    assert processor.process_question("what was james's motive", case) == james['motive']
+    answer = processor.process_question("Where was James and what was his motive?", case)
+    assert answer.splitlines() == [james['alibi'], james['motive']]
+
+
+def test_motive_without_a_name_is_the_case_hint(case_data, processor):
+    case = case_data.get_case(2)
+    assert processor.process_question("what was the motive", case) == case['motive_hint']
+
+
+def test_motive_of_an_ambiguous_name_asks_which_suspect(case_data, processor):
+    case = case_data.get_case(1)
+    assert processor.process_question("what was blackwood's motive", case) == (
+        AMBIGUOUS_SUSPECT.format('Margaret Blackwood or David Blackwood'))
+
+
+def test_specific_evidence_questions_get_the_matching_fact(case_data, processor):
+    case = case_data.get_case(1)
+    assert processor.process_question("are there fingerprints on the pistol?", case) == (
+        "Evidence: Pistol with victim's fingerprints")
+    assert processor.process_question("Does the knife have fingerprints?", case) == (
+        f"Evidence found: {', '.join(case['evidence'])}")
+    assert processor.process_question("tell me about the wine bottle", case_data.get_case(2)) == (
+        "Evidence: Fingerprints on the wine bottle")
+
+
+def test_naming_the_cases_weapon_gets_its_description(case_data, processor):
+    case = case_data.get_case(1)
+    for question in ("tell me about the pistol", "describe the pistol"):
+        assert processor.process_question(question, case) == case['weapon']['description']
+
+
+def test_passages_sharing_one_word_with_the_question_are_not_answers(case_data, processor):
+    case = case_data.get_case(1)
+    assert processor.process_question("Was the chef in the kitchen?", case) is None
+    assert processor.process_question("Was the art dealer in debt?", case) is None
+
+
+def test_general_evidence_questions_get_the_whole_list(case_data, processor):
+    case = case_data.get_case(1)
+    expected = f"Evidence found: {', '.join(case['evidence'])}"
+    assert processor.process_question("what evidence is there", case) == expected
+    # Nothing in the case matches: the canned answer rather than a guess
+    assert processor.process_question("any dna on the knife", case) == expected
+
+
+def test_case_changes_invalidate_derived_data():
+    case_data = CaseData()
+    case_data.add_change_listener(invalidate_cases)
+    old = case_data.get_case(1)
+    assert "Evidence: Muddy footprints under the window" in passage_index(old).passages
+    assert len(_case_indexes._entries) > 0
+
+    case_data.add_case(dict(old.to_dict(), evidence=['A brand new clue']))
+    # The old case's index was dropped rather than left to age out
+    assert _case_indexes._entries.get((1, old.version), None) is None
+    passages = passage_index(case_data.get_case(1)).passages
+    assert "Evidence: A brand new clue" in passages
+    assert "Evidence: Muddy footprints under the window" not in passages
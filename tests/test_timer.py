@@ -0,0 +1,119 @@
+import threading
+import time
+
+from clock import VirtualClock
+from timer import GameTimer, TimerService
+
+
+def make_service():
+    clock = VirtualClock()
+    return clock, TimerService(clock)
+
+
+def test_callbacks_run_in_deadline_order():
+    clock, service = make_service()
+    fired = []
+    for delay in (3, 1, 2):
+        service.call_later(delay, lambda delay=delay: fired.append(delay))
+
+    clock.advance(10)
+    assert fired == [1, 2, 3]
+
+
+def test_equal_deadlines_run_in_scheduling_order():
+    clock, service = make_service()
+    fired = []
+    for name in 'abc':
+        service.call_at(5, lambda name=name: fired.append(name))
+
+    clock.advance(5)
+    assert fired == ['a', 'b', 'c']
+
+
+def test_callbacks_only_run_once_due():
+    clock, service = make_service()
+    fired = []
+    service.call_later(5, lambda: fired.append('late'))
+
+    clock.advance(4.9)
+    assert fired == []
+    clock.advance(0.1)
+    assert fired == ['late']
+    clock.advance(10)
+    assert fired == ['late']
+
+
+def test_cancelled_callbacks_never_run():
+    clock, service = make_service()
+    fired = []
+    keep = service.call_later(1, lambda: fired.append('keep'))
+    drop = service.call_later(1, lambda: fired.append('drop'))
+    drop.cancel()
+    assert service.pending() == 1
+
+    clock.advance(2)
+    assert fired == ['keep']
+    assert service.pending() == 0
+    # Cancelling after the callback ran is a no-op
+    keep.cancel()
+    assert service.pending() == 0
+
+
+def test_mass_cancellation_compacts_the_heap():
+    clock, service = make_service()
+    fired = []
+    handles = [service.call_later(index + 1, lambda index=index: fired.append(index))
+               for index in range(200)]
+    for handle in handles[:150]:
+        handle.cancel()
+
+    assert service.pending() == 50
+    assert len(service._heap) < 200
+    clock.advance(1000)
+    assert fired == list(range(150, 200))
+
+
+def test_game_timer_expires_through_the_service():
+    clock, service = make_service()
+    expired = []
+    timer = GameTimer(60, lambda: expired.append(True), service=service)
+    timer.start()
+
+    clock.advance(45)
+    assert timer.get_time_remaining() == 15
+    assert timer.is_running()
+    clock.advance(15)
+    assert expired == [True]
+    assert not timer.is_running()
+
+
+def test_stopped_game_timer_never_fires():
+    clock, service = make_service()
+    expired = []
+    timer = GameTimer(60, lambda: expired.append(True), service=service)
+    timer.start()
+    timer.stop()
+
+    clock.advance(120)
+    assert expired == []
+    assert service.pending() == 0
+
+
+def test_service_thread_sees_deadlines_after_compaction():
+    service = TimerService()
+    try:
+        handles = [service.call_later(60 + index, lambda: None) for index in range(200)]
+        # Let the service thread start waiting on the heap before cancels compact it
+        time.sleep(0.05)
+        for handle in handles[:150]:
+            handle.cancel()
+        fired = threading.Event()
+        service.call_later(0.05, fired.set)
+
+        assert fired.wait(2)
+        for handle in handles[150:]:
+            handle.cancel()
+        assert service.pending() == 0
+        assert service._cancelled >= 0
+    finally:
+        service.stop()
@@ -1,9 +1,27 @@
-import re
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+from answer_cache import AnswerCache, shared_cache
+from answer_table import PER_SUSPECT_ANSWERS, SUSPECT_INTENTS, build_answer_table
+from name_index import suspect_index
+from normalizer import NormalizedQuestion, normalize
+from passage_index import passage_index, terms
+from spelling import base_vocabulary, corrector_for
+
+_UNCACHED = object()
+
+# Replies asking the player which suspect they mean, rather than answering
+NEEDS_SUSPECT = "Please specify which suspect's {} you're asking about."
+AMBIGUOUS_SUSPECT = "Which suspect do you mean: {}?"
+
+# Intents answered with the best matching case fact when the question names
+# something specific ("does the knife have fingerprints?"), mapped to the stems
+# that only say what kind of fact is wanted and so are left out of the search
+PASSAGE_INTENTS = {
+    'evidence': frozenset(terms('evidence clue proof found')),
+    'weapon': frozenset(terms('weapon murder tool used found')),
+}
 
 class TextProcessor:
-    def __init__(self):
+    def __init__(self, cache: Optional[AnswerCache] = None):
         self.question_patterns = {
             'weapon': ['weapon', 'gun', 'knife', 'pistol', 'sword', 'tool', 'murder weapon'],
             'victim': ['victim', 'dead', 'body', 'corpse', 'deceased', 'killed'],
@@ -15,110 +33,162 @@ class TextProcessor:
             'alibi': ['alibi', 'whereabouts', 'where was', 'doing'],
             'relationship': ['relationship', 'related', 'family', 'friend', 'enemy']
         }
+        self._keywords = [
+            (pattern, q_type) for q_type, patterns in self.question_patterns.items()
+            for pattern in patterns
+        ]
+        self._model = None
+        # Answers are shared by every processor in the process unless given a cache of its own
+        self.cache = shared_cache if cache is None else cache
+    
+    def classify_batch(self, questions: Sequence[NormalizedQuestion]) -> List[Optional[str]]:
+        """Identify the question type of every question in one vectorized pass (None if unknown)"""
+        if self._model is None:
+            # Imported here so NumPy is only loaded once a question is asked
+            from intent_model import default_model
+            self._model = default_model(self._keywords)
+        return self._model.predict(questions)
     
     def process_question(self, question: str, case_data: Dict) -> Optional[str]:
         """Process user question and return relevant response"""
-        question_lower = question.lower()
-        
-        # Extract question type using pattern matching
-        question_type = self._identify_question_type(question_lower)
-        
-        if not question_type:
-            return None
-        
-        # Get relevant information from case data
-        return self._get_response(question_type, question_lower, case_data)
+        normalized = normalize(question)
+        
+        # Only catalog cases carry a version; answers about anything else are never cached
+        case_id = case_data.get('id')
+        version = getattr(case_data, 'version', None)
+        if case_id is None or version is None:
+            return self._answer(normalized, case_data)
+        
+        key = (case_id, version, normalized.text)
+        answer = self.cache.get(key, _UNCACHED)
+        if answer is _UNCACHED:
+            answer = self._answer(normalized, case_data)
+            self.cache.put(key, answer)
+        return answer
     
-    def _identify_question_type(self, question: str) -> Optional[str]:
-        """Identify the type of question being asked"""
-        best_match = None
-        best_score = 0
-        
-        for q_type, patterns in self.question_patterns.items():
-            for pattern in patterns:
-                if pattern in question:
-                    # Calculate similarity score
-                    score = SequenceMatcher(None, pattern, question).ratio()
-                    if score > best_score:
-                        best_score = score
-                        best_match = q_type
-        
-        return best_match if best_score > 0.1 else None
+    def process_batch(self, questions: Sequence[str],
+                      cases: Sequence[Dict]) -> List[List[Tuple[Optional[str], Optional[str]]]]:
+        """
+        Answer every question about every case, classifying each question once.
+        Returns (question type, response) pairs per case; multi-intent questions
+        report their types joined with '+', and passage fallbacks report 'passage'.
+        """
+        normalized = [normalize(question) for question in questions]
+        # Spelling is corrected per case, except for the (usual) questions whose words
+        # are all already known; the distinct corrected questions are classified once
+        base = base_vocabulary(self._keywords)
+        known = [base.knows_all(question.words) for question in normalized]
+        corrected = []
+        for case_data in cases:
+            corrector = corrector_for(case_data, self._keywords)
+            corrected.append([question if is_known else corrector.correct(question)
+                              for question, is_known in zip(normalized, known)])
+        distinct = list({question.text: question
+                         for per_case in corrected for question in per_case}.values())
+        intents = {question.text: asked
+                   for question, asked in zip(distinct, self.identify_intents(distinct))}
+        results = []
+        for case_data, per_case in zip(cases, corrected):
+            answers = []
+            for question in per_case:
+                asked = intents[question.text]
+                response = self._respond(asked, question, case_data)
+                label = '+'.join(question_type for question_type, _ in asked)
+                answers.append((label or ('passage' if response else None), response))
+            results.append(answers)
+        return results
     
-    def _get_response(self, question_type: str, question: str, case_data: Dict) -> Optional[str]:
-        """Get appropriate response based on question type"""
-        
-        if question_type == 'weapon':
-            return case_data.get('weapon', {}).get('description', 'The murder weapon has not been determined.')
-        
-        elif question_type == 'victim':
-            victim = case_data.get('victim', {})
-            return f"The victim is {victim.get('name', 'unknown')}. {victim.get('description', '')}"
-        
-        elif question_type == 'suspects':
-            suspects = case_data.get('suspects', [])
-            if suspects:
-                names = [s['name'] for s in suspects]
-                return f"The suspects are: {', '.join(names)}"
-            return "No suspects have been identified yet."
-        
-        elif question_type == 'location':
-            location = case_data.get('location', 'Unknown location')
-            scene_description = case_data.get('scene_description', '')
-            return f"The crime occurred at {location}. {scene_description}"
-        
-        elif question_type == 'time':
-            time_info = case_data.get('time_of_death', 'Time of death is unknown')
-            return f"Time of death: {time_info}"
-        
-        elif question_type == 'motive':
-            return case_data.get('motive_hint', 'The motive is still unclear.')
-        
-        elif question_type == 'evidence':
-            evidence = case_data.get('evidence', [])
-            if evidence:
-                return f"Evidence found: {', '.join(evidence)}"
-            return "No evidence has been found yet."
-        
-        elif question_type == 'alibi':
-            # Extract suspect name from question
-            suspect_name = self._extract_suspect_name(question, case_data)
-            if suspect_name:
-                suspect = self._find_suspect(suspect_name, case_data)
-                if suspect:
-                    return suspect.get('alibi', f"{suspect_name}'s alibi is unknown.")
-            return "Please specify which suspect's alibi you're asking about."
-        
-        elif question_type == 'relationship':
-            # Extract suspect name from question
-            suspect_name = self._extract_suspect_name(question, case_data)
-            if suspect_name:
-                suspect = self._find_suspect(suspect_name, case_data)
-                if suspect:
-                    return suspect.get('relationship', f"{suspect_name}'s relationship to the victim is unknown.")
-            return "Please specify which suspect's relationship you're asking about."
-        
-        return None
+    def identify_intents(self, questions: Sequence[NormalizedQuestion]
+                         ) -> List[List[Tuple[str, NormalizedQuestion]]]:
+        """
+        Every intent each question asks about, as (question type, clause) pairs.
+        Questions and their clauses are classified together in one batch; a
+        question only counts as multi-intent when its clauses ask different things.
+        """
+        clauses = [question.clauses() for question in questions]
+        batch = []
+        for question, parts in zip(questions, clauses):
+            batch.append(question)
+            if len(parts) > 1:
+                batch.extend(parts)
+        
+        question_types = iter(self.classify_batch(batch))
+        intents = []
+        for question, parts in zip(questions, clauses):
+            whole = next(question_types)
+            asked: List[Tuple[str, NormalizedQuestion]] = []
+            if len(parts) > 1:
+                for clause, question_type in zip(parts, question_types):
+                    if question_type and all(question_type != seen for seen, _ in asked):
+                        asked.append((question_type, clause))
+            if len(asked) < 2:
+                asked = [(whole, question)] if whole else []
+            intents.append(asked)
+        return intents
     
-    def _extract_suspect_name(self, question: str, case_data: Dict) -> Optional[str]:
-        """Extract suspect name from question"""
-        suspects = case_data.get('suspects', [])
-        
-        for suspect in suspects:
-            name = suspect['name'].lower()
-            first_name = name.split()[0] if name.split() else name
-            
-            if name in question or first_name in question:
-                return suspect['name']
-        
-        return None
+    @staticmethod
+    def is_clarification(response: Optional[str]) -> bool:
+        """Check whether a response asks which suspect was meant instead of answering"""
+        prefixes = (NEEDS_SUSPECT[:NEEDS_SUSPECT.index('{')],
+                    AMBIGUOUS_SUSPECT[:AMBIGUOUS_SUSPECT.index('{')])
+        return bool(response) and response.startswith(prefixes)
     
-    def _find_suspect(self, suspect_name: str, case_data: Dict) -> Optional[Dict]:
-        """Find suspect in case data"""
-        suspects = case_data.get('suspects', [])
-        
-        for suspect in suspects:
-            if suspect['name'].lower() == suspect_name.lower():
-                return suspect
-        
-        return None
+    def _answer(self, question: NormalizedQuestion, case_data: Dict) -> Optional[str]:
+        """Correct spelling, classify a normalized question and build its response"""
+        question = corrector_for(case_data, self._keywords).correct(question)
+        return self._respond(self.identify_intents([question])[0], question, case_data)
+    
+    def _respond(self, asked: List[Tuple[str, NormalizedQuestion]], question: NormalizedQuestion,
+                 case_data: Dict) -> Optional[str]:
+        """Answer each (question type, clause) pair, one line per answer"""
+        if not asked:
+            # Nothing classified: fall back to the case fact that best matches the question
+            return passage_index(case_data).best(question)
+        responses = [self._get_response(question_type, clause, case_data, question)
+                     for question_type, clause in asked]
+        return '\n'.join(response for response in responses if response) or None
+    
+    def _get_response(self, question_type: str, question: NormalizedQuestion, case_data: Dict,
+                      context: Optional[NormalizedQuestion] = None) -> Optional[str]:
+        """
+        Get appropriate response based on question type; ``context`` is the
+        whole question a clause came from
+        """
+        # Catalog cases carry their answer table; plain dicts get one built on the spot
+        answers = getattr(case_data, 'answers', None) or build_answer_table(case_data)
+        
+        if question_type in PASSAGE_INTENTS:
+            if question_type == 'weapon' and self._names_case_weapon(question, case_data):
+                # "describe the pistol" when it was a pistol: the weapon, not a clue mentioning it
+                return answers.get(question_type)
+            # The fact the question singles out, else the canned answer when it names nothing in it
+            ignore = PASSAGE_INTENTS[question_type]
+            passage = passage_index(case_data).best(question, ignore=ignore)
+            return passage or answers.get(question_type)
+        if question_type not in SUSPECT_INTENTS and question_type not in PER_SUSPECT_ANSWERS:
+            return answers.get(question_type)
+        
+        # Resolve the suspect named in the question, tolerating typos
+        names = suspect_index(case_data)
+        suspects = names.find(question)
+        if not suspects and context is not None and context is not question:
+            # "where was james and what was his relationship": the name is in another clause
+            suspects = names.find(context)
+        if len(suspects) > 1:
+            return AMBIGUOUS_SUSPECT.format(' or '.join(suspects))
+        if question_type in SUSPECT_INTENTS:
+            if suspects:
+                return answers[question_type].get(suspects[0].lower())
+            return NEEDS_SUSPECT.format(question_type)
+        
+        # "what was james's motive" gets James's; without a name, the case-wide answer
+        per_suspect = answers.get(PER_SUSPECT_ANSWERS[question_type], {})
+        if suspects and suspects[0].lower() in per_suspect:
+            return per_suspect[suspects[0].lower()]
+        return answers.get(question_type)
+    
+    @staticmethod
+    def _names_case_weapon(question: NormalizedQuestion, case_data: Dict) -> bool:
+        """Check whether the question names the kind of weapon used in the case"""
+        weapon = set(terms(case_data.get('weapon', {}).get('type', '')))
+        return bool(weapon) and weapon <= set(terms(question))
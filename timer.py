@@ -1,59 +1,209 @@
+"""
+Game timers.
+
+Every GameTimer in the process registers its deadline with one shared
+TimerService: a heap of deadlines on the monotonic clock, served by a single
+thread that sleeps until the earliest one is due. Thousands of armed timers
+cost one sleeping thread rather than one polling thread each.
+
+A TimerService on a VirtualClock has no thread: callbacks run inside
+VirtualClock.advance() once their deadline has passed.
+"""
+
+import heapq
+import itertools
 import threading
-import time
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Tuple
+
+from clock import system_clock
+
+
+class TimerHandle:
+    """A scheduled callback; cancel() before it is due to drop it"""
+    __slots__ = ('deadline', 'callback', 'cancelled', '_service')
+
+    def __init__(self, deadline: float, callback: Callable[[], None], service: 'TimerService'):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self._service = service
+
+    def cancel(self):
+        self._service.cancel(self)
+
+
+class TimerService:
+    def __init__(self, clock: Callable[[], float] = system_clock):
+        self.clock = clock
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Times the service thread woke up, for benchmarks
+        self.wakeups = 0
+        # A virtual clock drives the service itself
+        self._virtual = hasattr(clock, 'on_advance')
+        if self._virtual:
+            clock.on_advance(self.run_due)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        """Run callback after delay seconds"""
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        """Run callback on the service thread once the clock reaches deadline"""
+        handle = TimerHandle(deadline, callback, self)
+        with self._condition:
+            heapq.heappush(self._heap, (deadline, next(self._sequence), handle))
+            if self._virtual:
+                # Run from the clock's advance(), never by a thread
+                return handle
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='timer-service', daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is handle:
+                # New earliest deadline: the thread is sleeping for too long
+                self._condition.notify()
+        return handle
+
+    def cancel(self, handle: TimerHandle):
+        """Drop a pending callback; a no-op if it already ran"""
+        with self._condition:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            self._cancelled += 1
+            # Cancelled entries are skipped lazily; rebuild once they dominate the heap
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                # In place: the service thread may be waiting with a reference to this list
+                self._heap[:] = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def pending(self) -> int:
+        """Number of armed callbacks"""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def run_due(self):
+        """Run every callback whose deadline has passed, on the calling thread"""
+        with self._condition:
+            due = self._pop_due()
+        self._call(due)
+
+    def stop(self):
+        """Stop the service thread; pending callbacks are kept and run if it restarts"""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify()
+        if thread:
+            thread.join(timeout=1)
+
+    def _due(self) -> List[TimerHandle]:
+        """Wait until something is due (or stop) and pop everything that is; holds the lock"""
+        heap = self._heap
+        while not self._stopping:
+            while heap and heap[0][2].cancelled:
+                heapq.heappop(heap)
+                self._cancelled -= 1
+            if not heap:
+                self._condition.wait()
+            else:
+                delay = heap[0][0] - self.clock()
+                if delay <= 0:
+                    break
+                self._condition.wait(delay)
+            self.wakeups += 1
+        if self._stopping:
+            return []
+        return self._pop_due()
+
+    def _pop_due(self) -> List[TimerHandle]:
+        """Remove and return the handles that are due; holds the lock"""
+        heap = self._heap
+        due = []
+        now = self.clock()
+        while heap and heap[0][0] <= now:
+            handle = heapq.heappop(heap)[2]
+            if handle.cancelled:
+                self._cancelled -= 1
+            else:
+                # Marked so a late cancel() does not skew the count
+                handle.cancelled = True
+                due.append(handle)
+        return due
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                due = self._due()
+            self._call(due)
+
+    @staticmethod
+    def _call(due: List[TimerHandle]):
+        for handle in due:
+            try:
+                handle.callback()
+            except Exception:
+                # One failing callback must not stop every other game's timer
+                import traceback
+                traceback.print_exc()
+
+
+timer_service = TimerService()
+
 
 class GameTimer:
-    def __init__(self, duration: int, callback: Optional[Callable] = None):
+    def __init__(self, duration: int, callback: Optional[Callable] = None,
+                 service: Optional[TimerService] = None):
         self.duration = duration
         self.start_time = None
         self.callback = callback
         self.running = False
-        self.thread = None
-        self._stop_event = threading.Event()
-    
+        self.service = service or timer_service
+        self._handle: Optional[TimerHandle] = None
+
     def start(self):
         """Start the timer"""
         if self.running:
             return
-        
+
         self.running = True
-        self.start_time = time.time()
-        self._stop_event.clear()
-        
-        self.thread = threading.Thread(target=self._timer_loop)
-        self.thread.daemon = True
-        self.thread.start()
-    
+        self.start_time = self.service.clock()
+        self._handle = self.service.call_at(self.start_time + self.duration, self._expire)
+
     def stop(self):
         """Stop the timer"""
         self.running = False
-        self._stop_event.set()
-        
-        if self.thread:
-            self.thread.join(timeout=1)
-    
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
     def get_time_remaining(self) -> float:
         """Get remaining time in seconds"""
-        if not self.running or not self.start_time:
+        if not self.running or self.start_time is None:
             return 0
-        
-        elapsed = time.time() - self.start_time
+
+        elapsed = self.service.clock() - self.start_time
         remaining = max(0, self.duration - elapsed)
         return remaining
-    
+
     def is_running(self) -> bool:
         """Check if timer is running"""
         return self.running and self.get_time_remaining() > 0
-    
-    def _timer_loop(self):
-        """Internal timer loop"""
-        while self.running and not self._stop_event.is_set():
-            remaining = self.get_time_remaining()
-            
-            if remaining <= 0:
-                self.running = False
-                if self.callback:
-                    self.callback()
-                break
-            
-            time.sleep(0.1)
+
+    def _expire(self):
+        """Called on the timer service thread at the deadline"""
+        if not self.running:
+            return
+
+        self.running = False
+        self._handle = None
+        if self.callback:
+            self.callback()